@@ -8,6 +8,8 @@ import (
 	"io"
 	"net/http"
 	"time"
+
+	"wick_server/llm"
 )
 
 // HTTPTool implements Tool by forwarding execution to a remote HTTP callback.
@@ -16,8 +18,12 @@ type HTTPTool struct {
 	ToolName    string
 	ToolDesc    string
 	ToolParams  map[string]any
-	CallbackURL string // base URL, e.g. "http://127.0.0.1:9100"
+	CallbackURL string // base URL, e.g. "http://127.0.0.1:9100" or "unix:///run/wick/sidecar.sock"
 	Client      *http.Client
+
+	// Batcher, when set, routes Execute through a shared ToolBatcher so
+	// concurrent calls to the same sidecar travel in one /tools/_batch request.
+	Batcher *ToolBatcher
 }
 
 // NewHTTPTool creates a new HTTP-backed tool.
@@ -27,9 +33,7 @@ func NewHTTPTool(name, desc string, params map[string]any, callbackURL string) *
 		ToolDesc:    desc,
 		ToolParams:  params,
 		CallbackURL: callbackURL,
-		Client: &http.Client{
-			Timeout: 120 * time.Second,
-		},
+		Client:      llm.CallbackHTTPClient(callbackURL, 120*time.Second),
 	}
 }
 
@@ -38,6 +42,10 @@ func (t *HTTPTool) Description() string       { return t.ToolDesc }
 func (t *HTTPTool) Parameters() map[string]any { return t.ToolParams }
 
 func (t *HTTPTool) Execute(ctx context.Context, args map[string]any) (string, error) {
+	if t.Batcher != nil {
+		return t.Batcher.Execute(ctx, t.ToolName, args)
+	}
+
 	payload, err := json.Marshal(map[string]any{
 		"name": t.ToolName,
 		"args": args,
@@ -46,7 +54,7 @@ func (t *HTTPTool) Execute(ctx context.Context, args map[string]any) (string, er
 		return "", fmt.Errorf("http_tool: marshal args: %w", err)
 	}
 
-	url := fmt.Sprintf("%s/tools/%s", t.CallbackURL, t.ToolName)
+	url := fmt.Sprintf("%s/tools/%s", llm.CallbackBaseURL(t.CallbackURL), t.ToolName)
 	req, err := http.NewRequestWithContext(ctx, "POST", url, bytes.NewReader(payload))
 	if err != nil {
 		return "", fmt.Errorf("http_tool: create request: %w", err)
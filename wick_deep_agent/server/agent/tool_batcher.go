@@ -0,0 +1,283 @@
+package agent
+
+import (
+	"bufio"
+	"bytes"
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+	"net/http"
+	"strconv"
+	"sync"
+	"time"
+
+	"wick_server/llm"
+)
+
+// Defaults for ToolBatcher. The window only needs to cover the gap between
+// the tool goroutines the loop starts for one LLM turn, so it stays small.
+const (
+	DefaultBatchWindow = 2 * time.Millisecond
+	DefaultMaxBatch    = 32
+)
+
+// ToolBatcher coalesces concurrent HTTPTool calls that share a callback URL
+// into a single POST {CallbackURL}/tools/_batch round-trip. The batch is
+// requested in stream mode, so each caller wakes as soon as its own result
+// frame arrives rather than when the slowest tool in the batch finishes.
+// A flush with a single call falls back to the per-tool endpoint so lone
+// calls pay no batching overhead beyond the window.
+type ToolBatcher struct {
+	CallbackURL string
+	Window      time.Duration
+	MaxBatch    int
+	Client      *http.Client
+
+	mu      sync.Mutex
+	pending []*batchCall
+	timer   *time.Timer
+}
+
+type batchCall struct {
+	ctx  context.Context
+	name string
+	args map[string]any
+	done chan batchResult
+}
+
+type batchResult struct {
+	output string
+	err    error
+}
+
+// NewToolBatcher creates a batcher for the given callback URL with default
+// window and batch size.
+func NewToolBatcher(callbackURL string) *ToolBatcher {
+	return &ToolBatcher{
+		CallbackURL: callbackURL,
+		Window:      DefaultBatchWindow,
+		MaxBatch:    DefaultMaxBatch,
+		Client:      llm.CallbackHTTPClient(callbackURL, 120*time.Second),
+	}
+}
+
+var toolBatchers sync.Map // callbackURL → *ToolBatcher
+
+// BatcherFor returns the shared batcher for a callback URL, creating it on
+// first use. All HTTPTools registered against the same sidecar share one
+// batcher so calls to different tools land in the same batch.
+func BatcherFor(callbackURL string) *ToolBatcher {
+	if b, ok := toolBatchers.Load(callbackURL); ok {
+		return b.(*ToolBatcher)
+	}
+	b, _ := toolBatchers.LoadOrStore(callbackURL, NewToolBatcher(callbackURL))
+	return b.(*ToolBatcher)
+}
+
+// Execute enqueues a call and blocks until its result arrives or ctx ends.
+func (b *ToolBatcher) Execute(ctx context.Context, name string, args map[string]any) (string, error) {
+	call := &batchCall{ctx: ctx, name: name, args: args, done: make(chan batchResult, 1)}
+
+	b.mu.Lock()
+	b.pending = append(b.pending, call)
+	var batch []*batchCall
+	if len(b.pending) >= b.MaxBatch {
+		batch = b.takeLocked()
+	} else if b.timer == nil {
+		b.timer = time.AfterFunc(b.Window, b.flushPending)
+	}
+	b.mu.Unlock()
+
+	if batch != nil {
+		go b.flush(batch)
+	}
+
+	select {
+	case r := <-call.done:
+		return r.output, r.err
+	case <-ctx.Done():
+		return "", ctx.Err()
+	}
+}
+
+// takeLocked detaches the pending calls and stops the window timer.
+// Caller must hold b.mu.
+func (b *ToolBatcher) takeLocked() []*batchCall {
+	batch := b.pending
+	b.pending = nil
+	if b.timer != nil {
+		b.timer.Stop()
+		b.timer = nil
+	}
+	return batch
+}
+
+func (b *ToolBatcher) flushPending() {
+	b.mu.Lock()
+	batch := b.takeLocked()
+	b.mu.Unlock()
+	if len(batch) > 0 {
+		b.flush(batch)
+	}
+}
+
+// flush sends one batch and delivers each result to its waiter. A lone call
+// runs under its caller's context. A real batch runs under a context that is
+// cancelled only once every caller has given up: one cancelled turn must not
+// fail the other calls sharing the round-trip.
+func (b *ToolBatcher) flush(batch []*batchCall) {
+	if len(batch) == 1 {
+		c := batch[0]
+		out, err := b.callSingle(c.ctx, c.name, c.args)
+		c.done <- batchResult{output: out, err: err}
+		return
+	}
+
+	ctx, cancel := context.WithCancel(context.Background())
+	defer cancel()
+	finished := make(chan struct{})
+	defer close(finished)
+	go func() {
+		for _, c := range batch {
+			select {
+			case <-c.ctx.Done():
+			case <-finished:
+				return
+			}
+		}
+		cancel()
+	}()
+
+	delivered := make([]bool, len(batch))
+	deliver := func(i int, r batchResult) {
+		if !delivered[i] {
+			delivered[i] = true
+			batch[i].done <- r
+		}
+	}
+
+	err := b.streamBatch(ctx, batch, func(r batchCallResult) {
+		i, convErr := strconv.Atoi(r.ID)
+		if convErr != nil || i < 0 || i >= len(batch) {
+			return
+		}
+		if r.Error != "" {
+			deliver(i, batchResult{err: fmt.Errorf("http_tool: %s: %s", batch[i].name, r.Error)})
+			return
+		}
+		deliver(i, batchResult{output: r.Result})
+	})
+
+	// Anything not delivered yet failed with the stream, or was never answered.
+	for i, c := range batch {
+		if err != nil {
+			deliver(i, batchResult{err: err})
+		} else {
+			deliver(i, batchResult{err: fmt.Errorf("http_tool: %s: missing from batch response", c.name)})
+		}
+	}
+}
+
+type batchCallResult struct {
+	ID     string `json:"id"`
+	Result string `json:"result"`
+	Error  string `json:"error"`
+	Done   bool   `json:"done"`
+}
+
+// streamBatch posts the batch in stream mode and calls onResult for each
+// "data: {...}" frame until the sidecar sends {"done": true}.
+func (b *ToolBatcher) streamBatch(ctx context.Context, batch []*batchCall, onResult func(batchCallResult)) error {
+	calls := make([]map[string]any, len(batch))
+	for i, c := range batch {
+		calls[i] = map[string]any{
+			"id":   strconv.Itoa(i),
+			"name": c.name,
+			"args": c.args,
+		}
+	}
+	payload, err := json.Marshal(map[string]any{"calls": calls, "stream": true})
+	if err != nil {
+		return fmt.Errorf("http_tool: marshal batch: %w", err)
+	}
+
+	resp, err := b.post(ctx, llm.CallbackBaseURL(b.CallbackURL)+"/tools/_batch", payload)
+	if err != nil {
+		return fmt.Errorf("http_tool: batch of %d: %w", len(batch), err)
+	}
+	defer resp.Body.Close()
+
+	// bufio.Reader rather than Scanner: tool results can exceed any fixed
+	// line limit.
+	reader := bufio.NewReader(resp.Body)
+	for {
+		line, readErr := reader.ReadBytes('\n')
+		if data, ok := bytes.CutPrefix(bytes.TrimRight(line, "\r\n"), []byte("data: ")); ok {
+			var r batchCallResult
+			if err := json.Unmarshal(data, &r); err == nil {
+				if r.Done {
+					return nil
+				}
+				onResult(r)
+			}
+		}
+		if readErr == io.EOF {
+			return nil
+		}
+		if readErr != nil {
+			return fmt.Errorf("http_tool: read batch stream: %w", readErr)
+		}
+	}
+}
+
+func (b *ToolBatcher) callSingle(ctx context.Context, name string, args map[string]any) (string, error) {
+	payload, err := json.Marshal(map[string]any{
+		"name": name,
+		"args": args,
+	})
+	if err != nil {
+		return "", fmt.Errorf("http_tool: marshal args: %w", err)
+	}
+
+	resp, err := b.post(ctx, fmt.Sprintf("%s/tools/%s", llm.CallbackBaseURL(b.CallbackURL), name), payload)
+	if err != nil {
+		return "", fmt.Errorf("http_tool: call %s: %w", name, err)
+	}
+	defer resp.Body.Close()
+
+	body, err := io.ReadAll(resp.Body)
+	if err != nil {
+		return "", fmt.Errorf("http_tool: read response: %w", err)
+	}
+
+	var result batchCallResult
+	if err := json.Unmarshal(body, &result); err != nil {
+		return "", fmt.Errorf("http_tool: parse response: %w", err)
+	}
+	if result.Error != "" {
+		return "", fmt.Errorf("http_tool: %s: %s", name, result.Error)
+	}
+	return result.Result, nil
+}
+
+// post sends a JSON request and returns the response for the caller to read
+// and close. Non-200 responses are turned into errors here.
+func (b *ToolBatcher) post(ctx context.Context, url string, payload []byte) (*http.Response, error) {
+	req, err := http.NewRequestWithContext(ctx, "POST", url, bytes.NewReader(payload))
+	if err != nil {
+		return nil, err
+	}
+	req.Header.Set("Content-Type", "application/json")
+
+	resp, err := b.Client.Do(req)
+	if err != nil {
+		return nil, err
+	}
+	if resp.StatusCode != http.StatusOK {
+		defer resp.Body.Close()
+		body, _ := io.ReadAll(resp.Body)
+		return nil, fmt.Errorf("returned %d: %s", resp.StatusCode, string(body))
+	}
+	return resp, nil
+}
@@ -0,0 +1,271 @@
+package agent
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+// fakeSidecar answers /tools/_batch (stream mode) and /tools/{name} like the
+// wick sidecar: every tool echoes its "x" arg, "boom" fails, "slow" takes
+// 300ms, and "hang" blocks until the request is cancelled (then closes
+// cancelled).
+func fakeSidecar(t *testing.T, batches, singles *int32, cancelled chan<- struct{}) *httptest.Server {
+	t.Helper()
+	var cancelOnce sync.Once
+	run := func(ctx context.Context, name string, args map[string]any) batchCallResult {
+		switch name {
+		case "boom":
+			return batchCallResult{Error: "exploded"}
+		case "slow":
+			time.Sleep(300 * time.Millisecond)
+		case "hang":
+			<-ctx.Done()
+			if cancelled != nil {
+				cancelOnce.Do(func() { close(cancelled) })
+			}
+			return batchCallResult{Error: "cancelled"}
+		}
+		x, _ := args["x"].(string)
+		return batchCallResult{Result: name + ":" + x}
+	}
+	return httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.URL.Path == "/tools/_batch" {
+			atomic.AddInt32(batches, 1)
+			var req struct {
+				Calls []struct {
+					ID   string         `json:"id"`
+					Name string         `json:"name"`
+					Args map[string]any `json:"args"`
+				} `json:"calls"`
+				Stream bool `json:"stream"`
+			}
+			if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+				t.Errorf("decode batch: %v", err)
+			}
+			if !req.Stream {
+				t.Errorf("batch request without stream=true")
+			}
+			w.Header().Set("Content-Type", "text/event-stream")
+			var mu sync.Mutex
+			var wg sync.WaitGroup
+			for _, c := range req.Calls {
+				wg.Add(1)
+				go func(id, name string, args map[string]any) {
+					defer wg.Done()
+					res := run(r.Context(), name, args)
+					res.ID = id
+					data, _ := json.Marshal(res)
+					mu.Lock()
+					defer mu.Unlock()
+					fmt.Fprintf(w, "data: %s\n\n", data)
+					w.(http.Flusher).Flush()
+				}(c.ID, c.Name, c.Args)
+			}
+			wg.Wait()
+			fmt.Fprint(w, "data: {\"done\": true}\n\n")
+			return
+		}
+		atomic.AddInt32(singles, 1)
+		var req struct {
+			Name string         `json:"name"`
+			Args map[string]any `json:"args"`
+		}
+		json.NewDecoder(r.Body).Decode(&req)
+		json.NewEncoder(w).Encode(run(r.Context(), strings.TrimPrefix(r.URL.Path, "/tools/"), req.Args))
+	}))
+}
+
+func TestToolBatcher_CoalescesConcurrentCalls(t *testing.T) {
+	var batches, singles int32
+	srv := fakeSidecar(t, &batches, &singles, nil)
+	defer srv.Close()
+
+	b := NewToolBatcher(srv.URL)
+	b.Window = 20 * time.Millisecond
+
+	names := []string{"a", "b", "boom", "c"}
+	outs := make([]string, len(names))
+	errs := make([]error, len(names))
+	var wg sync.WaitGroup
+	for i, name := range names {
+		wg.Add(1)
+		go func(i int, name string) {
+			defer wg.Done()
+			outs[i], errs[i] = b.Execute(context.Background(), name, map[string]any{"x": name})
+		}(i, name)
+	}
+	wg.Wait()
+
+	if got := atomic.LoadInt32(&batches); got != 1 {
+		t.Errorf("batch requests = %d, want 1", got)
+	}
+	if got := atomic.LoadInt32(&singles); got != 0 {
+		t.Errorf("single requests = %d, want 0", got)
+	}
+	for i, name := range names {
+		if name == "boom" {
+			if errs[i] == nil || !strings.Contains(errs[i].Error(), "exploded") {
+				t.Errorf("boom err = %v, want exploded", errs[i])
+			}
+			continue
+		}
+		if errs[i] != nil {
+			t.Errorf("%s: unexpected err %v", name, errs[i])
+		}
+		if want := name + ":" + name; outs[i] != want {
+			t.Errorf("%s: output = %q, want %q", name, outs[i], want)
+		}
+	}
+}
+
+func TestToolBatcher_LoneCallUsesSingleEndpoint(t *testing.T) {
+	var batches, singles int32
+	srv := fakeSidecar(t, &batches, &singles, nil)
+	defer srv.Close()
+
+	tool := NewHTTPTool("solo", "", nil, srv.URL)
+	tool.Batcher = NewToolBatcher(srv.URL)
+
+	out, err := tool.Execute(context.Background(), map[string]any{"x": "1"})
+	if err != nil {
+		t.Fatalf("Execute: %v", err)
+	}
+	if out != "solo:1" {
+		t.Errorf("output = %q, want solo:1", out)
+	}
+	if atomic.LoadInt32(&batches) != 0 || atomic.LoadInt32(&singles) != 1 {
+		t.Errorf("batches=%d singles=%d, want 0/1", batches, singles)
+	}
+}
+
+func TestToolBatcher_MaxBatchFlushesEarly(t *testing.T) {
+	var batches, singles int32
+	srv := fakeSidecar(t, &batches, &singles, nil)
+	defer srv.Close()
+
+	b := NewToolBatcher(srv.URL)
+	b.Window = time.Hour // only MaxBatch can trigger the flush
+	b.MaxBatch = 3
+
+	var wg sync.WaitGroup
+	for i := 0; i < 3; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			if _, err := b.Execute(context.Background(), "t", nil); err != nil {
+				t.Errorf("Execute: %v", err)
+			}
+		}()
+	}
+
+	done := make(chan struct{})
+	go func() { wg.Wait(); close(done) }()
+	select {
+	case <-done:
+	case <-time.After(2 * time.Second):
+		t.Fatal("full batch did not flush before the window")
+	}
+	if got := atomic.LoadInt32(&batches); got != 1 {
+		t.Errorf("batch requests = %d, want 1", got)
+	}
+}
+
+func TestToolBatcher_ContextCancelUnblocksCaller(t *testing.T) {
+	b := NewToolBatcher("http://127.0.0.1:1")
+	b.Window = time.Hour
+
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+	if _, err := b.Execute(ctx, "t", nil); err != context.Canceled {
+		t.Errorf("err = %v, want context.Canceled", err)
+	}
+}
+
+func TestToolBatcher_FastResultNotHeldBySlowCall(t *testing.T) {
+	var batches, singles int32
+	srv := fakeSidecar(t, &batches, &singles, nil)
+	defer srv.Close()
+
+	b := NewToolBatcher(srv.URL)
+	b.Window = 20 * time.Millisecond
+
+	var fastTook time.Duration
+	var wg sync.WaitGroup
+	for _, name := range []string{"fast", "slow"} {
+		wg.Add(1)
+		go func(name string) {
+			defer wg.Done()
+			start := time.Now()
+			if _, err := b.Execute(context.Background(), name, nil); err != nil {
+				t.Errorf("%s: %v", name, err)
+			}
+			if name == "fast" {
+				fastTook = time.Since(start)
+			}
+		}(name)
+	}
+	wg.Wait()
+
+	if got := atomic.LoadInt32(&batches); got != 1 {
+		t.Fatalf("batch requests = %d, want 1", got)
+	}
+	if fastTook >= 250*time.Millisecond {
+		t.Errorf("fast call took %v — waited for the slow call", fastTook)
+	}
+}
+
+func TestToolBatcher_CancelAbortsLoneRequest(t *testing.T) {
+	var batches, singles int32
+	cancelled := make(chan struct{})
+	srv := fakeSidecar(t, &batches, &singles, cancelled)
+	defer srv.Close()
+
+	b := NewToolBatcher(srv.URL)
+	ctx, cancel := context.WithTimeout(context.Background(), 50*time.Millisecond)
+	defer cancel()
+	if _, err := b.Execute(ctx, "hang", nil); err == nil {
+		t.Fatal("expected error from cancelled call")
+	}
+
+	select {
+	case <-cancelled:
+	case <-time.After(2 * time.Second):
+		t.Fatal("sidecar request still running after caller cancelled")
+	}
+}
+
+func TestToolBatcher_CancelAbortsBatchOnceAllCallersGone(t *testing.T) {
+	var batches, singles int32
+	cancelled := make(chan struct{})
+	srv := fakeSidecar(t, &batches, &singles, cancelled)
+	defer srv.Close()
+
+	b := NewToolBatcher(srv.URL)
+	b.Window = 20 * time.Millisecond
+
+	ctx, cancel := context.WithTimeout(context.Background(), 100*time.Millisecond)
+	defer cancel()
+	var wg sync.WaitGroup
+	for i := 0; i < 2; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			b.Execute(ctx, "hang", nil)
+		}()
+	}
+	wg.Wait()
+
+	select {
+	case <-cancelled:
+	case <-time.After(2 * time.Second):
+		t.Fatal("batch request still running after every caller cancelled")
+	}
+}
@@ -4,6 +4,7 @@ import (
 	"context"
 	"fmt"
 	"log"
+	"net"
 	"net/http"
 	"os"
 	"os/signal"
@@ -15,6 +16,13 @@ import (
 	"wick_server/tracing"
 )
 
+// ReadyLinePrefix starts the line Start prints to stdout once the listen
+// socket is bound, followed by the bound address, e.g.
+// "WICK_READY 127.0.0.1:8000". Supervisors (wick_py's GoRuntime) wait for
+// it instead of polling /health. Log output goes to stderr, so stdout
+// carries nothing else.
+const ReadyLinePrefix = "WICK_READY "
+
 // Server is the main wickserver instance. Create one with New(), register
 // agents and tools, then call Start() to run the HTTP server.
 type Server struct {
@@ -190,7 +198,15 @@ func (s *Server) Start() error {
 		log.Printf("wick_server starting on %s (agents=%d, auth=disabled)", addr, registry.TemplateCount())
 	}
 
-	if err := s.srv.ListenAndServe(); err != http.ErrServerClosed {
+	// Bind before announcing readiness: connections that arrive between
+	// Listen and Serve wait in the accept backlog instead of being refused.
+	ln, err := net.Listen("tcp", addr)
+	if err != nil {
+		return err
+	}
+	fmt.Fprintf(os.Stdout, "%s%s\n", ReadyLinePrefix, ln.Addr())
+
+	if err := s.srv.Serve(ln); err != http.ErrServerClosed {
 		return err
 	}
 	return nil
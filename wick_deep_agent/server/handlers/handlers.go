@@ -66,7 +66,7 @@ func RegisterRoutes(mux *http.ServeMux, deps *Deps) {
 		deps.Backends = NewBackendStore()
 	}
 
-	h := &agentHandler{deps: deps}
+	h := &agentHandler{deps: deps, registered: newRegistrationCache()}
 
 	mux.HandleFunc("/agents/", func(w http.ResponseWriter, r *http.Request) {
 		path := strings.TrimPrefix(r.URL.Path, "/agents")
@@ -97,6 +97,10 @@ func RegisterRoutes(mux *http.ServeMux, deps *Deps) {
 			h.registerTool(w, r)
 			return
 		}
+		if path == "register" && r.Method == http.MethodPost {
+			h.registerBulk(w, r)
+			return
+		}
 		if strings.HasPrefix(path, "tools/deregister/") {
 			if r.Method == http.MethodDelete {
 				toolName := strings.TrimPrefix(path, "tools/deregister/")
@@ -238,6 +242,10 @@ func RegisterRoutes(mux *http.ServeMux, deps *Deps) {
 
 type agentHandler struct {
 	deps *Deps
+
+	// registered remembers what POST /agents/register last applied, so an
+	// identical re-registration is skipped (see registration.go).
+	registered *registrationCache
 }
 
 // resolveUsername extracts username from the request via the injected ResolveUser func.
@@ -307,45 +315,55 @@ func (h *agentHandler) getAgent(w http.ResponseWriter, r *http.Request, agentID
 	writeJSON(w, http.StatusOK, info)
 }
 
+// createAgentRequest is the body of POST /agents/ and one entry of
+// POST /agents/register.
+type createAgentRequest struct {
+	AgentID       string              `json:"agent_id"`
+	Name          string              `json:"name"`
+	Model         any                 `json:"model"`
+	SystemPrompt  string              `json:"system_prompt"`
+	Tools         []string            `json:"tools"`
+	Middleware    []string            `json:"middleware"`
+	Subagents     []agent.SubAgentCfg `json:"subagents"`
+	Backend       *agent.BackendCfg   `json:"backend"`
+	Skills        *agent.SkillsCfg    `json:"skills"`
+	Memory        *agent.MemoryCfg    `json:"memory"`
+	Debug         bool                `json:"debug"`
+	ContextWindow int                 `json:"context_window"`
+}
+
 func (h *agentHandler) createAgent(w http.ResponseWriter, r *http.Request) {
 	if !h.requireAdmin(w, r) {
 		return
 	}
 
-	var req struct {
-		AgentID       string              `json:"agent_id"`
-		Name          string              `json:"name"`
-		Model         any                 `json:"model"`
-		SystemPrompt  string              `json:"system_prompt"`
-		Tools         []string            `json:"tools"`
-		Middleware    []string             `json:"middleware"`
-		Subagents    []agent.SubAgentCfg   `json:"subagents"`
-		Backend      *agent.BackendCfg     `json:"backend"`
-		Skills       *agent.SkillsCfg      `json:"skills"`
-		Memory       *agent.MemoryCfg      `json:"memory"`
-		Debug         bool                 `json:"debug"`
-		ContextWindow int                  `json:"context_window"`
-	}
+	var req createAgentRequest
 	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
 		writeJSONError(w, http.StatusBadRequest, "invalid JSON: "+err.Error())
 		return
 	}
 
+	inst := h.applyAgent(&req, h.resolveUsername(r))
+	h.registered.forgetAgent(req.AgentID)
+	writeJSON(w, http.StatusCreated, buildAgentInfo(inst, h.deps.Backends))
+}
+
+// applyAgent registers the agent template and returns the caller's instance.
+func (h *agentHandler) applyAgent(req *createAgentRequest, username string) *agent.Instance {
 	cfg := &agent.AgentConfig{
 		Name:          req.Name,
 		Model:         req.Model,
 		SystemPrompt:  req.SystemPrompt,
 		Tools:         req.Tools,
 		Middleware:    req.Middleware,
-		Subagents:    req.Subagents,
-		Backend:      req.Backend,
-		Skills:       req.Skills,
-		Memory:       req.Memory,
+		Subagents:     req.Subagents,
+		Backend:       req.Backend,
+		Skills:        req.Skills,
+		Memory:        req.Memory,
 		Debug:         req.Debug,
 		ContextWindow: req.ContextWindow,
 	}
 
-	username := h.resolveUsername(r)
 	h.deps.Registry.RegisterTemplate(req.AgentID, cfg)
 	inst, _ := h.deps.Registry.GetOrClone(req.AgentID, username)
 
@@ -356,8 +374,7 @@ func (h *agentHandler) createAgent(w http.ResponseWriter, r *http.Request) {
 			h.deps.Backends.Set(req.AgentID, username, b)
 		}
 	}
-
-	writeJSON(w, http.StatusCreated, buildAgentInfo(inst, h.deps.Backends))
+	return inst
 }
 
 func (h *agentHandler) deleteAgent(w http.ResponseWriter, r *http.Request, agentID string) {
@@ -366,6 +383,7 @@ func (h *agentHandler) deleteAgent(w http.ResponseWriter, r *http.Request, agent
 	}
 
 	username := h.resolveUsername(r)
+	h.registered.forgetAgent(agentID)
 	// Clean up backend if present
 	h.deps.Backends.Remove(agentID, username)
 	if err := h.deps.Registry.DeleteInstance(agentID, username); err != nil {
@@ -873,34 +891,45 @@ func (h *agentHandler) availableTools(w http.ResponseWriter, r *http.Request) {
 	writeJSON(w, http.StatusOK, map[string]any{"tools": tools})
 }
 
+// registerToolRequest is the body of POST /agents/tools/register and one
+// entry of POST /agents/register.
+type registerToolRequest struct {
+	AgentID     string         `json:"agent_id"`
+	Name        string         `json:"name"`
+	Description string         `json:"description"`
+	Parameters  map[string]any `json:"parameters"`
+	CallbackURL string         `json:"callback_url"`
+	Batch       bool           `json:"batch"`
+}
+
+func (req *registerToolRequest) validate() error {
+	if req.Name == "" {
+		return fmt.Errorf("name is required")
+	}
+	if req.CallbackURL == "" {
+		return fmt.Errorf("callback_url is required")
+	}
+	return nil
+}
+
 func (h *agentHandler) registerTool(w http.ResponseWriter, r *http.Request) {
 	if h.deps.ExternalTools == nil {
 		writeJSONError(w, http.StatusInternalServerError, "external tools not initialized")
 		return
 	}
 
-	var req struct {
-		AgentID     string         `json:"agent_id"`
-		Name        string         `json:"name"`
-		Description string         `json:"description"`
-		Parameters  map[string]any `json:"parameters"`
-		CallbackURL string         `json:"callback_url"`
-	}
+	var req registerToolRequest
 	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
 		writeJSONError(w, http.StatusBadRequest, "invalid JSON: "+err.Error())
 		return
 	}
-	if req.Name == "" {
-		writeJSONError(w, http.StatusBadRequest, "name is required")
-		return
-	}
-	if req.CallbackURL == "" {
-		writeJSONError(w, http.StatusBadRequest, "callback_url is required")
+	if err := req.validate(); err != nil {
+		writeJSONError(w, http.StatusBadRequest, err.Error())
 		return
 	}
 
-	tool := agent.NewHTTPTool(req.Name, req.Description, req.Parameters, req.CallbackURL)
-	h.deps.ExternalTools.RegisterForAgent(req.AgentID, tool)
+	h.applyTool(&req)
+	h.registered.forgetTool(req.AgentID, req.Name)
 
 	if req.AgentID != "" {
 		h.deps.Registry.InvalidateAgent(req.AgentID)
@@ -908,7 +937,6 @@ func (h *agentHandler) registerTool(w http.ResponseWriter, r *http.Request) {
 		h.deps.Registry.InvalidateAllAgents()
 	}
 
-	log.Printf("Registered external tool %q for agent %q (callback: %s)", req.Name, req.AgentID, req.CallbackURL)
 	writeJSON(w, http.StatusOK, map[string]any{
 		"status":   "registered",
 		"name":     req.Name,
@@ -916,6 +944,17 @@ func (h *agentHandler) registerTool(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+// applyTool stores the HTTP tool. Callers invalidate the affected agents.
+func (h *agentHandler) applyTool(req *registerToolRequest) *agent.HTTPTool {
+	tool := agent.NewHTTPTool(req.Name, req.Description, req.Parameters, req.CallbackURL)
+	if req.Batch {
+		tool.Batcher = agent.BatcherFor(req.CallbackURL)
+	}
+	h.deps.ExternalTools.RegisterForAgent(req.AgentID, tool)
+	log.Printf("Registered external tool %q for agent %q (callback: %s)", req.Name, req.AgentID, req.CallbackURL)
+	return tool
+}
+
 func (h *agentHandler) deregisterTool(w http.ResponseWriter, r *http.Request, name string) {
 	if h.deps.ExternalTools == nil {
 		writeJSONError(w, http.StatusInternalServerError, "external tools not initialized")
@@ -923,6 +962,7 @@ func (h *agentHandler) deregisterTool(w http.ResponseWriter, r *http.Request, na
 	}
 
 	agentID := r.URL.Query().Get("agent_id")
+	h.registered.forgetTool(agentID, name)
 	if !h.deps.ExternalTools.RemoveForAgent(agentID, name) {
 		writeJSONError(w, http.StatusNotFound, fmt.Sprintf("tool %q not found", name))
 		return
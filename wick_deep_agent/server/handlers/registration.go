@@ -0,0 +1,190 @@
+package handlers
+
+import (
+	"crypto/sha256"
+	"encoding/hex"
+	"encoding/json"
+	"fmt"
+	"net/http"
+	"sync"
+
+	"wick_server/agent"
+)
+
+// POST /agents/register — bulk agent and tool registration.
+//
+// Body:     {"agents": [<POST /agents/ body>, ...],
+//            "tools":  [<POST /agents/tools/register body>, ...]}
+// Response: {"agents": [{"agent_id", "status": "created" | "unchanged"}],
+//            "tools":  [{"name", "agent_id", "status": "registered" | "unchanged"}]}
+//
+// Agents are applied before tools, and each affected agent's cached
+// instances are invalidated once rather than once per tool.
+//
+// Every entry is hashed (SHA-256 of its JSON). An entry whose hash matches
+// the previous bulk registration is skipped, as long as that registration is
+// still the live one (not replaced or removed through the single-item
+// endpoints). A Python app restarted against a long-running server then
+// re-registers nothing that didn't change, and its agents aren't rebuilt.
+
+type bulkRegisterRequest struct {
+	Agents []createAgentRequest  `json:"agents"`
+	Tools  []registerToolRequest `json:"tools"`
+}
+
+type bulkAgentResult struct {
+	AgentID string `json:"agent_id"`
+	Status  string `json:"status"`
+}
+
+type bulkToolResult struct {
+	Name    string `json:"name"`
+	AgentID string `json:"agent_id"`
+	Status  string `json:"status"`
+}
+
+func (h *agentHandler) registerBulk(w http.ResponseWriter, r *http.Request) {
+	if h.deps.ExternalTools == nil {
+		writeJSONError(w, http.StatusInternalServerError, "external tools not initialized")
+		return
+	}
+
+	var req bulkRegisterRequest
+	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+		writeJSONError(w, http.StatusBadRequest, "invalid JSON: "+err.Error())
+		return
+	}
+	if len(req.Agents) > 0 && !h.requireAdmin(w, r) {
+		return
+	}
+	// Validate everything first so a bad entry doesn't leave half a batch applied.
+	for i := range req.Tools {
+		if err := req.Tools[i].validate(); err != nil {
+			writeJSONError(w, http.StatusBadRequest, fmt.Sprintf("tools[%d]: %v", i, err))
+			return
+		}
+	}
+
+	username := h.resolveUsername(r)
+	agents := make([]bulkAgentResult, 0, len(req.Agents))
+	for i := range req.Agents {
+		a := &req.Agents[i]
+		hash := contentHash(a)
+		status := "unchanged"
+		if !h.registered.agentCurrent(a.AgentID, hash, h.deps.Registry) {
+			h.applyAgent(a, username)
+			h.registered.rememberAgent(a.AgentID, hash, h.deps.Registry.GetTemplate(a.AgentID).Config)
+			status = "created"
+		}
+		agents = append(agents, bulkAgentResult{AgentID: a.AgentID, Status: status})
+	}
+
+	tools := make([]bulkToolResult, 0, len(req.Tools))
+	invalidate := make(map[string]bool)
+	for i := range req.Tools {
+		t := &req.Tools[i]
+		hash := contentHash(t)
+		status := "unchanged"
+		if !h.registered.toolCurrent(t.AgentID, t.Name, hash, h.deps.ExternalTools) {
+			tool := h.applyTool(t)
+			h.registered.rememberTool(t.AgentID, t.Name, hash, tool)
+			invalidate[t.AgentID] = true
+			status = "registered"
+		}
+		tools = append(tools, bulkToolResult{Name: t.Name, AgentID: t.AgentID, Status: status})
+	}
+	if invalidate[""] {
+		h.deps.Registry.InvalidateAllAgents()
+	} else {
+		for agentID := range invalidate {
+			h.deps.Registry.InvalidateAgent(agentID)
+		}
+	}
+
+	writeJSON(w, http.StatusOK, map[string]any{"agents": agents, "tools": tools})
+}
+
+// contentHash is the hex SHA-256 of v's JSON encoding. encoding/json emits
+// struct fields in declaration order and map keys sorted, so equal content
+// always hashes the same.
+func contentHash(v any) string {
+	data, err := json.Marshal(v)
+	if err != nil {
+		return "" // never matches a stored hash, so the entry is applied
+	}
+	sum := sha256.Sum256(data)
+	return hex.EncodeToString(sum[:])
+}
+
+// registrationCache remembers the hash and resulting object of each entry
+// applied by registerBulk. An entry is current only while the registry (or
+// tool store) still holds that exact object.
+type registrationCache struct {
+	mu     sync.Mutex
+	agents map[string]agentRegistration
+	tools  map[toolKey]toolRegistration
+}
+
+type agentRegistration struct {
+	hash string
+	cfg  *agent.AgentConfig
+}
+
+type toolKey struct{ agentID, name string }
+
+type toolRegistration struct {
+	hash string
+	tool *agent.HTTPTool
+}
+
+func newRegistrationCache() *registrationCache {
+	return &registrationCache{
+		agents: make(map[string]agentRegistration),
+		tools:  make(map[toolKey]toolRegistration),
+	}
+}
+
+func (c *registrationCache) agentCurrent(agentID, hash string, reg *agent.Registry) bool {
+	c.mu.Lock()
+	rec, ok := c.agents[agentID]
+	c.mu.Unlock()
+	if !ok || hash == "" || rec.hash != hash {
+		return false
+	}
+	tmpl := reg.GetTemplate(agentID)
+	return tmpl != nil && tmpl.Config == rec.cfg
+}
+
+func (c *registrationCache) rememberAgent(agentID, hash string, cfg *agent.AgentConfig) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.agents[agentID] = agentRegistration{hash: hash, cfg: cfg}
+}
+
+func (c *registrationCache) forgetAgent(agentID string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	delete(c.agents, agentID)
+}
+
+func (c *registrationCache) toolCurrent(agentID, name, hash string, store *ToolStore) bool {
+	c.mu.Lock()
+	rec, ok := c.tools[toolKey{agentID, name}]
+	c.mu.Unlock()
+	if !ok || hash == "" || rec.hash != hash {
+		return false
+	}
+	return store.GetForAgent(agentID, name) == rec.tool
+}
+
+func (c *registrationCache) rememberTool(agentID, name, hash string, tool *agent.HTTPTool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.tools[toolKey{agentID, name}] = toolRegistration{hash: hash, tool: tool}
+}
+
+func (c *registrationCache) forgetTool(agentID, name string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	delete(c.tools, toolKey{agentID, name})
+}
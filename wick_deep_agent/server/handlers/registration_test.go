@@ -0,0 +1,115 @@
+package handlers
+
+import (
+	"bytes"
+	"encoding/json"
+	"net/http"
+	"net/http/httptest"
+	"testing"
+
+	"wick_server/agent"
+)
+
+type bulkResponse struct {
+	Agents []bulkAgentResult `json:"agents"`
+	Tools  []bulkToolResult  `json:"tools"`
+}
+
+func newRegistrationServer() (*http.ServeMux, *Deps) {
+	deps := &Deps{Registry: agent.NewRegistry(), ExternalTools: NewToolStore()}
+	mux := http.NewServeMux()
+	RegisterRoutes(mux, deps)
+	return mux, deps
+}
+
+func postBulk(t *testing.T, mux *http.ServeMux, body map[string]any) bulkResponse {
+	t.Helper()
+	data, _ := json.Marshal(body)
+	rec := httptest.NewRecorder()
+	mux.ServeHTTP(rec, httptest.NewRequest(http.MethodPost, "/agents/register", bytes.NewReader(data)))
+	if rec.Code != http.StatusOK {
+		t.Fatalf("status %d: %s", rec.Code, rec.Body.String())
+	}
+	var out bulkResponse
+	if err := json.Unmarshal(rec.Body.Bytes(), &out); err != nil {
+		t.Fatal(err)
+	}
+	return out
+}
+
+func bulkBody(searchDesc string) map[string]any {
+	tool := func(name, desc string) map[string]any {
+		return map[string]any{
+			"agent_id": "a1", "name": name, "description": desc,
+			"parameters":   map[string]any{"type": "object"},
+			"callback_url": "http://127.0.0.1:9100", "batch": true,
+		}
+	}
+	return map[string]any{
+		"agents": []any{map[string]any{"agent_id": "a1", "name": "A1", "system_prompt": "hi"}},
+		"tools":  []any{tool("search", searchDesc), tool("fetch", "Fetch a URL")},
+	}
+}
+
+func TestBulkRegisterSkipsUnchangedEntries(t *testing.T) {
+	mux, deps := newRegistrationServer()
+
+	first := postBulk(t, mux, bulkBody("Search"))
+	if first.Agents[0].Status != "created" || first.Tools[0].Status != "registered" || first.Tools[1].Status != "registered" {
+		t.Fatalf("first registration: %+v", first)
+	}
+	if deps.Registry.GetTemplate("a1") == nil || deps.ExternalTools.GetForAgent("a1", "fetch") == nil {
+		t.Fatal("agent or tool not stored")
+	}
+
+	again := postBulk(t, mux, bulkBody("Search"))
+	if again.Agents[0].Status != "unchanged" || again.Tools[0].Status != "unchanged" || again.Tools[1].Status != "unchanged" {
+		t.Fatalf("identical re-registration: %+v", again)
+	}
+
+	changed := postBulk(t, mux, bulkBody("Search the web"))
+	if changed.Tools[0].Status != "registered" || changed.Tools[1].Status != "unchanged" {
+		t.Fatalf("one tool changed: %+v", changed)
+	}
+	if got := deps.ExternalTools.GetForAgent("a1", "search").ToolDesc; got != "Search the web" {
+		t.Fatalf("description = %q", got)
+	}
+}
+
+func TestBulkRegisterReappliesAfterSingleItemChanges(t *testing.T) {
+	mux, _ := newRegistrationServer()
+	postBulk(t, mux, bulkBody("Search"))
+
+	rec := httptest.NewRecorder()
+	mux.ServeHTTP(rec, httptest.NewRequest(http.MethodDelete, "/agents/tools/deregister/fetch?agent_id=a1", nil))
+	if rec.Code != http.StatusOK {
+		t.Fatalf("deregister: %d", rec.Code)
+	}
+	rec = httptest.NewRecorder()
+	body := bytes.NewReader([]byte(`{"agent_id": "a1", "name": "A1 v2"}`))
+	mux.ServeHTTP(rec, httptest.NewRequest(http.MethodPost, "/agents/", body))
+	if rec.Code != http.StatusCreated {
+		t.Fatalf("create: %d", rec.Code)
+	}
+
+	out := postBulk(t, mux, bulkBody("Search"))
+	if out.Agents[0].Status != "created" || out.Tools[1].Status != "registered" || out.Tools[0].Status != "unchanged" {
+		t.Fatalf("after single-item changes: %+v", out)
+	}
+}
+
+func TestBulkRegisterValidatesBeforeApplying(t *testing.T) {
+	mux, deps := newRegistrationServer()
+	body, _ := json.Marshal(map[string]any{
+		"agents": []any{map[string]any{"agent_id": "a1"}},
+		"tools":  []any{map[string]any{"name": "no-callback"}},
+	})
+	rec := httptest.NewRecorder()
+	mux.ServeHTTP(rec, httptest.NewRequest(http.MethodPost, "/agents/register", bytes.NewReader(body)))
+	if rec.Code != http.StatusBadRequest {
+		t.Fatalf("status %d", rec.Code)
+	}
+	if deps.Registry.GetTemplate("a1") != nil {
+		t.Fatal("agent applied despite invalid batch")
+	}
+}
@@ -89,6 +89,14 @@ func (ts *ToolStore) Get(name string) *agent.HTTPTool {
 	return nil
 }
 
+// GetForAgent returns the HTTP tool registered under exactly this agent
+// scope (no fallback to global tools), or nil.
+func (ts *ToolStore) GetForAgent(agentID, name string) *agent.HTTPTool {
+	ts.mu.RLock()
+	defer ts.mu.RUnlock()
+	return ts.tools[agentID][name]
+}
+
 // ForAgent returns tools scoped to the given agent plus global tools.
 // Agent-specific tools override global tools with the same name.
 func (ts *ToolStore) ForAgent(agentID string) []agent.Tool {
@@ -0,0 +1,56 @@
+package llm
+
+import (
+	"context"
+	"net"
+	"net/http"
+	"strings"
+	"sync"
+	"time"
+)
+
+// Sidecar callback URLs are either plain HTTP ("http://127.0.0.1:9100") or a
+// Unix domain socket ("unix:///run/wick/sidecar.sock") for a co-located
+// sidecar. Requests to a socket are sent to the placeholder base URL
+// "http://unix" through a transport that dials the socket, so callers build
+// request URLs the same way for both.
+
+const unixScheme = "unix://"
+
+var unixTransports sync.Map // socket path → *http.Transport
+
+// CallbackBaseURL returns the base URL to append request paths to.
+func CallbackBaseURL(callbackURL string) string {
+	if strings.HasPrefix(callbackURL, unixScheme) {
+		return "http://unix"
+	}
+	return strings.TrimRight(callbackURL, "/")
+}
+
+// CallbackHTTPClient returns an http.Client that reaches callbackURL. All
+// clients for the same socket share one transport, and so one connection
+// pool, the way TCP clients share http.DefaultTransport.
+func CallbackHTTPClient(callbackURL string, timeout time.Duration) *http.Client {
+	client := &http.Client{Timeout: timeout}
+	if path, ok := strings.CutPrefix(callbackURL, unixScheme); ok {
+		client.Transport = unixTransport(path)
+	}
+	return client
+}
+
+func unixTransport(path string) *http.Transport {
+	if t, ok := unixTransports.Load(path); ok {
+		return t.(*http.Transport)
+	}
+	var d net.Dialer
+	t := &http.Transport{
+		DialContext: func(ctx context.Context, _, _ string) (net.Conn, error) {
+			return d.DialContext(ctx, "unix", path)
+		},
+		MaxIdleConns:        100,
+		MaxIdleConnsPerHost: 100,
+		IdleConnTimeout:     90 * time.Second,
+	}
+	actual, _ := unixTransports.LoadOrStore(path, t)
+	return actual.(*http.Transport)
+}
@@ -0,0 +1,72 @@
+package llm
+
+import (
+	"context"
+	"fmt"
+	"net"
+	"net/http"
+	"os"
+	"path/filepath"
+	"testing"
+)
+
+// serveUnix starts an HTTP server on a fresh Unix socket and returns its
+// "unix://" callback URL.
+func serveUnix(t *testing.T, h http.Handler) string {
+	t.Helper()
+	dir, err := os.MkdirTemp("", "wick") // short path: sun_path is ~108 bytes
+	if err != nil {
+		t.Fatal(err)
+	}
+	t.Cleanup(func() { os.RemoveAll(dir) })
+	sock := filepath.Join(dir, "sidecar.sock")
+	ln, err := net.Listen("unix", sock)
+	if err != nil {
+		t.Fatal(err)
+	}
+	srv := &http.Server{Handler: h}
+	go srv.Serve(ln)
+	t.Cleanup(func() { srv.Close() })
+	return "unix://" + sock
+}
+
+func TestCallbackBaseURL(t *testing.T) {
+	cases := map[string]string{
+		"http://127.0.0.1:9100/":     "http://127.0.0.1:9100",
+		"unix:///run/wick/side.sock": "http://unix",
+	}
+	for in, want := range cases {
+		if got := CallbackBaseURL(in); got != want {
+			t.Errorf("CallbackBaseURL(%q) = %q, want %q", in, got, want)
+		}
+	}
+}
+
+func TestHTTPProxyClient_UnixSocket(t *testing.T) {
+	url := serveUnix(t, http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.URL.Path != "/llm/m/call" {
+			t.Errorf("path = %s", r.URL.Path)
+		}
+		fmt.Fprint(w, `{"content": "over uds"}`)
+	}))
+
+	resp, err := NewHTTPProxyClient(url, "m").Call(context.Background(), Request{Model: "m"})
+	if err != nil {
+		t.Fatalf("Call: %v", err)
+	}
+	if resp.Content != "over uds" {
+		t.Errorf("content = %q", resp.Content)
+	}
+}
+
+func TestCallbackHTTPClient_SharesTransportPerSocket(t *testing.T) {
+	a := CallbackHTTPClient("unix:///tmp/a.sock", 0)
+	b := CallbackHTTPClient("unix:///tmp/a.sock", 0)
+	c := CallbackHTTPClient("unix:///tmp/c.sock", 0)
+	if a.Transport != b.Transport || a.Transport == c.Transport {
+		t.Error("expected one transport per socket path")
+	}
+	if CallbackHTTPClient("http://127.0.0.1:9100", 0).Transport != nil {
+		t.Error("TCP callbacks should use the default transport")
+	}
+}
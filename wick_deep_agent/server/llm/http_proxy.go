@@ -7,11 +7,22 @@ import (
 	"encoding/json"
 	"fmt"
 	"io"
+	"math/rand"
 	"net/http"
+	"strconv"
 	"strings"
 	"time"
 )
 
+// Retry policy for 429s from the sidecar's admission control: wait out its
+// Retry-After (plus up to 20% jitter so queued callers don't return in
+// lockstep) and try again, a bounded number of times.
+const (
+	maxOverloadRetries = 5
+	defaultRetryAfter  = time.Second
+	maxRetryAfter      = 60 * time.Second
+)
+
 // HTTPProxyClient implements the Client interface by proxying LLM calls
 // to a Python sidecar over HTTP. This allows Python apps to define custom
 // model handlers with full control over auth, request/response transforms.
@@ -22,12 +33,13 @@ type HTTPProxyClient struct {
 }
 
 // NewHTTPProxyClient creates a new proxy client that forwards LLM calls
-// to the given callback URL (e.g. "http://127.0.0.1:9100").
+// to the given callback URL (e.g. "http://127.0.0.1:9100" or
+// "unix:///run/wick/sidecar.sock").
 func NewHTTPProxyClient(callbackURL, modelName string) *HTTPProxyClient {
 	return &HTTPProxyClient{
-		callbackURL: strings.TrimRight(callbackURL, "/"),
+		callbackURL: CallbackBaseURL(callbackURL),
 		modelName:   modelName,
-		client:      &http.Client{Timeout: 5 * time.Minute},
+		client:      CallbackHTTPClient(callbackURL, 5*time.Minute),
 	}
 }
 
@@ -39,13 +51,7 @@ func (c *HTTPProxyClient) Call(ctx context.Context, req Request) (*Response, err
 	}
 
 	url := fmt.Sprintf("%s/llm/%s/call", c.callbackURL, c.modelName)
-	httpReq, err := http.NewRequestWithContext(ctx, "POST", url, bytes.NewReader(body))
-	if err != nil {
-		return nil, err
-	}
-	httpReq.Header.Set("Content-Type", "application/json")
-
-	resp, err := c.client.Do(httpReq)
+	resp, err := c.post(ctx, url, body)
 	if err != nil {
 		return nil, err
 	}
@@ -86,13 +92,7 @@ func (c *HTTPProxyClient) Stream(ctx context.Context, req Request, ch chan<- Str
 	}
 
 	url := fmt.Sprintf("%s/llm/%s/stream", c.callbackURL, c.modelName)
-	httpReq, err := http.NewRequestWithContext(ctx, "POST", url, bytes.NewReader(body))
-	if err != nil {
-		return err
-	}
-	httpReq.Header.Set("Content-Type", "application/json")
-
-	resp, err := c.client.Do(httpReq)
+	resp, err := c.post(ctx, url, body)
 	if err != nil {
 		return err
 	}
@@ -125,3 +125,55 @@ func (c *HTTPProxyClient) Stream(ctx context.Context, req Request, ch chan<- Str
 
 	return scanner.Err()
 }
+
+// post sends a JSON body, retrying while the sidecar answers 429 (provider
+// at its admission limit). The caller reads and closes the response; a 429
+// is returned as-is once the retries are used up.
+func (c *HTTPProxyClient) post(ctx context.Context, url string, body []byte) (*http.Response, error) {
+	for attempt := 0; ; attempt++ {
+		httpReq, err := http.NewRequestWithContext(ctx, "POST", url, bytes.NewReader(body))
+		if err != nil {
+			return nil, err
+		}
+		httpReq.Header.Set("Content-Type", "application/json")
+
+		resp, err := c.client.Do(httpReq)
+		if err != nil {
+			return nil, err
+		}
+		if resp.StatusCode != http.StatusTooManyRequests || attempt >= maxOverloadRetries {
+			return resp, nil
+		}
+
+		wait := parseRetryAfter(resp.Header.Get("Retry-After"))
+		io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+		wait += time.Duration(rand.Int63n(int64(wait)/5 + 1))
+
+		timer := time.NewTimer(wait)
+		select {
+		case <-timer.C:
+		case <-ctx.Done():
+			timer.Stop()
+			return nil, ctx.Err()
+		}
+	}
+}
+
+// parseRetryAfter reads a Retry-After header (delay in seconds or an HTTP
+// date), falling back to defaultRetryAfter and capping at maxRetryAfter.
+func parseRetryAfter(value string) time.Duration {
+	var wait time.Duration
+	if secs, err := strconv.Atoi(strings.TrimSpace(value)); err == nil {
+		wait = time.Duration(secs) * time.Second
+	} else if at, err := http.ParseTime(value); err == nil {
+		wait = time.Until(at)
+	}
+	if wait <= 0 {
+		return defaultRetryAfter
+	}
+	if wait > maxRetryAfter {
+		return maxRetryAfter
+	}
+	return wait
+}
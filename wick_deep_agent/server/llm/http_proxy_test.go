@@ -0,0 +1,103 @@
+package llm
+
+import (
+	"context"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+// overloadedSidecar answers 429 with the given Retry-After for the first
+// `rejects` requests, then serves a one-chunk stream / call response.
+func overloadedSidecar(t *testing.T, rejects int32, retryAfter string, hits *int32) *httptest.Server {
+	t.Helper()
+	return httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if atomic.AddInt32(hits, 1) <= rejects {
+			w.Header().Set("Retry-After", retryAfter)
+			w.WriteHeader(http.StatusTooManyRequests)
+			fmt.Fprint(w, `{"error": "overloaded"}`)
+			return
+		}
+		if r.URL.Path == "/llm/m/stream" {
+			fmt.Fprint(w, "data: {\"delta\": \"hi\"}\n\ndata: {\"done\": true}\n\n")
+			return
+		}
+		fmt.Fprint(w, `{"content": "hi"}`)
+	}))
+}
+
+func TestHTTPProxyClient_StreamRetriesAfter429(t *testing.T) {
+	var hits int32
+	srv := overloadedSidecar(t, 2, "0", &hits)
+	defer srv.Close()
+
+	ch := make(chan StreamChunk, 8)
+	c := NewHTTPProxyClient(srv.URL, "m")
+	if err := c.Stream(context.Background(), Request{Model: "m"}, ch); err != nil {
+		t.Fatalf("Stream: %v", err)
+	}
+	var got string
+	for chunk := range ch {
+		got += chunk.Delta
+	}
+	if got != "hi" {
+		t.Errorf("delta = %q, want hi", got)
+	}
+	if n := atomic.LoadInt32(&hits); n != 3 {
+		t.Errorf("requests = %d, want 3 (two 429s, then success)", n)
+	}
+}
+
+func TestHTTPProxyClient_CallGivesUpAfterMaxRetries(t *testing.T) {
+	var hits int32
+	srv := overloadedSidecar(t, 100, "0", &hits)
+	defer srv.Close()
+
+	c := NewHTTPProxyClient(srv.URL, "m")
+	_, err := c.Call(context.Background(), Request{Model: "m"})
+	if err == nil {
+		t.Fatal("expected error after exhausting retries")
+	}
+	if n := atomic.LoadInt32(&hits); n != maxOverloadRetries+1 {
+		t.Errorf("requests = %d, want %d", n, maxOverloadRetries+1)
+	}
+}
+
+func TestHTTPProxyClient_ContextCancelStopsWaiting(t *testing.T) {
+	var hits int32
+	srv := overloadedSidecar(t, 100, "30", &hits)
+	defer srv.Close()
+
+	ctx, cancel := context.WithTimeout(context.Background(), 100*time.Millisecond)
+	defer cancel()
+	start := time.Now()
+	_, err := NewHTTPProxyClient(srv.URL, "m").Call(ctx, Request{Model: "m"})
+	if err != context.DeadlineExceeded {
+		t.Errorf("err = %v, want context.DeadlineExceeded", err)
+	}
+	if took := time.Since(start); took > 2*time.Second {
+		t.Errorf("waited %v — Retry-After not interrupted by ctx", took)
+	}
+}
+
+func TestParseRetryAfter(t *testing.T) {
+	cases := map[string]time.Duration{
+		"3":       3 * time.Second,
+		"":        defaultRetryAfter,
+		"0":       defaultRetryAfter,
+		"garbage": defaultRetryAfter,
+		"9999":    maxRetryAfter,
+	}
+	for in, want := range cases {
+		if got := parseRetryAfter(in); got != want {
+			t.Errorf("parseRetryAfter(%q) = %v, want %v", in, got, want)
+		}
+	}
+	date := time.Now().Add(5 * time.Second).UTC().Format(http.TimeFormat)
+	if got := parseRetryAfter(date); got <= 0 || got > 6*time.Second {
+		t.Errorf("parseRetryAfter(date) = %v, want ~5s", got)
+	}
+}
@@ -0,0 +1,169 @@
+"""Micro-benchmark: provider SSE decoding, aiter_lines path vs wick.sse_events.
+
+Usage:
+    python benchmarks/bench_sse.py [--tokens 2000] [--number 20]
+
+(with wick installed, e.g. pip install -e ".[fast]")
+
+Replays a recorded-shape Anthropic Messages stream (message_start, one
+text block of --tokens deltas, a tool_use block, pings, message_stop) in
+network-sized chunks. It is decoded two ways into the text deltas a
+provider would yield:
+
+  - before: resp.aiter_lines(), "event: "/"data: " prefix checks,
+    json.loads per line and an async-generator hop per event (what
+    examples/agents/anthropic_provider.py did),
+  - after: sse_events() (byte-level SSEParser + the sidecar's JSON codec)
+    and a plain per-event function.
+
+Reports microseconds per streamed token for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from wick import _wire, sse_events
+
+
+def record_stream(tokens: int) -> bytes:
+    def frame(event: str, data: dict) -> bytes:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+    words = ["The", " error", " rate", " rose", " after", " the", " deploy", " of", " v2", "."]
+    out = [frame("message_start", {"type": "message_start", "message": {
+        "id": "msg_01", "type": "message", "role": "assistant", "model": "claude",
+        "content": [], "usage": {"input_tokens": 2048, "output_tokens": 1},
+    }})]
+    out.append(frame("content_block_start", {
+        "type": "content_block_start", "index": 0,
+        "content_block": {"type": "text", "text": ""},
+    }))
+    for i in range(tokens):
+        if i % 200 == 0:
+            out.append(frame("ping", {"type": "ping"}))
+        out.append(frame("content_block_delta", {
+            "type": "content_block_delta", "index": 0,
+            "delta": {"type": "text_delta", "text": words[i % len(words)]},
+        }))
+    out.append(frame("content_block_stop", {"type": "content_block_stop", "index": 0}))
+    out.append(frame("content_block_start", {
+        "type": "content_block_start", "index": 1,
+        "content_block": {"type": "tool_use", "id": "toolu_01", "name": "os_search", "input": {}},
+    }))
+    for part in ('{"index": "logs",', ' "query": "level:error"}'):
+        out.append(frame("content_block_delta", {
+            "type": "content_block_delta", "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": part},
+        }))
+    out.append(frame("content_block_stop", {"type": "content_block_stop", "index": 1}))
+    out.append(frame("message_delta", {
+        "type": "message_delta", "delta": {"stop_reason": "tool_use"},
+        "usage": {"output_tokens": tokens},
+    }))
+    out.append(frame("message_stop", {"type": "message_stop"}))
+    return b"".join(out)
+
+
+def chunked(body: bytes, seed: int = 7) -> list[bytes]:
+    """Split like a TLS stream does: uneven reads of up to ~1.4 KB."""
+    rng = random.Random(seed)
+    chunks, i = [], 0
+    while i < len(body):
+        n = rng.randint(40, 1400)
+        chunks.append(body[i:i + n])
+        i += n
+    return chunks
+
+
+class Replay(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _text(etype: str, data: dict) -> str | None:
+    if etype == "content_block_delta":
+        delta = data.get("delta") or {}
+        if delta.get("type") == "text_delta":
+            return delta.get("text") or None
+    return None
+
+
+async def _event_hop(event: str | None, data: dict):
+    text = _text(data.get("type") or event, data)
+    if text:
+        yield text
+
+
+async def before(chunks: list[bytes]) -> int:
+    resp = httpx.Response(200, stream=Replay(chunks))
+    n = 0
+    current_event: str | None = None
+    async for line in resp.aiter_lines():
+        if not line:
+            continue
+        if line.startswith("event: "):
+            current_event = line[len("event: "):].strip()
+            continue
+        if not line.startswith("data: "):
+            continue
+        data = line[len("data: "):]
+        if data.strip() == "[DONE]":
+            break
+        try:
+            obj = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        async for _ in _event_hop(current_event, obj):
+            n += 1
+    return n
+
+
+async def after(chunks: list[bytes]) -> int:
+    resp = httpx.Response(200, stream=Replay(chunks))
+    n = 0
+    async for event, data in sse_events(resp):
+        if _text(data.get("type") or event, data):
+            n += 1
+    return n
+
+
+def bench(fn, chunks: list[bytes], tokens: int, number: int) -> float:
+    async def go() -> float:
+        assert await fn(chunks) == tokens
+        started = time.perf_counter()
+        for _ in range(number):
+            await fn(chunks)
+        return (time.perf_counter() - started) / number / tokens * 1e6
+    return asyncio.run(go())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--number", type=int, default=20)
+    opts = parser.parse_args()
+
+    body = record_stream(opts.tokens)
+    chunks = chunked(body)
+    base = bench(before, chunks, opts.tokens, opts.number)
+    new = bench(after, chunks, opts.tokens, opts.number)
+
+    print(f"codec: {'orjson' if _wire.orjson is not None else 'stdlib json'}, "
+          f"stream {len(body) / 1024:.0f} KiB in {len(chunks)} chunks, {opts.tokens} tokens")
+    print(f"{'':<20} {'aiter_lines':>13} {'sse_events':>13} {'speedup':>8}")
+    print(f"{'per token':<20} {base:>10.2f} us {new:>10.2f} us {base / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
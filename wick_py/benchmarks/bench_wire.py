@@ -0,0 +1,104 @@
+"""Micro-benchmark: sidecar wire codecs, pydantic path vs wick._wire.
+
+Usage:
+    python benchmarks/bench_wire.py [--messages 200] [--number 200]
+
+(with wick installed, e.g. pip install -e ".[fast]")
+
+Compares what the sidecar did before the fast path (json.loads followed by
+pydantic construction / model_dump_json) with the _wire functions it uses
+now, on an LLM request carrying a long conversation history.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from wick import _wire
+from wick._types import (
+    LLMRequest,
+    StreamChunk,
+    ToolCallbackRequest,
+    ToolCallbackResponse,
+    ToolCallResult,
+)
+
+
+def build_history(n: int) -> bytes:
+    messages = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            messages.append({"role": "user", "content": "Summarise the failures for index " * 8})
+        elif kind == 1:
+            messages.append({
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{
+                    "id": f"call_{i}",
+                    "name": "os_search",
+                    "arguments": {"index": "logs", "query": "level:error", "size": 20},
+                }],
+            })
+        else:
+            messages.append({
+                "role": "tool",
+                "content": '{"hits": 20, "took": 4}' * 40,
+                "tool_call_id": f"call_{i - 1}",
+                "name": "os_search",
+            })
+    tools = [
+        {"name": f"tool_{i}", "description": "d" * 80, "parameters": {"type": "object"}}
+        for i in range(12)
+    ]
+    return json.dumps({
+        "model": "bench",
+        "messages": messages,
+        "tools": tools,
+        "system_prompt": "You are an analyst. " * 100,
+    }).encode()
+
+
+def bench(label: str, baseline, fast, number: int) -> None:
+    base = timeit.timeit(baseline, number=number) / number * 1e6
+    new = timeit.timeit(fast, number=number) / number * 1e6
+    print(f"{label:<28} {base:>10.1f} us {new:>10.1f} us {base / new:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--number", type=int, default=200)
+    opts = parser.parse_args()
+
+    body = build_history(opts.messages)
+    delta = StreamChunk(delta="The error rate rose after ")
+    call = StreamChunk(tool_call=ToolCallResult(id="c1", name="os_search", args={"q": "x"}))
+    tool_body = b'{"name": "os_count", "args": {"index": "logs", "query": "level:error"}}'
+    result = "x" * 2000
+    many = opts.number * 100
+
+    print(f"codec: {'orjson' if _wire.orjson is not None else 'stdlib json'}, "
+          f"request body {len(body) / 1024:.0f} KiB ({opts.messages} messages)")
+    print(f"{'':<28} {'pydantic':>13} {'_wire':>13} {'speedup':>8}")
+    bench("decode LLMRequest",
+          lambda: LLMRequest(**json.loads(body)),
+          lambda: _wire.decode_llm_request(body), opts.number)
+    bench("encode StreamChunk (delta)",
+          lambda: delta.model_dump_json(by_alias=True),
+          lambda: _wire.encode_stream_chunk(delta), many)
+    bench("encode StreamChunk (tool)",
+          lambda: call.model_dump_json(by_alias=True),
+          lambda: _wire.encode_stream_chunk(call), many)
+    bench("decode ToolCallbackRequest",
+          lambda: ToolCallbackRequest.model_validate_json(tool_body),
+          lambda: _wire.decode_tool_request(tool_body), many)
+    bench("encode ToolCallbackResponse",
+          lambda: ToolCallbackResponse(result=result).model_dump_json(),
+          lambda: _wire.encode_tool_response(result), many)
+
+
+if __name__ == "__main__":
+    main()
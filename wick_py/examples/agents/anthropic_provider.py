@@ -23,11 +23,22 @@ from __future__ import annotations
 import json
 import logging
 import os
-from typing import Any, Iterator
+from contextlib import aclosing
+from typing import Any
 
 import httpx
 
-from wick import Agent, LLMMessage, LLMRequest, StreamChunk, ToolCallResult
+from wick import (
+    Agent,
+    HedgePolicy,
+    LLMMessage,
+    LLMRequest,
+    StreamChunk,
+    ToolCallResult,
+    hedged_stream,
+    sse_events,
+    upstream_client,
+)
 
 logger = logging.getLogger("wick.anthropic")
 
@@ -36,6 +47,9 @@ ANTHROPIC_VERSION = "2023-06-01"
 DEFAULT_MODEL = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-6")
 DEFAULT_MAX_TOKENS = 4096
 
+# Slow-first-byte hedging and 429/5xx retries for every model on the API.
+_hedge = HedgePolicy()
+
 
 # ── Public API ────────────────────────────────────────────────────────────
 
@@ -69,8 +83,14 @@ def register_anthropic_provider(
 
     @agent.llm_provider(model)
     async def _anthropic_llm(request: LLMRequest):
-        async for chunk in _stream(request, resolved_key, model, max_tokens):
-            yield chunk
+        # aclosing: a Go disconnect closes this generator; close the upstream
+        # stream with it.
+        chunks = hedged_stream(
+            lambda: _stream(request, resolved_key, model, max_tokens), _hedge,
+        )
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
 
 
 # ── Streaming ─────────────────────────────────────────────────────────────
@@ -119,47 +139,40 @@ async def _stream(
     # events. Accumulate them keyed by content-block index, then flush at stop.
     pending_tools: dict[int, dict[str, Any]] = {}
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        async with client.stream(
-            "POST",
-            f"{ANTHROPIC_BASE_URL}/v1/messages",
-            headers=headers,
-            json=payload,
-        ) as resp:
-            if resp.status_code != 200:
-                body = (await resp.aread()).decode("utf-8", errors="replace")
-                raise RuntimeError(f"Anthropic {resp.status_code}: {body[:500]}")
-
-            current_event: str | None = None
-            async for line in resp.aiter_lines():
-                if not line:
-                    continue
-                if line.startswith("event: "):
-                    current_event = line[len("event: "):].strip()
-                    continue
-                if not line.startswith("data: "):
-                    continue
-                data = line[len("data: "):]
-                if data.strip() == "[DONE]":
-                    break
-                try:
-                    payload_obj = json.loads(data)
-                except json.JSONDecodeError:
-                    logger.warning("Skipping malformed SSE chunk: %s", data[:120])
-                    continue
-
-                async for chunk in _handle_event(current_event, payload_obj, pending_tools):
-                    yield chunk
+    client = upstream_client(ANTHROPIC_BASE_URL)
+    async with client.stream(
+        "POST",
+        f"{ANTHROPIC_BASE_URL}/v1/messages",
+        headers=headers,
+        json=payload,
+        timeout=timeout,
+    ) as resp:
+        if resp.status_code != 200:
+            body = (await resp.aread()).decode("utf-8", errors="replace")
+            # HTTPStatusError so hedged_stream retries 429/5xx (overloaded).
+            raise httpx.HTTPStatusError(
+                f"Anthropic {resp.status_code}: {body[:500]}",
+                request=resp.request,
+                response=resp,
+            )
+
+        async for event, data in sse_events(resp):
+            chunk = _handle_event(event, data, pending_tools)
+            if chunk is not None:
+                yield chunk
 
     yield StreamChunk(done=True)
 
 
-async def _handle_event(
-    event: str | None,
+def _handle_event(
+    event: str,
     data: dict[str, Any],
     pending_tools: dict[int, dict[str, Any]],
-) -> Iterator[StreamChunk]:
-    """Translate a single Anthropic SSE event into 0+ wick StreamChunks."""
+) -> StreamChunk | None:
+    """Translate a single Anthropic SSE event into at most one wick StreamChunk.
+
+    A plain function, not an async generator: it runs once per token.
+    """
     etype = data.get("type") or event
 
     if etype == "content_block_start":
@@ -171,7 +184,7 @@ async def _handle_event(
                 "name": block.get("name") or "",
                 "input_buf": "",
             }
-        return
+        return None
 
     if etype == "content_block_delta":
         idx = data.get("index", 0)
@@ -180,12 +193,12 @@ async def _handle_event(
         if dtype == "text_delta":
             text = delta.get("text") or ""
             if text:
-                yield StreamChunk(delta=text)
+                return StreamChunk(delta=text)
         elif dtype == "input_json_delta":
             partial = delta.get("partial_json") or ""
             if idx in pending_tools and partial:
                 pending_tools[idx]["input_buf"] += partial
-        return
+        return None
 
     if etype == "content_block_stop":
         idx = data.get("index", 0)
@@ -199,20 +212,22 @@ async def _handle_event(
                     entry["name"], entry["input_buf"][:200],
                 )
                 args = {}
-            yield StreamChunk(tool_call=ToolCallResult(
+            return StreamChunk(tool_call=ToolCallResult(
                 id=entry["id"],
                 name=entry["name"],
                 args=args,
             ))
-        return
+        return None
 
     if etype in ("message_start", "message_delta", "message_stop", "ping"):
-        return
+        return None
 
     if etype == "error":
         err = data.get("error") or {}
         raise RuntimeError(f"Anthropic stream error: {err.get('type')}: {err.get('message')}")
 
+    return None
+
 
 # ── Request building ──────────────────────────────────────────────────────
 
@@ -1,7 +1,9 @@
 """Gateway LLM provider for Claude.
 
 Wires an Anthropic-compatible LLM served via a custom gateway (OpenAI chat
-completions format) onto a wick Agent. Owns the auth token refresh loop.
+completions format) onto a wick Agent. Owns the gateway's bearer token:
+refreshed ahead of its expires_in, one refresh shared by concurrent streams,
+and a request answered with 401 is retried once with a fresh token.
 
 Call `register_gateway_provider(agent)` once during startup.
 """
@@ -11,11 +13,21 @@ from __future__ import annotations
 import json
 import logging
 import os
-import threading
+from contextlib import aclosing
 
 import httpx
 
-from wick import Agent, LLMRequest, StreamChunk, ToolCallResult
+from wick import (
+    Agent,
+    HedgePolicy,
+    LLMRequest,
+    StreamChunk,
+    TokenManager,
+    ToolCallResult,
+    hedged_stream,
+    sse_events,
+    upstream_client,
+)
 
 from gateway_auth import fetch_token
 
@@ -23,56 +35,27 @@ logger = logging.getLogger("wick.gateway")
 
 GATEWAY_URL = os.environ.get("GATEWAY_URL", "https://xyz-abc")
 GATEWAY_MODEL = os.environ.get("GATEWAY_MODEL", "anthropic.claude-4-5-sonnet-v1:0")
-TOKEN_REFRESH_INTERVAL = 20 * 60  # seconds
 
-_gateway_token = ""
-_token_lock = threading.Lock()
-_refresh_started = False
-
-
-def _refresh_token() -> None:
-    global _gateway_token
-    try:
-        new_token = fetch_token()
-        with _token_lock:
-            _gateway_token = new_token
-        logger.info("Gateway token refreshed")
-    except Exception as e:
-        logger.error("Token refresh failed: %s", e)
-
-
-def _token_refresh_loop() -> None:
-    while True:
-        _refresh_token()
-        threading.Event().wait(TOKEN_REFRESH_INTERVAL)
-
-
-def _get_token() -> str:
-    with _token_lock:
-        return _gateway_token
-
-
-def _ensure_refresh_thread_started() -> None:
-    global _refresh_started
-    if _refresh_started:
-        return
-    _refresh_token()
-    threading.Thread(target=_token_refresh_loop, daemon=True).start()
-    _refresh_started = True
+_tokens = TokenManager(fetch_token)
+# Hedge a turn whose first chunk is slower than the recent p95; retry
+# connect errors and 429/5xx. Shared by every agent on the gateway.
+_hedge = HedgePolicy()
 
 
 def register_gateway_provider(agent: Agent, model_id: str = "claude-sonnet") -> None:
     """Register the gateway LLM provider on the given agent.
 
-    Starts the background token-refresh thread the first time it's called.
-    Subsequent calls reuse the running refresher.
+    The first stream fetches the token; all agents share it.
     """
-    _ensure_refresh_thread_started()
 
     @agent.llm_provider(model_id)
     async def _gateway_llm(request: LLMRequest):
-        async for chunk in _stream_gateway(request):
-            yield chunk
+        # aclosing: when the sidecar closes this generator (Go disconnected),
+        # close the inner one too so the upstream stream is dropped now.
+        chunks = hedged_stream(lambda: _stream_gateway(request), _hedge)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
 
 
 async def _stream_gateway(request: LLMRequest):
@@ -89,63 +72,45 @@ async def _stream_gateway(request: LLMRequest):
     if tools:
         payload["tools"] = tools
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {_get_token()}",
-    }
-
     timeout = httpx.Timeout(connect=10.0, read=60.0, write=10.0, pool=5.0)
     pending_tool_calls: dict[int, dict] = {}
-
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        async with client.stream(
-            "POST",
-            f"{GATEWAY_URL}/chat/completions",
-            headers=headers,
-            json=payload,
-        ) as resp:
-            resp.raise_for_status()
-
-            async for line in resp.aiter_lines():
-                if not line.startswith("data: "):
-                    continue
-                data = line[6:]
-                if data.strip() == "[DONE]":
-                    break
-
-                try:
-                    chunk = json.loads(data)
-                except json.JSONDecodeError:
-                    logger.warning("Skipping malformed SSE chunk: %s", data[:120])
-                    continue
-
-                choices = chunk.get("choices") or []
-                if not choices:
-                    continue
-                delta = choices[0].get("delta") or {}
-
-                text = delta.get("content")
-                if text:
-                    yield StreamChunk(delta=text)
-
-                for tc in delta.get("tool_calls") or []:
-                    _accumulate_tool_call(pending_tool_calls, tc)
-
-    for idx in sorted(pending_tool_calls):
-        entry = pending_tool_calls[idx]
-        try:
-            args = json.loads(entry["arguments"]) if entry["arguments"] else {}
-        except json.JSONDecodeError:
-            logger.error(
-                "Malformed tool call args for %s: %s",
-                entry["name"], entry["arguments"][:200],
-            )
-            args = {}
-        yield StreamChunk(tool_call=ToolCallResult(
-            id=entry["id"] or f"call_{idx}",
-            name=entry["name"],
-            args=args,
-        ))
+    emitted: set[int] = set()
+
+    client = upstream_client(GATEWAY_URL)
+    async with _tokens.stream(
+        client,
+        "POST",
+        f"{GATEWAY_URL}/chat/completions",
+        json=payload,
+        timeout=timeout,
+    ) as resp:
+        resp.raise_for_status()
+
+        async for _, chunk in sse_events(resp):
+            choices = chunk.get("choices") or []
+            if not choices:
+                continue
+            delta = choices[0].get("delta") or {}
+
+            text = delta.get("content")
+            if text:
+                yield StreamChunk(delta=text)
+
+            # Yield each tool call as soon as its arguments are complete —
+            # when a higher index starts, or at finish_reason — like the
+            # Anthropic provider does on content_block_stop.
+            for tc in delta.get("tool_calls") or []:
+                idx = _accumulate_tool_call(pending_tool_calls, emitted, tc)
+                for call in _complete_tool_calls(pending_tool_calls, emitted, below=idx):
+                    yield StreamChunk(tool_call=call)
+
+            if choices[0].get("finish_reason"):
+                for call in _complete_tool_calls(pending_tool_calls, emitted):
+                    yield StreamChunk(tool_call=call)
+
+    # Stream ended without a finish_reason: flush what is left.
+    for call in _complete_tool_calls(pending_tool_calls, emitted):
+        yield StreamChunk(tool_call=call)
 
     yield StreamChunk(done=True)
 
@@ -204,9 +169,12 @@ def _build_tools(request: LLMRequest) -> list[dict]:
     ]
 
 
-def _accumulate_tool_call(pending: dict[int, dict], tc: dict) -> None:
-    """Merge a tool-call SSE fragment into the pending accumulator."""
+def _accumulate_tool_call(pending: dict[int, dict], emitted: set[int], tc: dict) -> int:
+    """Merge a tool-call SSE fragment into the pending accumulator; returns its index."""
     idx = tc.get("index", 0)
+    if idx in emitted:
+        logger.warning("Ignoring fragment for tool call %d, already emitted", idx)
+        return idx
     entry = pending.setdefault(idx, {"id": "", "name": "", "arguments": ""})
     if tc.get("id"):
         entry["id"] = tc["id"]
@@ -215,3 +183,29 @@ def _accumulate_tool_call(pending: dict[int, dict], tc: dict) -> None:
         entry["name"] = func["name"]
     if func.get("arguments"):
         entry["arguments"] += func["arguments"]
+    return idx
+
+
+def _complete_tool_calls(
+    pending: dict[int, dict], emitted: set[int], below: int | None = None,
+) -> list[ToolCallResult]:
+    """Pop the pending calls with index < below (all if None), in index order."""
+    done = sorted(idx for idx in pending if below is None or idx < below)
+    calls = []
+    for idx in done:
+        entry = pending.pop(idx)
+        emitted.add(idx)
+        try:
+            args = json.loads(entry["arguments"]) if entry["arguments"] else {}
+        except json.JSONDecodeError:
+            logger.error(
+                "Malformed tool call args for %s: %s",
+                entry["name"], entry["arguments"][:200],
+            )
+            args = {}
+        calls.append(ToolCallResult(
+            id=entry["id"] or f"call_{idx}",
+            name=entry["name"],
+            args=args,
+        ))
+    return calls
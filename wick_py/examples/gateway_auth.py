@@ -1,19 +1,21 @@
 """Gateway token provider.
 
 Replace the body of `fetch_token()` with your actual token endpoint logic.
+It should return the token endpoint's JSON response: the gateway provider
+reads "access_token" and "expires_in" from it to refresh ahead of expiry.
 """
 
-import httpx
+from wick import upstream_client
 
 TOKEN_URL = "https://my-gateway.com/oauth/token"
 
 
-def fetch_token() -> str:
-    """Call the token endpoint and return an access token."""
-    resp = httpx.post(TOKEN_URL, data={
+async def fetch_token() -> dict:
+    """Call the token endpoint and return its response (access_token, expires_in)."""
+    resp = await upstream_client(TOKEN_URL).post(TOKEN_URL, data={
         "grant_type": "client_credentials",
         # "client_id": "...",
         # "client_secret": "...",
     })
     resp.raise_for_status()
-    return resp.json()["access_token"]
+    return resp.json()
@@ -0,0 +1,37 @@
+"""Module-level agents for the sidecar app-factory tests.
+
+sidecar_app() imports agents by "module:attribute" path, the way each
+uvicorn worker does.
+"""
+
+from __future__ import annotations
+
+import os
+
+from wick import Agent, StreamChunk
+
+echo_agent = Agent("factory-echo")
+
+
+@echo_agent.tool(description="Echo")
+def echo(text: str) -> str:
+    return text
+
+
+@echo_agent.tool(description="PID of the serving worker")
+def worker_pid() -> str:
+    return str(os.getpid())
+
+
+pid_agent = Agent("factory-pid")
+
+
+@pid_agent.llm_provider("factory-model", max_concurrency=2)
+async def model(request):
+    yield StreamChunk(delta="hi")
+    yield StreamChunk(done=True)
+
+
+both = [echo_agent, pid_agent]
+
+not_an_agent = "nope"
@@ -0,0 +1,25 @@
+"""Module-level tools for the executor="process" tests.
+
+Spawned workers import tools by reference, so they can't live in the test
+module's local scope.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def square(n: int) -> str:
+    return str(n * n)
+
+
+def worker_pid() -> str:
+    return str(os.getpid())
+
+
+def crash() -> str:
+    os._exit(1)
+
+
+def fail() -> str:
+    raise TypeError("bad input")
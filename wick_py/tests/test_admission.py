@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from wick._admission import AdmissionController, Overloaded, ProviderOptions
+from wick._sidecar import build_app
+from wick._types import StreamChunk
+
+
+def test_queue_then_reject_when_full():
+    ctl = AdmissionController({"m": ProviderOptions(max_concurrency=1, max_queue=1, queue_timeout=5)})
+
+    async def go():
+        first = await ctl.acquire("m")
+        waiting = asyncio.ensure_future(ctl.acquire("m"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded) as exc:
+            await ctl.acquire("m")  # one running, one queued: full
+        stats = ctl.stats()["m"]
+        first.release()
+        second = await waiting
+        second.release()
+        second.release()  # idempotent
+        return exc.value, stats, ctl.stats()["m"]
+
+    err, busy, idle = asyncio.run(go())
+    assert err.retry_after >= 1
+    assert busy == {"max_concurrency": 1, "in_flight": 1, "queued": 1, "rejected": 1}
+    assert idle["in_flight"] == 0 and idle["queued"] == 0
+
+
+def test_queue_timeout_rejects_and_frees_queue_slot():
+    ctl = AdmissionController({"m": ProviderOptions(max_concurrency=1, queue_timeout=0.05)})
+
+    async def go():
+        held = await ctl.acquire("m")
+        with pytest.raises(Overloaded, match="no slot within"):
+            await ctl.acquire("m")
+        queued = ctl.stats()["m"]["queued"]
+        held.release()
+        (await ctl.acquire("m")).release()
+        return queued
+
+    assert asyncio.run(go()) == 0
+
+
+def test_ungated_provider_is_unlimited():
+    ctl = AdmissionController({"m": ProviderOptions()})
+
+    async def go():
+        return [await ctl.acquire("m") for _ in range(100)]
+
+    assert len(asyncio.run(go())) == 100
+    assert ctl.stats() == {}
+
+
+def test_option_validation():
+    with pytest.raises(ValueError):
+        ProviderOptions(max_concurrency=0)
+    with pytest.raises(ValueError):
+        ProviderOptions(max_concurrency=1, max_queue=-1)
+    with pytest.raises(ValueError):
+        ProviderOptions(max_concurrency=1, queue_timeout=0)
+
+
+def test_stream_endpoint_returns_429_with_retry_after():
+    release = asyncio.Event()
+
+    async def model(req):
+        await release.wait()
+        yield StreamChunk(delta="ok")
+
+    app = build_app(
+        {}, {"m": model},
+        llm_options={"m": ProviderOptions(max_concurrency=1, max_queue=0)},
+    )
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sidecar") as c:
+            body = {"model": "m", "messages": []}
+            first = asyncio.ensure_future(c.post("/llm/m/stream", json=body))
+            await asyncio.sleep(0.05)
+            rejected = await c.post("/llm/m/stream", json=body)
+            release.set()
+            ok = await first
+            again = await c.post("/llm/m/stream", json=body)
+        return rejected, ok, again
+
+    rejected, ok, again = asyncio.run(go())
+    assert rejected.status_code == 429
+    assert int(rejected.headers["retry-after"]) >= 1
+    assert "overloaded" in rejected.json()["error"]
+    assert ok.status_code == 200 and '"delta":"ok"' in ok.text
+    assert again.status_code == 200  # slot released after the first stream
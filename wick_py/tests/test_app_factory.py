@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import factory_agents
+from wick import Agent
+from wick._agent import SIDECAR_APP_ENV, SIDECAR_OPTIONS_ENV, load_agents, sidecar_app
+
+
+def test_load_agents_single_and_list():
+    assert load_agents("factory_agents:echo_agent") == [factory_agents.echo_agent]
+    assert load_agents("factory_agents:both") == factory_agents.both
+
+
+@pytest.mark.parametrize("path", [
+    "factory_agents",
+    "factory_agents:",
+    ":echo_agent",
+    "factory_agents:missing",
+    "factory_agents:not_an_agent",
+])
+def test_load_agents_rejects_bad_paths(path):
+    with pytest.raises(ValueError):
+        load_agents(path)
+
+
+def test_sidecar_app_rebuilds_registry_from_env(monkeypatch):
+    monkeypatch.setenv(SIDECAR_APP_ENV, "factory_agents:both")
+    monkeypatch.setenv(SIDECAR_OPTIONS_ENV, json.dumps({"stream_coalesce_ms": 5}))
+    with TestClient(sidecar_app()) as client:
+        resp = client.post("/tools/echo", json={"name": "echo", "args": {"text": "from worker"}})
+        assert resp.json() == {"result": "from worker"}
+        assert client.post("/llm/factory-model/stream", json={"messages": []}).status_code == 200
+        # Provider options survive the rebuild: the gate shows up in /metrics.
+        assert 'wick_llm_in_flight{provider="factory-model"}' in client.get("/metrics").text
+
+
+def test_sidecar_app_requires_env(monkeypatch):
+    monkeypatch.delenv(SIDECAR_APP_ENV, raising=False)
+    with pytest.raises(RuntimeError, match=SIDECAR_APP_ENV):
+        sidecar_app()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"workers": 0},
+    {"workers": 2},
+    {"workers": 2, "app_module": "no-colon"},
+])
+def test_serve_sidecar_validates_workers_before_registering(kwargs):
+    # go_url is unreachable: validation must fail before any registration.
+    with pytest.raises(ValueError):
+        Agent("a").serve_sidecar(go_url="http://127.0.0.1:1", **kwargs)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from wick import AsyncWickClient
+
+
+def _client(handler, **kwargs) -> AsyncWickClient:
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("backoff_max", 0.002)
+    return AsyncWickClient("http://go", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_retries_connect_errors_and_5xx():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"status": "registered", "name": "add"})
+
+    async def go():
+        async with _client(handler) as client:
+            return await client.register_tool("add", "Add", {"type": "object"}, "http://sc")
+
+    assert asyncio.run(go())["status"] == "registered"
+    assert attempts == ["/agents/tools/register"] * 3
+
+
+def test_gives_up_after_retries():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(500)
+
+    async def go():
+        async with _client(handler, retries=2) as client:
+            await client.health()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(go())
+    assert len(attempts) == 3
+
+
+def test_client_errors_are_not_retried():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(400, json={"error": "bad"})
+
+    async def go():
+        async with _client(handler) as client:
+            await client.register_agent("a1", {"name": "A1"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(go())
+    assert len(attempts) == 1
+
+
+def test_bulk_falls_back_to_concurrent_single_requests():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/agents/register":
+            return httpx.Response(404)
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"status": "ok"})
+
+    async def go():
+        async with _client(handler) as client:
+            return await client.register_bulk(
+                [{"agent_id": "a1"}],
+                [{"name": "add", "agent_id": "a1"}, {"name": "sub", "agent_id": "a1"}],
+            )
+
+    result = asyncio.run(go())
+    assert seen[0] == ("/agents/", {"agent_id": "a1"})
+    assert sorted(b["name"] for p, b in seen[1:]) == ["add", "sub"]
+    assert [t["status"] for t in result["tools"]] == ["registered", "registered"]
+
+
+def test_deregister_passes_agent_scope():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "DELETE"
+        assert request.url.params["agent_id"] == "a1"
+        return httpx.Response(200, json={"status": "deregistered", "name": "add"})
+
+    async def go():
+        async with _client(handler) as client:
+            return await client.deregister_tool("add", agent_id="a1")
+
+    assert asyncio.run(go())["status"] == "deregistered"
+
+
+def test_rejects_bad_retry_settings():
+    with pytest.raises(ValueError):
+        AsyncWickClient(retries=-1)
+    with pytest.raises(ValueError):
+        AsyncWickClient(backoff_base=1.0, backoff_max=0.5)
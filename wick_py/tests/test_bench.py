@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from wick import AsyncWickClient, LLMMessage, LLMRequest
+from wick._agent import _build_sidecar_app, load_agents
+from wick.bench import (
+    BENCH_MODEL,
+    BENCH_TOOL,
+    ProcessSampler,
+    bench_agent,
+    percentiles,
+    run_load,
+    summarize,
+)
+
+TURN = (
+    b'event: on_tool_start\ndata: {"event":"on_tool_start","name":"bench_lookup"}\n\n'
+    b'event: on_chat_model_stream\ndata: {"event":"on_chat_model_stream",'
+    b'"data":{"chunk":{"content":"tok0 "}}}\n\n'
+    b'event: on_chat_model_stream\ndata: {"event":"on_chat_model_stream",'
+    b'"data":{"chunk":{"content":"tok1 "}}}\n\n'
+    b'event: done\ndata: {"thread_id":"t"}\n\n'
+)
+
+
+def test_percentiles_nearest_rank():
+    stats = percentiles([i / 1000 for i in range(1, 101)])  # 1..100 ms
+    assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == pytest.approx((50, 95, 99, 100))
+    assert percentiles([]) is None
+
+
+def test_run_load_counts_turns_tokens_and_errors():
+    threads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        threads.append(request.read())
+        if len(threads) == 3:
+            return httpx.Response(200, stream=httpx.ByteStream(b'event: error\ndata: "boom"\n\n'))
+        if len(threads) == 5:
+            return httpx.Response(503)
+        return httpx.Response(200, stream=httpx.ByteStream(TURN))
+
+    async def go():
+        transport = httpx.MockTransport(handler)
+        async with AsyncWickClient("http://go", transport=transport, retries=0) as client:
+            return await run_load(client, concurrency=4, turns=3)
+
+    report = summarize(asyncio.run(go()))
+    assert report["turns"] == 10
+    assert report["errors"]["by_kind"] == {"error_event": 1, "http_503": 1}
+    assert report["errors"]["rate"] == pytest.approx(2 / 12)
+    assert report["throughput"]["tokens_per_s"] > 0
+    assert report["ttft_ms"]["p50"] <= report["turn_ms"]["p50"]
+
+
+def test_fake_provider_calls_the_tool_then_streams():
+    provider = bench_agent._llm_providers[BENCH_MODEL]
+
+    async def collect(messages):
+        return [c async for c in provider(LLMRequest(messages=messages))]
+
+    first = asyncio.run(collect([LLMMessage(role="user", content="hi")]))
+    assert first[0].tool_call.name == BENCH_TOOL and first[-1].done
+    answer = asyncio.run(collect([
+        LLMMessage(role="user", content="hi"),
+        LLMMessage(role="tool", content="{}", tool_call_id="c1", name=BENCH_TOOL),
+    ]))
+    assert len([c for c in answer if c.delta]) == 64
+
+
+def test_bench_agent_loads_through_the_sidecar_factory():
+    app = _build_sidecar_app(load_agents("wick.bench:bench_agent"))
+    with TestClient(app) as tc:
+        resp = tc.post(f"/tools/{BENCH_TOOL}", json={"name": BENCH_TOOL, "args": {"query": "q"}})
+    assert '"hits": 3' in resp.json()["result"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_process_sampler_reports_cpu_and_rss():
+    sampler = ProcessSampler(os.getpid(), interval=0.05).start()
+    time.sleep(0.3)
+    stats = sampler.stop()
+    assert stats["rss_mb_max"] > 1
+    assert stats["cpu_percent_max"] >= 0
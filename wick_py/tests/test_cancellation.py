@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from wick import Agent, CancellationToken, StreamChunk
+from wick._cancel import ToolCancelled, cancellation_param
+from wick._executors import ToolExecutor
+from wick._sidecar import build_app
+from wick._tools import ToolOptions, _infer_parameters
+
+
+@pytest.fixture
+def serve():
+    """Run a sidecar app on a real uvicorn server (over a Unix socket) so
+    client disconnects reach it the way Go's do."""
+    servers = []
+    tmp = tempfile.TemporaryDirectory(prefix="wick")
+
+    def start(app) -> httpx.Client:
+        sock = os.path.join(tmp.name, f"s{len(servers)}.sock")
+        server = uvicorn.Server(uvicorn.Config(app, uds=sock, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        servers.append(server)
+        deadline = time.monotonic() + 10
+        while not server.started:
+            assert time.monotonic() < deadline, "sidecar did not start"
+            time.sleep(0.01)
+        return httpx.Client(transport=httpx.HTTPTransport(uds=sock), base_url="http://sidecar")
+
+    yield start
+    for server in servers:
+        server.should_exit = True
+    tmp.cleanup()
+
+
+def _wait_for(event: threading.Event, timeout: float = 5.0) -> bool:
+    return event.wait(timeout)
+
+
+# ── Token injection ─────────────────────────────────────────────────────
+
+
+def test_cancellation_param_detection():
+    def plain(a: int) -> str: ...
+    def typed(a: int, cancel: CancellationToken) -> str: ...
+    def postponed(a: int, token: CancellationToken | None = None) -> str: ...
+
+    assert cancellation_param(plain) is None
+    assert cancellation_param(typed) == "cancel"
+    assert cancellation_param(postponed) == "token"
+
+
+def test_token_is_left_out_of_the_schema():
+    def crawl(url: str, cancel: CancellationToken) -> str: ...
+
+    schema = _infer_parameters(crawl)
+    assert list(schema["properties"]) == ["url"]
+    assert schema["required"] == ["url"]
+
+
+def test_process_tools_cannot_take_a_token():
+    def crawl(url: str, cancel: CancellationToken) -> str: ...
+
+    with pytest.raises(ValueError, match="CancellationToken"):
+        ToolExecutor({"crawl": crawl}, {"crawl": ToolOptions(executor="process")})
+
+
+def test_token_is_injected_and_set_when_the_call_is_cancelled():
+    seen: list[CancellationToken] = []
+    stopped = threading.Event()
+
+    def slow(cancel: CancellationToken) -> str:
+        seen.append(cancel)
+        cancel.wait(10)
+        stopped.set()
+        cancel.raise_if_cancelled()
+        return "finished"
+
+    async def main() -> None:
+        ex = ToolExecutor({"slow": slow})
+        try:
+            task = asyncio.ensure_future(ex.run("slow", {"cancel": "from the LLM"}))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert await asyncio.to_thread(_wait_for, stopped)
+        finally:
+            ex.shutdown()
+
+    asyncio.run(main())
+    assert isinstance(seen[0], CancellationToken) and seen[0].cancelled
+    with pytest.raises(ToolCancelled):
+        seen[0].raise_if_cancelled()
+
+
+# ── Disconnects ─────────────────────────────────────────────────────────
+
+
+def test_tool_call_cancelled_when_caller_disconnects(serve):
+    agent = Agent("cancel-tool")
+    cancelled = threading.Event()
+
+    @agent.tool(description="Block until cancelled")
+    def block(cancel: CancellationToken) -> str:
+        if cancel.wait(10):
+            cancelled.set()
+        return "too late"
+
+    app = build_app(agent._all_tool_fns(), {}, agent._all_tool_options())
+    client = serve(app)
+    with pytest.raises(httpx.ReadTimeout):
+        client.post("/tools/block", json={"args": {}}, timeout=0.3)
+    client.close()
+
+    assert _wait_for(cancelled)
+    assert app.state.metrics.tool_cancelled.get("block") == 1
+
+
+def test_batch_calls_cancelled_when_caller_disconnects(serve):
+    cancelled = threading.Event()
+
+    def block(cancel: CancellationToken) -> str:
+        if cancel.wait(10):
+            cancelled.set()
+        return "too late"
+
+    client = serve(build_app({"block": block}, {}))
+    with pytest.raises(httpx.ReadTimeout):
+        client.post(
+            "/tools/_batch",
+            json={"calls": [{"id": "1", "name": "block", "args": {}}], "stream": False},
+            timeout=0.3,
+        )
+    client.close()
+    assert _wait_for(cancelled)
+
+
+def test_llm_stream_provider_closed_when_caller_disconnects(serve):
+    closed = threading.Event()
+    produced = []
+
+    async def model(request):
+        try:
+            for i in range(10_000):
+                produced.append(i)
+                yield StreamChunk(delta=f"tok{i} ")
+                await asyncio.sleep(0.01)
+            yield StreamChunk(done=True)
+        finally:
+            closed.set()
+
+    app = build_app({}, {"m": model})
+    client = serve(app)
+    with client.stream("POST", "/llm/m/stream", json={"messages": []}) as resp:
+        first = next(resp.iter_lines())
+        assert first.startswith("data: ")
+    client.close()
+
+    assert _wait_for(closed)
+    n = len(produced)
+    time.sleep(0.1)
+    assert len(produced) == n < 10_000  # stopped pulling from upstream
+    assert app.state.metrics.llm_cancelled.get("m", "stream") == 1
+
+
+def test_llm_stream_closed_while_provider_is_waiting(serve):
+    # No chunk is being sent when Go leaves: the provider is blocked on
+    # upstream (and, with coalescing, the read runs in a separate task).
+    closed = threading.Event()
+
+    async def model(request):
+        try:
+            yield StreamChunk(delta="hi")
+            yield StreamChunk(delta=" there")
+            await asyncio.sleep(30)
+            yield StreamChunk(done=True)
+        finally:
+            closed.set()
+
+    client = serve(build_app({}, {"m": model}, stream_coalesce_ms=5))
+    with client.stream("POST", "/llm/m/stream", json={"messages": []}) as resp:
+        next(resp.iter_lines())
+    client.close()
+    assert _wait_for(closed)
+
+
+def test_llm_call_cancelled_when_caller_disconnects(serve):
+    cancelled = threading.Event()
+
+    async def model(request):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    app = build_app({}, {"m": model})
+    client = serve(app)
+    with pytest.raises(httpx.ReadTimeout):
+        client.post("/llm/m/call", json={"messages": []}, timeout=0.3)
+    client.close()
+
+    assert _wait_for(cancelled)
+    assert app.state.metrics.llm_cancelled.get("m", "call") == 1
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
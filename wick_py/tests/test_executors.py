@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from wick._executors import ToolExecutor
+from wick._sidecar import build_app
+from wick._tools import ToolOptions
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def test_max_concurrency_limits_in_flight_and_counts_queue():
+    gate = threading.Event()
+
+    def slow() -> str:
+        gate.wait(5)
+        return "ok"
+
+    app = build_app(
+        {"slow": slow}, {},
+        tool_options={"slow": ToolOptions(executor="dedicated", max_concurrency=2)},
+    )
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://sidecar") as c:
+            calls = [
+                asyncio.create_task(c.post("/tools/slow", json={"name": "slow", "args": {}}))
+                for _ in range(5)
+            ]
+            stats: dict = {}
+
+            async def snapshot() -> bool:
+                stats.update((await c.get("/tools/_stats")).json()["slow"])
+                return stats["in_flight"] == 2 and stats["queued"] == 3
+
+            deadline = asyncio.get_running_loop().time() + 2
+            while not await snapshot():
+                assert asyncio.get_running_loop().time() < deadline, stats
+                await asyncio.sleep(0.01)
+
+            gate.set()
+            results = await asyncio.gather(*calls)
+            final = (await c.get("/tools/_stats")).json()["slow"]
+        app.state.tool_executor.shutdown()
+        return stats, results, final
+
+    stats, results, final = asyncio.run(go())
+    assert stats == {"executor": "dedicated", "max_concurrency": 2, "in_flight": 2, "queued": 3}
+    assert all(r.json()["result"] == "ok" for r in results)
+    assert final["in_flight"] == 0 and final["queued"] == 0
+
+
+def test_cancelled_caller_keeps_permit_until_thread_finishes():
+    gate = threading.Event()
+
+    def slow() -> str:
+        gate.wait(5)
+        return "ok"
+
+    ex = ToolExecutor({"slow": slow}, {"slow": ToolOptions(executor="dedicated", max_concurrency=1)})
+
+    async def go():
+        first = asyncio.create_task(ex.run("slow", {}))
+        await _wait_for(lambda: ex.stats()["slow"]["in_flight"] == 1)
+        first.cancel()
+        await asyncio.sleep(0.05)
+        held = ex.stats()["slow"]
+
+        second = asyncio.create_task(ex.run("slow", {}))
+        await asyncio.sleep(0.05)
+        while_busy = ex.stats()["slow"]
+
+        gate.set()
+        await second
+        return held, while_busy
+
+    try:
+        held, while_busy = asyncio.run(go())
+    finally:
+        ex.shutdown()
+    assert held["in_flight"] == 1
+    assert while_busy["in_flight"] == 1 and while_busy["queued"] == 1
+
+
+def test_dedicated_pool_isolated_from_saturated_shared_pool():
+    gate = threading.Event()
+
+    def hog() -> str:
+        gate.wait(5)
+        return threading.current_thread().name
+
+    def own() -> str:
+        return threading.current_thread().name
+
+    ex = ToolExecutor(
+        {"hog": hog, "own": own},
+        {"own": ToolOptions(executor="dedicated")},
+        shared_workers=1,
+    )
+
+    async def go():
+        blocked = asyncio.create_task(ex.run("hog", {}))
+        await _wait_for(lambda: ex.stats()["hog"]["in_flight"] == 1)
+        own_thread = await asyncio.wait_for(ex.run("own", {}), 1)
+        gate.set()
+        return await blocked, own_thread
+
+    try:
+        shared_thread, own_thread = asyncio.run(go())
+    finally:
+        ex.shutdown()
+    assert shared_thread.startswith("wick-tool_")
+    assert own_thread.startswith("wick-tool-own")
+
+
+def test_inline_runs_on_event_loop_thread():
+    def where() -> str:
+        return threading.current_thread().name
+
+    ex = ToolExecutor({"where": where}, {"where": ToolOptions(executor="inline")})
+    try:
+        name = asyncio.run(ex.run("where", {}))
+    finally:
+        ex.shutdown()
+    assert name == threading.current_thread().name
+
+
+def test_async_tools_run_on_loop_and_honour_limit():
+    active = 0
+    peak = 0
+
+    async def probe() -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return "ok"
+
+    ex = ToolExecutor({"probe": probe}, {"probe": ToolOptions(max_concurrency=2)})
+
+    async def go():
+        return await asyncio.gather(*(ex.run("probe", {}) for _ in range(6)))
+
+    try:
+        assert asyncio.run(go()) == ["ok"] * 6
+    finally:
+        ex.shutdown()
+    assert peak == 2
+    assert ex.stats()["probe"]["executor"] == "async"
+
+
+def test_tool_options_validation():
+    with pytest.raises(ValueError, match="executor must be one of"):
+        ToolOptions(executor="gpu")
+    with pytest.raises(ValueError, match="max_concurrency must be >= 1"):
+        ToolOptions(max_concurrency=0)
+
+
+def test_inline_sync_tool_with_limit_rejected():
+    def tool() -> str:
+        return ""
+
+    async def atool() -> str:
+        return ""
+
+    inline_limited = ToolOptions(executor="inline", max_concurrency=2)
+    with pytest.raises(ValueError, match="inline"):
+        ToolExecutor({"tool": tool}, {"tool": inline_limited})
+    ToolExecutor({"atool": atool}, {"atool": inline_limited}).shutdown()
+
+
+def test_lifespan_shuts_down_pools():
+    def tool() -> str:
+        return "ok"
+
+    app = build_app({"tool": tool}, {})
+    with TestClient(app) as c:
+        assert c.post("/tools/tool", json={"name": "tool", "args": {}}).json()["result"] == "ok"
+
+    with pytest.raises(RuntimeError, match="shutdown"):
+        app.state.tool_executor._shared.submit(tool)
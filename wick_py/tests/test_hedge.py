@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from wick import HedgePolicy, hedged_stream
+
+
+def _policy(**kwargs) -> HedgePolicy:
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("backoff_max", 0.002)
+    return HedgePolicy(**kwargs)
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://upstream/v1")
+    return httpx.HTTPStatusError(
+        f"HTTP {status}", request=request, response=httpx.Response(status, request=request),
+    )
+
+
+def _collect(stream) -> list:
+    async def go():
+        return [item async for item in stream]
+    return asyncio.run(go())
+
+
+def test_slow_first_attempt_is_hedged_and_cancelled():
+    policy = _policy(min_delay=0.01, max_delay=0.05)
+    closed = []
+    calls = 0
+
+    def attempt():
+        nonlocal calls
+        calls += 1
+        n = calls
+
+        async def gen():
+            try:
+                await asyncio.sleep(5 if n == 1 else 0.01)
+                yield f"a{n}-1"
+                yield f"a{n}-2"
+            finally:
+                closed.append(n)
+        return gen()
+
+    async def go():
+        started = asyncio.get_running_loop().time()
+        items = [item async for item in hedged_stream(attempt, policy)]
+        return items, asyncio.get_running_loop().time() - started
+
+    items, elapsed = asyncio.run(go())
+    assert items == ["a2-1", "a2-2"]
+    assert elapsed < 1
+    assert sorted(closed) == [1, 2]
+    assert policy.hedges == 1 and policy.hedge_wins == 1
+
+
+def test_fast_stream_is_not_hedged():
+    policy = _policy(max_delay=0.5)
+    calls = []
+
+    def attempt():
+        calls.append(1)
+
+        async def gen():
+            yield 1
+            await asyncio.sleep(0.1)  # slow after the first item: committed
+            yield 2
+        return gen()
+
+    assert _collect(hedged_stream(attempt, policy)) == [1, 2]
+    assert len(calls) == 1 and policy.hedges == 0
+
+
+def test_hedge_deadline_follows_recent_latency():
+    policy = _policy(percentile=90, min_delay=0.01, max_delay=5.0, min_samples=10)
+    assert policy.hedge_delay() == 5.0
+    for ms in range(1, 101):
+        policy.observe(ms / 1000)
+    assert policy.hedge_delay() == pytest.approx(0.09)
+    assert HedgePolicy(percentile=None).hedge_delay() is None
+
+
+def test_retries_connect_errors_and_5xx_before_first_item():
+    policy = _policy(percentile=None, retries=3)
+    failures = [httpx.ConnectError("refused"), _status_error(503), _status_error(429)]
+
+    def attempt():
+        async def gen():
+            if failures:
+                raise failures.pop(0)
+            yield "ok"
+        return gen()
+
+    assert _collect(hedged_stream(attempt, policy)) == ["ok"]
+    assert policy.retried == 3
+
+
+def test_client_errors_are_not_retried():
+    policy = _policy(percentile=None)
+    calls = []
+
+    def attempt():
+        calls.append(1)
+
+        async def gen():
+            raise _status_error(400)
+            yield
+        return gen()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _collect(hedged_stream(attempt, policy))
+    assert len(calls) == 1
+
+
+def test_errors_after_the_first_item_are_raised():
+    policy = _policy(percentile=None)
+    calls = []
+
+    def attempt():
+        calls.append(1)
+
+        async def gen():
+            yield "partial"
+            raise _status_error(502)
+        return gen()
+
+    seen = []
+
+    async def go():
+        async for item in hedged_stream(attempt, policy):
+            seen.append(item)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(go())
+    assert seen == ["partial"] and len(calls) == 1
+
+
+def test_budget_limits_retries_and_hedges():
+    policy = _policy(percentile=None, retries=5, budget_ratio=0.0, budget_reserve=2)
+    calls = []
+
+    def attempt():
+        calls.append(1)
+
+        async def gen():
+            raise httpx.ConnectError("refused")
+            yield
+        return gen()
+
+    with pytest.raises(httpx.ConnectError):
+        _collect(hedged_stream(attempt, policy))
+    assert len(calls) == 3  # first try + the two retries the budget allows
+    assert policy.stats()["budget_denied"] == 1
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=0)
+    with pytest.raises(ValueError):
+        HedgePolicy(min_delay=2, max_delay=1)
+    with pytest.raises(ValueError):
+        HedgePolicy(retries=-1)
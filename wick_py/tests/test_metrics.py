@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import re
+
+from fastapi.testclient import TestClient
+
+from wick._metrics import Counter, Histogram
+from wick._sidecar import build_app
+from wick._tools import ToolOptions
+from wick._types import LLMResponse, StreamChunk
+
+
+def _sample(text: str, series: str) -> float:
+    m = re.search(rf"^{re.escape(series)} (\S+)$", text, re.M)
+    assert m, f"{series} not in metrics:\n{text}"
+    return float(m.group(1))
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("h", "help", ("tool",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.7, 5.0):
+        h.observe(v, "t")
+    text = "\n".join(h.render())
+    assert 'h_bucket{tool="t",le="0.1"} 1' in text
+    assert 'h_bucket{tool="t",le="1.0"} 3' in text
+    assert 'h_bucket{tool="t",le="+Inf"} 4' in text
+    assert 'h_count{tool="t"} 4' in text
+    assert _sample(text, 'h_sum{tool="t"}') == 6.25
+
+
+def test_label_values_are_escaped():
+    c = Counter("c", "help", ("tool",))
+    c.inc('a"b\\c')
+    assert 'c{tool="a\\"b\\\\c"} 1' in "\n".join(c.render())
+
+
+def test_metrics_endpoint_covers_tools_and_providers():
+    def ok() -> str:
+        return "fine"
+
+    def bad() -> str:
+        raise RuntimeError("nope")
+
+    async def streamer(req):
+        yield StreamChunk(delta="a")
+        await asyncio.sleep(0.01)
+        yield StreamChunk(delta="b")
+        yield StreamChunk(done=True)
+
+    async def caller(req):
+        return LLMResponse(content="hi")
+
+    app = build_app(
+        {"ok": ok, "bad": bad},
+        {"s": streamer, "c": caller},
+        tool_options={"ok": ToolOptions(cache_ttl=60)},
+    )
+    with TestClient(app) as client:
+        for _ in range(2):
+            client.post("/tools/ok", json={"name": "ok", "args": {}})
+        client.post("/tools/bad", json={"name": "bad", "args": {}})
+        body = client.post("/llm/s/stream", json={"model": "s", "messages": []}).content
+        client.post("/llm/c/call", json={"model": "c", "messages": []})
+        resp = client.get("/metrics")
+
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert _sample(text, 'wick_tool_calls_total{tool="ok"}') == 2
+    assert _sample(text, 'wick_tool_errors_total{tool="bad"}') == 1
+    assert _sample(text, 'wick_tool_duration_seconds_count{tool="ok"}') == 2
+    assert _sample(text, 'wick_tool_in_flight{tool="bad"}') == 0
+    assert _sample(text, 'wick_tool_queued{tool="ok"}') == 0
+    assert _sample(text, 'wick_tool_cache_hits_total{tool="ok"}') == 1
+    assert _sample(text, 'wick_llm_requests_total{provider="s",mode="stream"}') == 1
+    assert _sample(text, 'wick_llm_ttft_seconds_count{provider="s"}') == 1
+    assert _sample(text, 'wick_llm_inter_chunk_seconds_count{provider="s"}') == 2
+    assert _sample(text, 'wick_llm_stream_duration_seconds_count{provider="s"}') == 1
+    assert _sample(text, 'wick_llm_stream_bytes_total{provider="s"}') == len(body)
+    assert _sample(text, 'wick_llm_call_duration_seconds_count{provider="c"}') == 1
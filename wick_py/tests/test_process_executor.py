@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+import process_tools
+from wick._executors import ProcessPool, ToolExecutor
+from wick._tools import ToolOptions
+
+PROCESS = ToolOptions(executor="process")
+
+
+def _run(executor: ToolExecutor, coro_fn):
+    async def main():
+        await executor.start()
+        try:
+            return await coro_fn()
+        finally:
+            executor.shutdown()
+    return asyncio.run(main())
+
+
+def _executor(**tools) -> ToolExecutor:
+    return ToolExecutor(
+        tools,
+        {name: PROCESS for name in tools},
+        process_pool=ProcessPool(workers=1, max_calls=0),
+    )
+
+
+def test_runs_in_worker_process():
+    ex = _executor(square=process_tools.square, worker_pid=process_tools.worker_pid)
+
+    async def go():
+        return await ex.run("square", {"n": 7}), await ex.run("worker_pid", {})
+
+    square, pid = _run(ex, go)
+    assert square == "49"
+    assert pid != str(__import__("os").getpid())
+
+
+def test_workers_recycled_after_max_calls():
+    ex = ToolExecutor(
+        {"worker_pid": process_tools.worker_pid},
+        {"worker_pid": PROCESS},
+        process_pool=ProcessPool(workers=1, max_calls=2),
+    )
+
+    async def go():
+        return [await ex.run("worker_pid", {}) for _ in range(3)]
+
+    pids = _run(ex, go)
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_crashed_worker_rebuilds_pool():
+    ex = _executor(crash=process_tools.crash, square=process_tools.square)
+
+    async def go():
+        with pytest.raises(RuntimeError, match="worker process died"):
+            await ex.run("crash", {})
+        return await ex.run("square", {"n": 3})
+
+    assert _run(ex, go) == "9"
+
+
+def test_unpicklable_args_raise_type_error():
+    ex = _executor(square=process_tools.square)
+
+    async def go():
+        with pytest.raises(TypeError, match="not picklable"):
+            await ex.run("square", {"n": threading.Lock()})
+
+    _run(ex, go)
+
+
+def test_tool_errors_pass_through():
+    ex = _executor(fail=process_tools.fail)
+
+    async def go():
+        with pytest.raises(TypeError, match="bad input"):
+            await ex.run("fail", {})
+
+    _run(ex, go)
+
+
+def test_async_tool_rejected_at_startup():
+    async def fetch() -> str:
+        return ""
+
+    with pytest.raises(ValueError, match="requires a sync function"):
+        ToolExecutor({"fetch": fetch}, {"fetch": PROCESS})
+
+
+def test_closure_rejected_at_startup():
+    def local() -> str:
+        return ""
+
+    with pytest.raises(ValueError, match="module-level function"):
+        ToolExecutor({"local": local}, {"local": PROCESS})
+
+
+def test_main_module_tool_rejected_at_startup():
+    def script_tool() -> str:
+        return ""
+    script_tool.__module__ = "__main__"
+
+    with pytest.raises(ValueError, match="__main__"):
+        ToolExecutor({"script_tool": script_tool}, {"script_tool": PROCESS})
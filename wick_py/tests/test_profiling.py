@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wick._profiling import HeapTracker, sample_stacks
+from wick._sidecar import build_app
+
+AUTH = {"Authorization": "Bearer s3cret"}
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sample_stacks_sees_busy_thread():
+    stop = threading.Event()
+    t = threading.Thread(target=_spin, args=(stop,), name="busy-tool")
+    t.start()
+    try:
+        out = sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        t.join()
+    busy = [line for line in out.splitlines() if line.startswith("busy-tool;")]
+    assert busy and any("_spin (" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in out.splitlines())
+
+
+def test_heap_diff_reports_growth():
+    tracker = HeapTracker()
+    assert "started" in tracker.diff()
+    try:
+        hoard = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+        out = tracker.diff(limit=5)
+    finally:
+        tracker.stop()
+    assert "test_profiling.py" in out
+    assert not tracemalloc.is_tracing()
+
+
+def test_debug_routes_absent_without_token(monkeypatch):
+    monkeypatch.delenv("WICK_DEBUG_TOKEN", raising=False)
+    with TestClient(build_app({}, {})) as c:
+        assert c.get("/debug/heap").status_code == 404
+
+
+def test_debug_routes_require_token():
+    with TestClient(build_app({}, {}, debug_token="s3cret")) as c:
+        assert c.get("/debug/heap").status_code == 403
+        assert c.get("/debug/heap", headers={"Authorization": "Bearer wrong"}).status_code == 403
+        assert c.get("/debug/profile?seconds=0", headers=AUTH).status_code == 400
+        profile = c.get("/debug/profile?seconds=0.1", headers=AUTH)
+        heap = c.get("/debug/heap", headers=AUTH)
+        stopped = c.get("/debug/heap?stop=true", headers=AUTH)
+
+    assert profile.status_code == 200 and profile.text
+    assert "started" in heap.text
+    assert "stopped" in stopped.text
+
+
+@pytest.fixture(autouse=True)
+def _no_leaked_tracing():
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
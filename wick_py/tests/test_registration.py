@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import httpx
+
+from wick import Agent
+from wick._agent import _register_all
+from wick._client import WickClient
+
+
+def _client(handler) -> WickClient:
+    client = WickClient("http://go")
+    client._http = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _agents() -> list[Agent]:
+    a = Agent("a1", system_prompt="one")
+    b = Agent("a2", system_prompt="two")
+
+    @a.tool(description="Add")
+    def add(x: float, y: float) -> str:
+        return str(x + y)
+
+    @b.tool(description="Echo")
+    def echo(text: str) -> str:
+        return text
+
+    return [a, b]
+
+
+def test_agents_and_tools_sent_in_one_request():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={
+            "agents": [{"agent_id": a["agent_id"], "status": "unchanged"} for a in body["agents"]],
+            "tools": [
+                {"name": t["name"], "agent_id": t["agent_id"], "status": "unchanged"}
+                for t in body["tools"]
+            ],
+        })
+
+    a, b = _agents()
+    _register_all(_client(handler), [(a, "http://sidecar:9100"), (b, "http://sidecar:9100")])
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/agents/register"
+    body = json.loads(requests[0].content)
+    assert [x["agent_id"] for x in body["agents"]] == ["a1", "a2"]
+    assert [(t["agent_id"], t["name"]) for t in body["tools"]] == [("a1", "add"), ("a2", "echo")]
+    assert body["tools"][0]["callback_url"] == "http://sidecar:9100"
+    assert body["tools"][0]["parameters"]["required"] == ["x", "y"]
+
+
+def test_no_tools_without_sidecar_url():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"agents": [], "tools": []})
+
+    a, _ = _agents()
+    _register_all(_client(handler), [(a, None)])
+    assert seen[0]["tools"] == []
+    assert seen[0]["agents"][0]["agent_id"] == "a1"
+
+
+def test_falls_back_to_concurrent_single_requests():
+    lock = threading.Lock()
+    agents_done = threading.Event()
+    calls: list[tuple[str, str]] = []
+    pending_agents = {"a1", "a2"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/agents/register":
+            return httpx.Response(405)
+        body = json.loads(request.content)
+        with lock:
+            if path == "/agents/":
+                calls.append(("agent", body["agent_id"]))
+                pending_agents.discard(body["agent_id"])
+                if not pending_agents:
+                    agents_done.set()
+            else:
+                # Every agent exists before any of its tools is registered.
+                assert agents_done.is_set()
+                calls.append(("tool", body["name"]))
+        return httpx.Response(201 if path == "/agents/" else 200, json={"status": "ok"})
+
+    client = _client(handler)
+    a, b = _agents()
+    result = client.register_bulk(
+        [a._registration("http://sc")[0], b._registration("http://sc")[0]],
+        a._registration("http://sc")[1] + b._registration("http://sc")[1],
+    )
+
+    assert sorted(calls) == [("agent", "a1"), ("agent", "a2"), ("tool", "add"), ("tool", "echo")]
+    assert [x["status"] for x in result["agents"]] == ["created", "created"]
+    assert [(t["agent_id"], t["name"], t["status"]) for t in result["tools"]] == [
+        ("a1", "add", "registered"),
+        ("a2", "echo", "registered"),
+    ]
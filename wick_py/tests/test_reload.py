@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import textwrap
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from wick import Agent
+from wick import _tools
+from wick._agent import _build_sidecar_app
+from wick._client import WickClient
+from wick._reload import ToolReloader
+
+
+class _Go:
+    """Records the registration calls the reloader makes."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, dict]] = []
+        self.client = WickClient("http://go")
+        self.client._http = httpx.Client(transport=httpx.MockTransport(self._handle))
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else dict(request.url.params)
+        self.calls.append((request.method, request.url.path, body))
+        return httpx.Response(200, json={"status": "ok"})
+
+
+@pytest.fixture
+def tool_module(tmp_path, monkeypatch):
+    """Write, import and rewrite a throwaway module of global @tool functions."""
+    name = f"reload_tools_{os.getpid()}_{id(tmp_path)}"
+    path = tmp_path / f"{name}.py"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    version = [0]
+
+    def write(body: str):
+        path.write_text("from wick import tool\n\n" + textwrap.dedent(body))
+        # Step the mtime explicitly: same-second rewrites of a same-size file
+        # would otherwise look unchanged, to us and to the bytecode cache.
+        version[0] += 1
+        stamp = 1_700_000_000 + version[0] * 10
+        os.utime(path, (stamp, stamp))
+        if name not in sys.modules:
+            return importlib.import_module(name)
+        return sys.modules[name]
+
+    saved = dict(_tools._REGISTRY)
+    yield write
+    sys.modules.pop(name, None)
+    _tools._REGISTRY.clear()
+    _tools._REGISTRY.update(saved)
+
+
+V1 = """
+    @tool(description="Combine two numbers")
+    def rl_combine(a: float, b: float) -> str:
+        return str(a + b)
+
+    @tool(description="Going away")
+    def rl_gone() -> str:
+        return "gone"
+"""
+
+
+def _call(tc: TestClient, name: str, args: dict) -> dict:
+    return tc.post(f"/tools/{name}", json={"name": name, "args": args}).json()
+
+
+def test_only_changed_tools_are_swapped_and_registered(tool_module):
+    tool_module(V1)
+    agent = Agent("rl", builtin_tools=["rl_combine", "rl_gone", "rl_new"])
+    app = _build_sidecar_app([agent])
+    go = _Go()
+
+    with TestClient(app) as tc:
+        reloader = ToolReloader([agent], app.state.tool_executor, go.client, "http://sc")
+        assert _call(tc, "rl_combine", {"a": 2, "b": 3})["result"] == "5"
+
+        # New body for rl_combine (same schema), rl_gone deleted, rl_new added.
+        mod = tool_module("""
+            @tool(description="Combine two numbers")
+            def rl_combine(a: float, b: float) -> str:
+                return str(a * b)
+
+            @tool(description="Brand new")
+            def rl_new(text: str) -> str:
+                return text.upper()
+        """)
+        assert reloader.check() == [mod.__name__]
+
+        assert _call(tc, "rl_combine", {"a": 2, "b": 3})["result"] == "6"
+        assert _call(tc, "rl_new", {"text": "hi"})["result"] == "HI"
+        assert _call(tc, "rl_gone", {})["error"] == "unknown tool: rl_gone"
+
+    assert [(m, p) for m, p, _ in go.calls] == [
+        ("POST", "/agents/tools/register"),
+        ("DELETE", "/agents/tools/deregister/rl_gone"),
+    ]
+    registered = go.calls[0][2]
+    assert (registered["name"], registered["agent_id"]) == ("rl_new", "rl")
+    assert registered["callback_url"] == "http://sc"
+    assert go.calls[1][2] == {"agent_id": "rl"}
+
+
+def test_schema_change_is_reregistered(tool_module):
+    tool_module(V1)
+    agent = Agent("rl", builtin_tools=["rl_combine", "rl_gone"])
+    app = _build_sidecar_app([agent])
+    go = _Go()
+
+    with TestClient(app):
+        reloader = ToolReloader([agent], app.state.tool_executor, go.client, "http://sc")
+        assert reloader.check() == []  # nothing changed yet
+        tool_module(V1.replace("Combine two numbers", "Add two numbers"))
+        reloader.check()
+
+    assert [(p, b["name"], b["description"]) for _, p, b in go.calls] == [
+        ("/agents/tools/register", "rl_combine", "Add two numbers"),
+    ]
+
+
+def test_broken_module_keeps_previous_tools(tool_module):
+    tool_module(V1)
+    agent = Agent("rl", builtin_tools=["rl_combine", "rl_gone"])
+    app = _build_sidecar_app([agent])
+    go = _Go()
+
+    with TestClient(app) as tc:
+        reloader = ToolReloader([agent], app.state.tool_executor, go.client, "http://sc")
+        tool_module(V1 + "\n    def broken(:\n")
+        assert reloader.check() == []
+
+        assert _call(tc, "rl_combine", {"a": 2, "b": 3})["result"] == "5"
+        assert _call(tc, "rl_gone", {})["result"] == "gone"
+    assert set(agent._all_tool_defs()) == {"rl_combine", "rl_gone"}
+    assert go.calls == []
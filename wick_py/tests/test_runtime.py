@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+
+from wick._runtime import GoRuntime, _line_level
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="shebang scripts")
+
+
+def _fake_binary(tmp_path, body: str) -> str:
+    """An executable standing in for wick_server (it ignores --port/--host)."""
+    path = tmp_path / "wick_server"
+    path.write_text(f"#!{sys.executable}\nimport sys, time\n" + textwrap.dedent(body))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def test_line_level():
+    assert _line_level("auth proxy error: EOF") == logging.ERROR
+    assert _line_level("panic: runtime error") == logging.ERROR
+    assert _line_level("warning: failed to invalidate cache") == logging.WARNING
+    assert _line_level("[skills] discovered: pdf") == logging.INFO
+
+
+def test_chatty_binary_does_not_block_on_full_pipes(tmp_path):
+    # ~1 MB on each stream: far past the OS pipe buffer. Without draining,
+    # the child blocks on write and never creates the marker file.
+    marker = tmp_path / "done"
+    binary = _fake_binary(tmp_path, f"""
+        line = "2024/01/02 03:04:05 [loop] " + "x" * 100 + "\\n"
+        for i in range(10_000):
+            sys.stderr.write(line)
+            sys.stdout.write(line)
+        sys.stderr.flush()
+        open({str(marker)!r}, "w").close()
+        time.sleep(30)
+    """)
+    rt = GoRuntime(binary=binary, log_lines=50, log_level="ERROR")
+    rt.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not marker.exists():
+            assert time.monotonic() < deadline, "child blocked writing its logs"
+            time.sleep(0.05)
+    finally:
+        rt.stop()
+    # Both streams share the ring, so only its bound is deterministic here.
+    assert len(rt.recent_output()) == 50
+    assert len(rt.recent_output(5)) == 5
+
+
+def test_lines_forwarded_at_or_above_level(tmp_path, caplog):
+    binary = _fake_binary(tmp_path, """
+        print("2024/01/02 03:04:05 wick_server starting on :8000", file=sys.stderr)
+        print("2024/01/02 03:04:05 auth proxy error: EOF", file=sys.stderr)
+        sys.exit(0)
+    """)
+    rt = GoRuntime(binary=binary, log_level=logging.WARNING)
+    with caplog.at_level(logging.DEBUG, logger="wick.go"):
+        rt.start()
+        rt._process.wait(5)
+        rt._join_drains()
+    rt.stop()
+
+    records = [(r.levelno, r.getMessage()) for r in caplog.records if r.name == "wick.go"]
+    assert records == [(logging.ERROR, "auth proxy error: EOF")]
+    # Filtered lines are still kept, with the Go timestamp.
+    assert rt.recent_output() == [
+        "2024/01/02 03:04:05 wick_server starting on :8000",
+        "2024/01/02 03:04:05 auth proxy error: EOF",
+    ]
+
+
+def test_crash_report_includes_recent_output(tmp_path):
+    binary = _fake_binary(tmp_path, """
+        print("loading config", file=sys.stderr)
+        print("listen tcp :8000: bind: address already in use", file=sys.stderr)
+        sys.exit(1)
+    """)
+    rt = GoRuntime(binary=binary, port=1)
+    rt.start()
+    try:
+        with pytest.raises(RuntimeError, match="(?s)code 1.*address already in use"):
+            rt.wait_ready(timeout=10)
+    finally:
+        rt.stop()
+
+
+def test_unknown_log_level():
+    with pytest.raises(ValueError, match="log level"):
+        GoRuntime(binary="unused", log_level="CHATTY")
+
+
+def test_log_level_from_env(monkeypatch):
+    monkeypatch.setenv("WICK_GO_LOG_LEVEL", "warning")
+    assert GoRuntime(binary="unused")._log_level == logging.WARNING
+
+
+# ── Readiness ───────────────────────────────────────────────────────────
+
+
+def test_ready_line_wakes_wait_ready(tmp_path):
+    # Nothing answers /health: only the ready line can make this pass.
+    binary = _fake_binary(tmp_path, """
+        time.sleep(0.2)
+        print("WICK_READY 127.0.0.1:1", flush=True)
+        time.sleep(30)
+    """)
+    rt = GoRuntime(binary=binary, port=1)
+    rt.start()
+    try:
+        start = time.monotonic()
+        rt.wait_ready(timeout=10)
+        assert time.monotonic() - start < 1.5
+    finally:
+        rt.stop()
+    assert "WICK_READY 127.0.0.1:1" in rt.recent_output()
+
+
+def test_binary_without_ready_line_falls_back_to_health(tmp_path, monkeypatch):
+    import socket
+
+    import wick._runtime as runtime
+
+    monkeypatch.setattr(runtime, "_READY_LINE_GRACE", 0.1)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    binary = _fake_binary(tmp_path, f"""
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class Health(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.end_headers()
+
+        HTTPServer(("127.0.0.1", {port}), Health).serve_forever()
+    """)
+    rt = GoRuntime(binary=binary, port=port)
+    rt.start()
+    try:
+        rt.wait_ready(timeout=10)
+    finally:
+        rt.stop()
+
+
+def test_wait_ready_times_out(tmp_path):
+    binary = _fake_binary(tmp_path, "time.sleep(30)\n")
+    rt = GoRuntime(binary=binary, port=1)
+    rt.start()
+    try:
+        with pytest.raises(TimeoutError, match="not ready"):
+            rt.wait_ready(timeout=0.3)
+    finally:
+        rt.stop()
+
+
+def test_sidecar_wait_started_reports_bind_failure():
+    import socket
+
+    from wick import Agent
+
+    agent = Agent("busy-port")
+
+    @agent.tool(description="Echo")
+    def echo(text: str) -> str:
+        return text
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        s.listen()
+        port = s.getsockname()[1]
+        with pytest.raises(RuntimeError, match="failed to start"):
+            agent._start_sidecar("127.0.0.1", port)
+
+
+def test_sidecar_started_event():
+    import httpx
+
+    from wick import Agent
+
+    agent = Agent("started-event")
+
+    @agent.tool(description="Echo")
+    def echo(text: str) -> str:
+        return text
+
+    server = agent._launch_sidecar("127.0.0.1", 0)
+    server.wait_started(timeout=10)
+    assert server.started
+    port = server.servers[0].sockets[0].getsockname()[1]
+    resp = httpx.post(f"http://127.0.0.1:{port}/tools/echo", json={"args": {"text": "up"}})
+    assert resp.json() == {"result": "up"}
+    server.should_exit = True
+    server.thread.join(5)
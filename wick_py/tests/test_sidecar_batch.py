@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from wick._sidecar import build_app
+
+
+def echo(x: str) -> str:
+    return x
+
+
+def boom() -> str:
+    raise ValueError("exploded")
+
+
+async def slow(x: str) -> str:
+    await asyncio.sleep(0.2)
+    return x
+
+
+def _client() -> TestClient:
+    app = build_app({"echo": echo, "boom": boom, "slow": slow, "_batch": echo}, {})
+    return TestClient(app)
+
+
+def _frames(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_batch_returns_results_in_request_order_with_per_call_errors():
+    with _client() as c:
+        resp = c.post("/tools/_batch", json={"calls": [
+            {"id": "a", "name": "slow", "args": {"x": "1"}},
+            {"id": "b", "name": "boom"},
+            {"id": "c", "name": "missing"},
+            {"id": "d", "name": "echo", "args": {"x": "2"}},
+        ]})
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["id"] for r in results] == ["a", "b", "c", "d"]
+    assert results[0]["result"] == "1"
+    assert results[1]["error"] == "exploded"
+    assert results[2]["error"] == "unknown tool: missing"
+    assert results[3]["result"] == "2"
+
+
+def test_batch_runs_calls_concurrently():
+    with _client() as c:
+        start = time.monotonic()
+        resp = c.post("/tools/_batch", json={"calls": [
+            {"id": str(i), "name": "slow", "args": {"x": str(i)}} for i in range(5)
+        ]})
+        elapsed = time.monotonic() - start
+
+    assert [r["result"] for r in resp.json()["results"]] == ["0", "1", "2", "3", "4"]
+    assert elapsed < 0.8
+
+
+def test_batch_stream_frames_in_completion_order_then_done():
+    with _client() as c:
+        resp = c.post("/tools/_batch", json={"stream": True, "calls": [
+            {"id": "slow", "name": "slow", "args": {"x": "s"}},
+            {"id": "fast", "name": "echo", "args": {"x": "f"}},
+            {"id": "bad", "name": "boom"},
+        ]})
+
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    frames = _frames(resp.text)
+    assert frames[-1] == {"done": True}
+    assert frames[-2] == {"id": "slow", "result": "s"}
+    assert {"id": "fast", "result": "f"} in frames[:2]
+    assert {"id": "bad", "error": "exploded"} in frames[:2]
+
+
+def test_batch_route_is_not_treated_as_tool_name():
+    with _client() as c:
+        resp = c.post("/tools/_batch", json={"calls": [
+            {"id": "1", "name": "echo", "args": {"x": "hi"}},
+        ]})
+
+    assert resp.json() == {"results": [{"id": "1", "result": "hi", "error": None}]}
+
+
+def test_single_tool_endpoint_still_works():
+    with _client() as c:
+        ok = c.post("/tools/echo", json={"name": "echo", "args": {"x": "y"}}).json()
+        missing = c.post("/tools/nope", json={"name": "nope", "args": {}}).json()
+
+    assert ok == {"result": "y"}
+    assert missing["error"] == "unknown tool: nope"
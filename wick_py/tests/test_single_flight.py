@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from wick._executors import SingleFlight, ToolExecutor
+from wick._tools import ToolOptions
+
+
+def test_identical_concurrent_calls_run_once():
+    calls = []
+    gate = threading.Event()
+
+    def os_fetch_batch(page: int) -> str:
+        calls.append(page)
+        gate.wait(5)
+        return f"page-{page}"
+
+    ex = ToolExecutor({"fetch": os_fetch_batch}, {"fetch": ToolOptions(coalesce=True)})
+
+    async def go():
+        same = [asyncio.ensure_future(ex.run("fetch", {"page": 1})) for _ in range(4)]
+        other = asyncio.ensure_future(ex.run("fetch", {"page": 2}))
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*same), await other
+
+    try:
+        same, other = asyncio.run(go())
+        stats = ex.stats()["fetch"]
+    finally:
+        ex.shutdown()
+    assert same == ["page-1"] * 4 and other == "page-2"
+    assert sorted(calls) == [1, 2]
+    assert stats["coalesced"] == 3
+
+
+def test_sequential_calls_are_not_coalesced():
+    calls = []
+
+    async def lookup(key: str) -> str:
+        calls.append(key)
+        return key
+
+    ex = ToolExecutor({"lookup": lookup}, {"lookup": ToolOptions(coalesce=True)})
+
+    async def go():
+        await ex.run("lookup", {"key": "a"})
+        await ex.run("lookup", {"key": "a"})
+
+    asyncio.run(go())
+    ex.shutdown()
+    assert calls == ["a", "a"]
+
+
+def test_error_is_shared_by_all_waiters():
+    runs = 0
+
+    async def boom() -> str:
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.02)
+        raise RuntimeError("opensearch down")
+
+    sf = SingleFlight()
+
+    async def go():
+        return await asyncio.gather(
+            *(sf.do("k", boom) for _ in range(3)), return_exceptions=True,
+        )
+
+    results = asyncio.run(go())
+    assert runs == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def work() -> str:
+        await asyncio.sleep(0.05)
+        return "done"
+
+    sf = SingleFlight()
+
+    async def go():
+        first = asyncio.ensure_future(sf.do("k", work))
+        second = asyncio.ensure_future(sf.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(go()) == "done"
+
+
+def test_work_cancelled_when_every_waiter_leaves():
+    cancelled = False
+
+    async def work() -> str:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "done"
+
+    sf = SingleFlight()
+
+    async def go():
+        waiters = [asyncio.ensure_future(sf.do("k", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for w in waiters:
+            w.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(go())
+    assert cancelled
+
+
+def test_cache_ttl_implies_coalesce():
+    assert ToolOptions(cache_ttl=10).coalesce
+    assert not ToolOptions().coalesce
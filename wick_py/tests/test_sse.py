@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from wick import AsyncWickClient, WickClient
+from wick._sse import SSEParser
+
+FRAMES = (
+    b'event: on_chat_model_start\ndata: {"event":"on_chat_model_start","name":"m"}\n\n'
+    b": keep-alive\n\n"
+    b'event: on_chat_model_stream\ndata: {"event":"on_chat_model_stream","name":"m",'
+    b'"data":{"chunk":{"content":"Hel"}}}\n\n'
+    b'event: on_chat_model_stream\ndata: {"event":"on_chat_model_stream","name":"m",'
+    b'"data":{"chunk":{"content":"lo"}}}\n\n'
+    b'event: done\ndata: {"trace_id":"t1","thread_id":"th1","total_duration_ms":5}\n\n'
+)
+
+
+def _parse_all(chunks) -> list[tuple[str, bytes]]:
+    parser = SSEParser()
+    return [frame for chunk in chunks for frame in parser.feed(chunk)]
+
+
+def test_frames_survive_any_chunking():
+    whole = _parse_all([FRAMES])
+    assert [e for e, _ in whole] == [
+        "on_chat_model_start", "on_chat_model_stream", "on_chat_model_stream", "done",
+    ]
+    for size in (1, 2, 3, 7, 64):
+        chunks = [FRAMES[i:i + size] for i in range(0, len(FRAMES), size)]
+        assert _parse_all(chunks) == whole
+
+
+def test_crlf_multiline_data_and_default_event():
+    stream = b"data: a\r\ndata: b\r\n\r\nevent:x\rdata:{}\r\r"
+    for size in (1, len(stream)):
+        chunks = [stream[i:i + size] for i in range(0, len(stream), size)]
+        assert _parse_all(chunks) == [("message", b"a\nb"), ("x", b"{}")]
+
+
+def test_incomplete_frame_is_held_back():
+    parser = SSEParser()
+    assert parser.feed(b"event: done\ndata: {}\n") == []
+    assert parser.feed(b"\n") == [("done", b"{}")]
+
+
+def _transport(seen: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(
+            200, stream=httpx.ByteStream(FRAMES), headers={"content-type": "text/event-stream"},
+        )
+    return httpx.MockTransport(handler)
+
+
+def test_client_stream_yields_typed_events():
+    seen: list = []
+    client = WickClient("http://go")
+    client._http = httpx.Client(transport=_transport(seen))
+
+    events = list(client.stream("a1", "hi", thread_id="th1"))
+
+    assert seen == [("/agents/a1/stream", {
+        "messages": [{"role": "user", "content": "hi"}], "thread_id": "th1",
+    })]
+    assert "".join(e.text for e in events) == "Hello"
+    assert events[0].name == "m"
+    assert events[-1].event == "done"
+    assert events[-1].payload["thread_id"] == "th1"
+
+
+def test_async_client_stream():
+    seen: list = []
+
+    async def go():
+        async with AsyncWickClient("http://go", transport=_transport(seen)) as client:
+            return [e async for e in client.stream("a1", [{"role": "user", "content": "hi"}])]
+
+    events = asyncio.run(go())
+    assert seen[0][1] == {"messages": [{"role": "user", "content": "hi"}]}
+    assert [e.event for e in events][-1] == "done"
+    assert "".join(e.text for e in events) == "Hello"
+
+
+def test_stream_is_not_retried_after_a_server_error():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(502, text="bad gateway")
+
+    async def go():
+        async with AsyncWickClient("http://go", transport=httpx.MockTransport(handler)) as client:
+            async for _ in client.stream("a1", "hi"):
+                pass
+
+    try:
+        asyncio.run(go())
+    except httpx.HTTPStatusError as e:
+        assert e.response.status_code == 502
+    else:
+        raise AssertionError("expected HTTPStatusError")
+    assert len(attempts) == 1
+
+
+def test_sse_events_decodes_json_and_stops_at_done(caplog):
+    from wick import sse_events
+
+    body = (
+        b'data: {"choices":[{"delta":{"content":"Hi"}}]}\n\n'
+        b"data: {not json}\n\n"
+        b'event: message_stop\ndata: {"type":"message_stop"}\n\n'
+        b"data: [DONE]\n\n"
+        b'data: {"after":"done"}\n\n'
+    )
+
+    class Chunks(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for i in range(0, len(body), 5):
+                yield body[i:i + 5]
+
+    async def go():
+        resp = httpx.Response(200, stream=Chunks())
+        return [frame async for frame in sse_events(resp)]
+
+    assert asyncio.run(go()) == [
+        ("message", {"choices": [{"delta": {"content": "Hi"}}]}),
+        ("message_stop", {"type": "message_stop"}),
+    ]
+    assert "malformed SSE data" in caplog.text
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from wick._sidecar import _coalesce_deltas, build_app
+from wick._types import StreamChunk, ToolCallResult
+
+
+async def _gen(script):
+    """Yield chunks; a float in the script sleeps that many seconds."""
+    for item in script:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+def _collect(script, window=0.05, max_chars=4096):
+    async def go():
+        return [c async for c in _coalesce_deltas(_gen(script), window, max_chars)]
+    return asyncio.run(go())
+
+
+def _d(text):
+    return StreamChunk(delta=text)
+
+
+def test_first_delta_passes_through_then_merges():
+    out = _collect([_d("a"), _d("b"), _d("c"), _d("d")])
+    assert [c.delta for c in out] == ["a", "bcd"]
+
+
+def test_tool_call_and_done_flush_immediately():
+    tc = StreamChunk(tool_call=ToolCallResult(id="1", name="t", args={}))
+    out = _collect([_d("a"), _d("b"), _d("c"), tc, _d("e"), StreamChunk(done=True)])
+    assert [(c.delta, c.tool_call is not None, bool(c.done)) for c in out] == [
+        ("a", False, False),
+        ("bc", False, False),
+        (None, True, False),
+        ("e", False, False),
+        (None, False, True),
+    ]
+
+
+def test_window_expiry_flushes_while_provider_stalls():
+    async def go():
+        received = []
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async for c in _coalesce_deltas(_gen([_d("a"), _d("b"), 0.5, _d("c")]), 0.02):
+            received.append((c.delta, loop.time() - start))
+        return received
+
+    received = asyncio.run(go())
+    assert [d for d, _ in received] == ["a", "b", "c"]
+    assert received[1][1] < 0.3  # "b" didn't wait for the stalled provider
+
+
+def test_max_chars_flushes_inside_window():
+    out = _collect([_d("x"), _d("aaa"), _d("bbb"), _d("c")], window=10, max_chars=5)
+    assert [c.delta for c in out] == ["x", "aaabbb", "c"]
+
+
+def test_buffer_flushed_before_provider_error():
+    async def failing():
+        yield _d("a")
+        yield _d("b")
+        raise RuntimeError("upstream closed")
+
+    async def go():
+        out = []
+        try:
+            async for c in _coalesce_deltas(failing(), 10):
+                out.append(c.delta)
+        except RuntimeError:
+            out.append("error")
+        return out
+
+    assert asyncio.run(go()) == ["a", "b", "error"]
+
+
+def test_stream_endpoint_coalesces_when_enabled():
+    async def model(req):
+        for tok in ["Hel", "lo", ",", " wor", "ld"]:
+            yield StreamChunk(delta=tok)
+        yield StreamChunk(done=True)
+
+    def frames(app):
+        with TestClient(app) as c:
+            text = c.post("/llm/m/stream", json={"model": "m", "messages": []}).text
+        return [json.loads(line[6:]) for line in text.splitlines() if line.startswith("data: ")]
+
+    plain = frames(build_app({}, {"m": model}))
+    merged = frames(build_app({}, {"m": model}, stream_coalesce_ms=50))
+
+    assert len(plain) == 7  # 5 deltas, provider done, sidecar done
+    assert merged == [{"delta": "Hel"}, {"delta": "lo, world"}, {"done": True}, {"done": True}]
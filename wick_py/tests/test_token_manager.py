@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from wick import TokenManager
+
+
+class _Issuer:
+    """Token endpoint stand-in: token-1, token-2, ... with a fixed lifetime."""
+
+    def __init__(self, expires_in: float | None = 3600, delay: float = 0.0) -> None:
+        self.expires_in = expires_in
+        self.delay = delay
+        self.issued = 0
+        self.fail = False
+
+    async def __call__(self) -> dict:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise httpx.ConnectError("token endpoint down")
+        self.issued += 1
+        return {"access_token": f"token-{self.issued}", "expires_in": self.expires_in}
+
+
+def test_concurrent_callers_share_one_fetch():
+    issuer = _Issuer(delay=0.02)
+    tokens = TokenManager(issuer)
+
+    async def go():
+        return await asyncio.gather(*(tokens.get() for _ in range(20)))
+
+    assert asyncio.run(go()) == ["token-1"] * 20
+    assert issuer.issued == 1
+
+
+def test_refreshes_in_background_before_expiry():
+    issuer = _Issuer(expires_in=0.2, delay=0.01)
+    tokens = TokenManager(issuer, refresh_margin=0.1)
+
+    async def go():
+        first = await tokens.get()
+        await asyncio.sleep(0.12)         # inside the refresh window, not expired
+        during = await tokens.get()       # served the current token, refresh starts
+        await asyncio.sleep(0.03)
+        after = await tokens.get()
+        return first, during, after
+
+    assert asyncio.run(go()) == ("token-1", "token-1", "token-2")
+    assert issuer.issued == 2
+
+
+def test_missing_expires_in_uses_default_ttl_and_margin_is_capped():
+    issuer = _Issuer(expires_in=None)
+    tokens = TokenManager(issuer, refresh_margin=60, default_ttl=0.1)
+
+    async def go():
+        await tokens.get()
+        await asyncio.sleep(0.02)         # margin capped at ttl/2: not refreshing yet
+        await tokens.get()
+        await asyncio.sleep(0)
+        issued_early = issuer.issued
+        await asyncio.sleep(0.1)          # expired: callers wait for a new token
+        return issued_early, await tokens.get()
+
+    assert asyncio.run(go()) == (1, "token-2")
+
+
+def test_stream_retries_once_on_401_with_one_refresh():
+    issuer = _Issuer()
+    tokens = TokenManager(issuer)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        auth = request.headers["Authorization"]
+        seen.append(auth)
+        if auth == "Bearer token-1":
+            return httpx.Response(401)
+        return httpx.Response(200, stream=httpx.ByteStream(b"data: ok\n\n"))
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async def one():
+                async with tokens.stream(client, "POST", "https://gw/chat", json={}) as resp:
+                    return resp.status_code, await resp.aread()
+            return await asyncio.gather(*(one() for _ in range(5)))
+
+    assert asyncio.run(go()) == [(200, b"data: ok\n\n")] * 5
+    assert issuer.issued == 2             # one refresh for five 401s
+    assert seen.count("Bearer token-1") == 5 and seen.count("Bearer token-2") == 5
+
+
+def test_second_401_is_returned_to_the_caller():
+    issuer = _Issuer()
+    tokens = TokenManager(issuer)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.headers["Authorization"])
+        return httpx.Response(401)
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return (await tokens.request(client, "GET", "https://gw/models")).status_code
+
+    assert asyncio.run(go()) == 401
+    assert attempts == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_failed_fetch_raises_to_waiters_and_is_retried():
+    issuer = _Issuer()
+    issuer.fail = True
+    tokens = TokenManager(issuer)
+
+    async def go():
+        results = await asyncio.gather(tokens.get(), tokens.get(), return_exceptions=True)
+        issuer.fail = False
+        return results, await tokens.get()
+
+    results, token = asyncio.run(go())
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+    assert token == "token-1"
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        TokenManager(_Issuer(), refresh_margin=-1)
+    with pytest.raises(ValueError):
+        TokenManager(_Issuer(), default_ttl=0)
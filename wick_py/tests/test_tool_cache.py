@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wick import _cache
+from wick._cache import MISSING, ToolCache, cache_key
+from wick._executors import ToolExecutor
+from wick._sidecar import build_app
+from wick._tools import ToolOptions
+
+
+def test_cache_key_is_canonical():
+    assert cache_key({"a": 1, "b": [1, 2]}) == cache_key({"b": [1, 2], "a": 1})
+    assert cache_key({"a": 1}) != cache_key({"a": "1"})
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(_cache.time, "monotonic", lambda: now[0])
+    cache = ToolCache(ttl=10)
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    now[0] += 11
+    assert cache.get("k") is MISSING
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction():
+    cache = ToolCache(ttl=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # a is now most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_cached_tool_runs_once_and_reports_counters():
+    calls = []
+
+    def os_count(index: str) -> str:
+        calls.append(index)
+        return f"{index}:42"
+
+    app = build_app({"os_count": os_count}, {}, tool_options={"os_count": ToolOptions(cache_ttl=60)})
+    with TestClient(app) as c:
+        for _ in range(3):
+            r = c.post("/tools/os_count", json={"name": "os_count", "args": {"index": "docs"}})
+            assert r.json()["result"] == "docs:42"
+        c.post("/tools/os_count", json={"name": "os_count", "args": {"index": "logs"}})
+        stats = c.get("/tools/_stats").json()["os_count"]["cache"]
+
+    assert calls == ["docs", "logs"]
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["entries"] == 2
+
+
+def test_errors_are_not_cached():
+    attempts = []
+
+    def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("index unavailable")
+        return "ok"
+
+    ex = ToolExecutor({"flaky": flaky}, {"flaky": ToolOptions(cache_ttl=60)})
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await ex.run("flaky", {})
+        return await ex.run("flaky", {}), await ex.run("flaky", {})
+
+    try:
+        assert asyncio.run(go()) == ("ok", "ok")
+    finally:
+        ex.shutdown()
+    assert len(attempts) == 2
+
+
+def test_uncached_tool_has_no_cache_stats():
+    ex = ToolExecutor({"t": lambda: "x"})
+    try:
+        assert "cache" not in ex.stats()["t"]
+    finally:
+        ex.shutdown()
+
+
+def test_cache_option_validation():
+    with pytest.raises(ValueError, match="cache_ttl must be > 0"):
+        ToolOptions(cache_ttl=0)
+    with pytest.raises(ValueError, match="requires cache_ttl"):
+        ToolOptions(cache_max_entries=10)
+    with pytest.raises(ValueError, match="cache_max_entries must be >= 1"):
+        ToolOptions(cache_ttl=5, cache_max_entries=0)
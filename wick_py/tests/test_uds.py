@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+import httpx
+import pytest
+
+from wick import Agent
+from wick._agent import _sidecar_url
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+
+
+def test_sidecar_url():
+    assert _sidecar_url("127.0.0.1", 9100, None) == "http://127.0.0.1:9100"
+    assert _sidecar_url("127.0.0.1", 9100, "/run/wick.sock") == "unix:///run/wick.sock"
+    assert _sidecar_url("h", 1, "rel.sock") == "unix://" + os.path.abspath("rel.sock")
+
+
+def test_sidecar_serves_tools_over_unix_socket():
+    agent = Agent("uds-agent")
+
+    @agent.tool(description="Echo")
+    def echo(text: str) -> str:
+        return text
+
+    with tempfile.TemporaryDirectory(prefix="wick") as d:
+        sock = os.path.join(d, "sidecar.sock")
+        agent._start_sidecar("127.0.0.1", 0, uds=sock)
+        with httpx.Client(transport=httpx.HTTPTransport(uds=sock), base_url="http://sidecar") as c:
+            resp = c.post("/tools/echo", json={"name": "echo", "args": {"text": "over uds"}})
+    assert resp.json() == {"result": "over uds"}
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wick import LLMResponse, upstream_client
+from wick._sidecar import build_app
+from wick._upstream import aclose_upstream_clients
+
+
+def test_one_client_per_origin_and_loop():
+    async def go():
+        a = upstream_client("https://api.example.com/v1/messages")
+        b = upstream_client("https://API.example.com/other")
+        c = upstream_client("https://api.example.com:8443/")
+        await aclose_upstream_clients()
+        return a, b, c
+
+    a, b, c = asyncio.run(go())
+    assert a is b and a is not c
+    assert a.is_closed and c.is_closed
+
+    async def other_loop():
+        client = upstream_client("https://api.example.com")
+        await aclose_upstream_clients()
+        return client
+
+    assert asyncio.run(other_loop()) is not a
+
+
+def test_closed_client_is_replaced():
+    async def go():
+        first = upstream_client("https://api.example.com")
+        await first.aclose()
+        second = upstream_client("https://api.example.com")
+        await aclose_upstream_clients()
+        return first, second
+
+    first, second = asyncio.run(go())
+    assert first is not second
+
+
+def test_relative_url_rejected():
+    async def go():
+        upstream_client("/v1/messages")
+
+    with pytest.raises(ValueError):
+        asyncio.run(go())
+
+
+def test_sidecar_shutdown_closes_provider_clients():
+    clients = []
+
+    async def provider(request):
+        clients.append(upstream_client("https://api.example.com"))
+        return LLMResponse(content="ok")
+
+    app = build_app(tools={}, llm_providers={"m": provider})
+    with TestClient(app) as tc:
+        tc.post("/llm/m/call", json={"model": "m", "messages": []})
+        tc.post("/llm/m/call", json={"model": "m", "messages": []})
+        assert clients[0] is clients[1] and not clients[0].is_closed
+    assert clients[0].is_closed
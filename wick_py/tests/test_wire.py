@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wick import _wire
+from wick._sidecar import build_app
+from wick._types import LLMRequest, StreamChunk, ToolCallResult
+
+
+def _history(n: int) -> dict:
+    msgs = []
+    for i in range(n):
+        if i % 2:
+            msgs.append({
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{"id": f"c{i}", "name": "search", "arguments": {"q": "x"}}],
+            })
+        else:
+            msgs.append({"role": "tool", "content": "r", "tool_call_id": f"c{i - 1}", "name": "search"})
+    return {"model": "m", "messages": msgs, "temperature": 0.2}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(_wire, "orjson", None)
+    elif _wire.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_llm_request_matches_pydantic(codec):
+    body = json.dumps(_history(20)).encode()
+    assert _wire.decode_llm_request(body) == LLMRequest(**json.loads(body))
+
+
+def test_stream_chunk_omits_unset_fields(codec):
+    assert json.loads(_wire.encode_stream_chunk(StreamChunk(delta="hi"))) == {"delta": "hi"}
+    assert json.loads(_wire.encode_stream_chunk(StreamChunk(done=True))) == {"done": True}
+    tc = StreamChunk(tool_call=ToolCallResult(id="1", name="t", args={"a": 1}))
+    assert json.loads(_wire.encode_stream_chunk(tc)) == {
+        "tool_call": {"id": "1", "name": "t", "arguments": {"a": 1}},
+    }
+
+
+def test_tool_codec(codec):
+    assert _wire.decode_tool_request(b'{"name": "t", "args": {"x": 1}}') == {"x": 1}
+    assert _wire.decode_tool_request(b'{"name": "t"}') == {}
+    assert json.loads(_wire.encode_tool_response("ok")) == {"result": "ok"}
+    assert json.loads(_wire.encode_tool_response(error="bad")) == {"error": "bad"}
+    for bad in (b"not json", b"[1]", b'{"args": [1]}'):
+        with pytest.raises(_wire.WireError):
+            _wire.decode_tool_request(bad)
+
+
+def test_dumps_falls_back_for_values_orjson_rejects():
+    assert json.loads(_wire.dumps({"big": 2**70})) == {"big": 2**70}
+    assert json.loads(_wire.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_sidecar_endpoints_use_fast_path():
+    seen = []
+
+    async def model(req: LLMRequest):
+        seen.append(req)
+        yield StreamChunk(delta="hel")
+        yield StreamChunk(tool_call=ToolCallResult(id="1", name="t", args={}))
+
+    def echo(x: str) -> str:
+        return x
+
+    app = build_app({"echo": echo}, {"m": model})
+    with TestClient(app) as c:
+        tool = c.post("/tools/echo", json={"name": "echo", "args": {"x": "y"}})
+        bad_tool = c.post("/tools/echo", content=b"{")
+        stream = c.post("/llm/m/stream", json=_history(4))
+        bad_llm = c.post("/llm/m/call", content=b'{"messages": 3}')
+
+    assert tool.json() == {"result": "y"}
+    assert bad_tool.status_code == 400
+    frames = [json.loads(line[6:]) for line in stream.text.splitlines() if line.startswith("data: ")]
+    assert frames == [
+        {"delta": "hel"},
+        {"tool_call": {"id": "1", "name": "t", "arguments": {}}},
+        {"done": True},
+    ]
+    assert len(seen[0].messages) == 4
+    assert bad_llm.status_code == 400
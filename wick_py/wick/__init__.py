@@ -27,6 +27,10 @@ Usage:
 __version__ = "0.1.0"
 
 from ._agent import Agent
+from ._cancel import CancellationToken, ToolCancelled
+from ._client import AgentEvent, AsyncWickClient, WickClient
+from ._hedge import HedgePolicy, hedged_stream
+from ._sse import sse_events
 from ._tools import tool
 from ._types import (
     BackendConfig,
@@ -37,15 +41,24 @@ from ._types import (
     SkillsConfig,
     StreamChunk,
     SubAgentConfig,
+    ToolBatchCall,
+    ToolBatchRequest,
+    ToolBatchResponse,
+    ToolBatchResult,
     ToolCallbackRequest,
     ToolCallbackResponse,
     ToolCallResult,
     ToolSchema,
 )
+from ._upstream import TokenManager, upstream_client
 
 __all__ = [
     "Agent",
+    "AgentEvent",
+    "AsyncWickClient",
     "BackendConfig",
+    "CancellationToken",
+    "HedgePolicy",
     "tool",
     "LLMMessage",
     "LLMRequest",
@@ -54,8 +67,18 @@ __all__ = [
     "SkillsConfig",
     "StreamChunk",
     "SubAgentConfig",
+    "TokenManager",
+    "ToolBatchCall",
+    "ToolBatchRequest",
+    "ToolBatchResponse",
+    "ToolBatchResult",
     "ToolCallbackRequest",
     "ToolCallbackResponse",
     "ToolCallResult",
+    "ToolCancelled",
     "ToolSchema",
+    "WickClient",
+    "hedged_stream",
+    "sse_events",
+    "upstream_client",
 ]
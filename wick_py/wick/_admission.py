@@ -0,0 +1,171 @@
+"""Admission control for LLM provider requests.
+
+Each provider registered with a max_concurrency gets a gate: up to
+max_concurrency requests (streams and calls) run upstream at once, up to
+max_queue more wait in line for at most queue_timeout seconds, and anything
+beyond that is turned away at once with 429 + Retry-After. Go's
+HTTPProxyClient waits out Retry-After and retries, so a burst of sub-agents
+queues up instead of all hitting the upstream rate limit together.
+
+Providers without max_concurrency are not gated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Any
+
+# Retry-After bounds (seconds) sent with 429s.
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+# Weight of the newest sample in the running average of permit hold time.
+_HOLD_EMA_WEIGHT = 0.2
+
+
+class ProviderOptions:
+    """How the sidecar admits requests to one LLM provider.
+
+    max_concurrency:
+        Requests (streams and calls) allowed upstream at once. None = no
+        limit and no queue.
+    max_queue:
+        Requests allowed to wait for a slot; more are rejected with 429.
+    queue_timeout:
+        Seconds a request may wait for a slot before it is rejected with 429.
+    """
+
+    __slots__ = ("max_concurrency", "max_queue", "queue_timeout")
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        if max_queue < 0:
+            raise ValueError(f"max_queue must be >= 0, got {max_queue}")
+        if queue_timeout <= 0:
+            raise ValueError(f"queue_timeout must be > 0, got {queue_timeout}")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+
+class Overloaded(Exception):
+    """A provider's queue is full or the wait timed out."""
+
+    def __init__(self, provider: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"LLM provider {provider} overloaded: {reason}")
+        self.retry_after = retry_after
+
+
+class Permit:
+    """A held slot; release() is idempotent."""
+
+    __slots__ = ("_gate", "_acquired_at")
+
+    def __init__(self, gate: _Gate | None) -> None:
+        self._gate = gate
+        self._acquired_at = time.monotonic()
+
+    def release(self) -> None:
+        gate, self._gate = self._gate, None
+        if gate is not None:
+            gate.release(time.monotonic() - self._acquired_at)
+
+
+class _Gate:
+    __slots__ = ("name", "options", "semaphore", "in_flight", "queued", "rejected", "avg_hold")
+
+    def __init__(self, name: str, options: ProviderOptions) -> None:
+        self.name = name
+        self.options = options
+        self.semaphore = asyncio.Semaphore(options.max_concurrency or 1)
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self.avg_hold = 0.0
+
+    async def acquire(self) -> Permit:
+        if self.semaphore.locked():
+            if self.queued >= self.options.max_queue:
+                raise self._reject("queue full")
+            self.queued += 1
+            try:
+                acquired = await self._acquire_within(self.options.queue_timeout)
+            finally:
+                self.queued -= 1
+            if not acquired:
+                raise self._reject(f"no slot within {self.options.queue_timeout:g}s")
+        else:
+            await self.semaphore.acquire()
+        self.in_flight += 1
+        return Permit(self)
+
+    async def _acquire_within(self, timeout: float) -> bool:
+        # Not wait_for: before 3.12 it can time out after the semaphore was
+        # already acquired, losing the slot for good.
+        task = asyncio.ensure_future(self.semaphore.acquire())
+        try:
+            await asyncio.wait({task}, timeout=timeout)
+        except BaseException:
+            if not task.cancel() and not task.cancelled():
+                self.semaphore.release()  # acquired just as the caller went away
+            raise
+        if task.done():
+            return True
+        task.cancel()
+        return False
+
+    def release(self, held: float) -> None:
+        self.in_flight -= 1
+        self.semaphore.release()
+        self.avg_hold = (
+            held if not self.avg_hold else
+            (1 - _HOLD_EMA_WEIGHT) * self.avg_hold + _HOLD_EMA_WEIGHT * held
+        )
+
+    def _reject(self, reason: str) -> Overloaded:
+        self.rejected += 1
+        return Overloaded(self.name, reason, self.retry_after())
+
+    def retry_after(self) -> int:
+        """Rough time until a slot frees up for a request arriving now: the
+        queue ahead of it drains max_concurrency requests per average hold."""
+        slots = self.options.max_concurrency or 1
+        estimate = self.avg_hold * (self.queued + 1) / slots
+        return max(MIN_RETRY_AFTER, min(MAX_RETRY_AFTER, math.ceil(estimate)))
+
+
+class AdmissionController:
+    """Per-provider gates for the sidecar's LLM endpoints."""
+
+    def __init__(self, options: dict[str, ProviderOptions] | None = None) -> None:
+        self._gates = {
+            name: _Gate(name, opts)
+            for name, opts in (options or {}).items()
+            if opts.max_concurrency
+        }
+
+    async def acquire(self, provider: str) -> Permit:
+        """Wait for a slot. Raises Overloaded when the request must be rejected."""
+        gate = self._gates.get(provider)
+        if gate is None:
+            return Permit(None)
+        return await gate.acquire()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "max_concurrency": gate.options.max_concurrency,
+                "in_flight": gate.in_flight,
+                "queued": gate.queued,
+                "rejected": gate.rejected,
+            }
+            for name, gate in self._gates.items()
+        }
@@ -30,10 +30,13 @@ from typing import Any
 
 import uvicorn
 
-from ._client import WickClient
+from ._admission import ProviderOptions
+from ._cancel import cancellation_param
+from ._client import WickClient, tool_payload
+from ._reload import ToolReloader
 from ._runtime import GoRuntime
 from ._sidecar import build_app
-from ._tools import get_tool as _get_global_tool
+from ._tools import ToolOptions, get_tool as _get_global_tool
 from ._types import (
     BackendConfig,
     MemoryConfig,
@@ -47,7 +50,7 @@ logger = logging.getLogger("wick")
 class _ToolDef:
     """Internal tool definition."""
 
-    __slots__ = ("name", "description", "parameters", "fn")
+    __slots__ = ("name", "description", "parameters", "fn", "options")
 
     def __init__(
         self,
@@ -55,11 +58,13 @@ class _ToolDef:
         description: str,
         parameters: dict[str, Any],
         fn: Callable,
+        options: ToolOptions | None = None,
     ) -> None:
         self.name = name
         self.description = description
         self.parameters = parameters
         self.fn = fn
+        self.options = options or ToolOptions()
 
 
 VALID_SUBAGENT_MODES = ("sync", "async", "both")
@@ -109,6 +114,7 @@ class Agent:
         debug: bool = False,
         context_window: int = 0,
         mode: str = "sync",
+        batch_tools: bool = True,
     ) -> None:
         if mode not in VALID_SUBAGENT_MODES:
             raise ValueError(
@@ -126,6 +132,10 @@ class Agent:
         # `mode` is only consulted when this Agent is used as a sub-agent.
         # Top-level (supervisor) agents ignore it.
         self._mode = mode
+        # Let Go coalesce concurrent calls to this agent's Python tools into
+        # one /tools/_batch round-trip. Costs lone calls a ~2 ms batching
+        # window; set False for latency-critical single-tool agents.
+        self._batch_tools = batch_tools
 
         # Config objects
         self._backend = (
@@ -147,6 +157,7 @@ class Agent:
         # Registries (populated by decorators)
         self._tools: dict[str, _ToolDef] = {}
         self._llm_providers: dict[str, Callable] = {}
+        self._llm_options: dict[str, ProviderOptions] = {}
 
     # ── Decorators ──────────────────────────────────────────────────────
 
@@ -155,6 +166,12 @@ class Agent:
         name: str | None = None,
         description: str = "",
         parameters: dict[str, Any] | None = None,
+        *,
+        executor: str = "shared",
+        max_concurrency: int | None = None,
+        cache_ttl: float | None = None,
+        cache_max_entries: int | None = None,
+        coalesce: bool = False,
     ) -> Callable:
         """Decorator to register a Python function as a tool.
 
@@ -162,16 +179,34 @@ class Agent:
             @agent.tool(description="Add two numbers")
             def add(a: float, b: float) -> str:
                 return str(a + b)
+
+        executor / max_concurrency / cache_ttl / cache_max_entries / coalesce
+        control how the sidecar runs the tool — see wick._tools.ToolOptions.
         """
+        options = ToolOptions(
+            executor=executor,
+            max_concurrency=max_concurrency,
+            cache_ttl=cache_ttl,
+            cache_max_entries=cache_max_entries,
+            coalesce=coalesce,
+        )
+
         def decorator(fn: Callable) -> Callable:
             tool_name = name or fn.__name__
             tool_desc = description or fn.__doc__ or ""
             tool_params = parameters or _infer_parameters(fn)
-            self._tools[tool_name] = _ToolDef(tool_name, tool_desc, tool_params, fn)
+            self._tools[tool_name] = _ToolDef(tool_name, tool_desc, tool_params, fn, options)
             return fn
         return decorator
 
-    def llm_provider(self, model_name: str | None = None) -> Callable:
+    def llm_provider(
+        self,
+        model_name: str | None = None,
+        *,
+        max_concurrency: int | None = None,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+    ) -> Callable:
         """Decorator to register a custom LLM handler.
 
         The handler can be:
@@ -183,10 +218,21 @@ class Agent:
             async def handler(request: LLMRequest) -> AsyncIterator[StreamChunk]:
                 yield StreamChunk(delta="Hello!")
                 yield StreamChunk(done=True)
+
+        max_concurrency / max_queue / queue_timeout bound how many requests
+        the sidecar sends upstream at once; overflow gets 429 + Retry-After
+        — see wick._admission.ProviderOptions.
         """
+        options = ProviderOptions(
+            max_concurrency=max_concurrency,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout,
+        )
+
         def decorator(fn: Callable) -> Callable:
             key = model_name or fn.__name__
             self._llm_providers[key] = fn
+            self._llm_options[key] = options
             return fn
         return decorator
 
@@ -201,6 +247,9 @@ class Agent:
         sidecar_host: str = "127.0.0.1",
         ui: bool = True,
         extra_agents: list["Agent"] | None = None,
+        stream_coalesce_ms: float = 0,
+        sidecar_uds: str | None = None,
+        reload: bool = False,
     ) -> None:
         """Dev mode: start Go binary + sidecar, register agent, block until SIGINT.
 
@@ -211,20 +260,32 @@ class Agent:
             sidecar_host: host for the sidecar
             ui: serve the bundled UI (default True)
             extra_agents: additional Agent instances to register with the same server
+            stream_coalesce_ms: merge streamed text deltas arriving within this
+                window into one frame (0 = off; see build_app)
+            sidecar_uds: serve the sidecar on this Unix socket path instead of
+                sidecar_host:sidecar_port; Go calls it via a unix:// callback URL
+            reload: watch the modules defining the agents' tools and hot-swap
+                changed tools into the running sidecar and Go server, without
+                restarting either (see wick._reload)
         """
         all_agents = [self] + (extra_agents or [])
 
-        # Check if any agent needs a sidecar (has Python tools or LLM providers)
-        needs_sidecar = any(
+        # Check if any agent needs a sidecar (has Python tools or LLM providers).
+        # With reload on, tools may appear later, so always start one.
+        needs_sidecar = reload or any(
             bool(a._tools or a._resolve_builtin_tools() or a._llm_providers)
             for a in all_agents
         )
-        sidecar_url = f"http://{sidecar_host}:{sidecar_port}"
+        sidecar_url = _sidecar_url(sidecar_host, sidecar_port, sidecar_uds)
 
-        # Start sidecar if needed — serves tools from all agents
-        sidecar_thread = None
+        # Start sidecar if needed — serves tools from all agents. It starts
+        # up while the Go binary does; both are awaited below.
+        sidecar = None
         if needs_sidecar:
-            sidecar_thread = self._start_sidecar(sidecar_host, sidecar_port, all_agents)
+            sidecar = self._launch_sidecar(
+                sidecar_host, sidecar_port, all_agents,
+                stream_coalesce_ms=stream_coalesce_ms, uds=sidecar_uds,
+            )
 
         # Resolve cwd for Go binary so it finds static/ for UI serving
         go_cwd = None
@@ -236,18 +297,29 @@ class Agent:
         runtime = GoRuntime(binary=go_binary, port=go_port, host=go_host, cwd=go_cwd)
         runtime.start()
         try:
+            if sidecar is not None:
+                sidecar.wait_started()
             runtime.wait_ready()
         except Exception:
             runtime.stop()
             raise
 
         # Register all agents and their tools
+        reloader = None
         try:
             client = WickClient(runtime.base_url)
+            entries = []
             for a in all_agents:
                 a_needs_sidecar = bool(a._tools or a._resolve_builtin_tools() or a._llm_providers)
-                a._register(client, sidecar_url if a_needs_sidecar else None)
+                entries.append((a, sidecar_url if a_needs_sidecar else None))
+            _register_all(client, entries)
+            for a in all_agents:
                 print(f"  registered agent '{a.agent_id}'")
+            if reload:
+                reloader = ToolReloader(
+                    all_agents, sidecar.config.app.state.tool_executor, client, sidecar_url,
+                )
+                reloader.start()
 
             logger.info("All agents ready at %s", runtime.base_url)
             print(f"\n  wick server running at {runtime.base_url}\n")
@@ -258,6 +330,8 @@ class Agent:
             signal.signal(signal.SIGTERM, lambda *_: stop.set())
             stop.wait()
         finally:
+            if reloader is not None:
+                reloader.stop()
             client.close()
             runtime.stop()
             print("\nStopped.")
@@ -268,6 +342,11 @@ class Agent:
         port: int = 9100,
         host: str = "0.0.0.0",
         go_url: str = "http://localhost:8000",
+        stream_coalesce_ms: float = 0,
+        uds: str | None = None,
+        workers: int = 1,
+        app_module: str | None = None,
+        reload: bool = False,
     ) -> None:
         """Production mode: start only the sidecar and register with an existing Go server.
 
@@ -275,25 +354,72 @@ class Agent:
             port: sidecar port
             host: sidecar host
             go_url: URL of the running Go server
+            stream_coalesce_ms: merge streamed text deltas arriving within this
+                window into one frame (0 = off; see build_app)
+            uds: serve on this Unix socket path instead of host:port. Go must
+                run on the same machine (or share the socket's volume).
+            workers: number of sidecar processes. More than one requires
+                app_module.
+            app_module: "module:attribute" import path of this Agent (or of a
+                list of Agents) — e.g. "examples.server:claude". Each worker
+                imports it and rebuilds the tool and provider registry, so
+                the module must be importable without side effects beyond
+                defining agents (keep run/serve_sidecar calls under
+                `if __name__ == "__main__":`).
+            reload: watch the modules defining this agent's tools and
+                hot-swap changed tools into the sidecar and Go server (see
+                wick._reload). Not with app_module.
         """
-        sidecar_url = f"http://127.0.0.1:{port}"
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        if reload and app_module:
+            raise ValueError(
+                "reload can't be combined with app_module: each worker process "
+                "builds its own tool registry"
+            )
+        if workers > 1 and not app_module:
+            raise ValueError(
+                "workers > 1 needs app_module: each worker process rebuilds "
+                'the sidecar from an import path like "examples.server:claude"'
+            )
+        if app_module is not None:
+            _split_import_path(app_module)
+        sidecar_url = _sidecar_url("127.0.0.1", port, uds)
 
         # Register with Go server
         client = WickClient(go_url)
         client.wait_ready()
         self._register(client, sidecar_url)
-        client.close()
+        if not reload:
+            client.close()
 
         logger.info("Sidecar registered with Go server at %s", go_url)
-        print(f"\n  wick sidecar serving at {host}:{port}")
+        print(f"\n  wick sidecar serving at {uds or f'{host}:{port}'}")
         print(f"  registered with Go server at {go_url}\n")
 
         # Run sidecar (blocks)
-        app = build_app(
-            tools=self._all_tool_fns(),
-            llm_providers=self._llm_providers,
-        )
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        bind: dict[str, Any] = {"uds": uds} if uds else {"host": host, "port": port}
+        if app_module:
+            # Each worker imports app_module and builds its own app; the
+            # registration above already covers all of them.
+            os.environ[SIDECAR_APP_ENV] = app_module
+            os.environ[SIDECAR_OPTIONS_ENV] = json.dumps({"stream_coalesce_ms": stream_coalesce_ms})
+            uvicorn.run(
+                "wick._agent:sidecar_app",
+                factory=True, workers=workers, log_level="info", **bind,
+            )
+            return
+        app = _build_sidecar_app([self], stream_coalesce_ms=stream_coalesce_ms)
+        if not reload:
+            uvicorn.run(app, log_level="info", **bind)
+            return
+        reloader = ToolReloader([self], app.state.tool_executor, client, sidecar_url)
+        reloader.start()
+        try:
+            uvicorn.run(app, log_level="info", **bind)
+        finally:
+            reloader.stop()
+            client.close()
 
     # ── Internal ────────────────────────────────────────────────────────
 
@@ -315,48 +441,53 @@ class Agent:
 
         return None
 
+    def _all_tool_defs(self) -> dict[str, _ToolDef]:
+        """Merge builtin + @agent.tool definitions (@agent.tool overrides globals)."""
+        defs: dict[str, _ToolDef] = {}
+        defs.update(self._resolve_builtin_tools())
+        defs.update(self._tools)
+        return defs
+
     def _all_tool_fns(self) -> dict[str, Callable]:
         """Merge builtin + @agent.tool functions for the sidecar."""
-        fns: dict[str, Callable] = {}
-        for name, td in self._resolve_builtin_tools().items():
-            fns[name] = td.fn
-        for name, td in self._tools.items():
-            fns[name] = td.fn  # @agent.tool overrides globals
-        return fns
-
-    def _start_sidecar(self, host: str, port: int, all_agents: list["Agent"] | None = None) -> threading.Thread:
-        """Start the FastAPI sidecar in a background thread."""
-        # Merge tools and LLM providers from all agents
-        agents = all_agents or [self]
-        merged_tools: dict[str, Callable] = {}
-        merged_llm: dict[str, Callable] = {}
-        for a in agents:
-            merged_tools.update(a._all_tool_fns())
-            merged_llm.update(a._llm_providers)
-        app = build_app(
-            tools=merged_tools,
-            llm_providers=merged_llm,
+        return {name: td.fn for name, td in self._all_tool_defs().items()}
+
+    def _all_tool_options(self) -> dict[str, ToolOptions]:
+        """Per-tool executor settings for the sidecar."""
+        return {name: td.options for name, td in self._all_tool_defs().items()}
+
+    def _start_sidecar(
+        self,
+        host: str,
+        port: int,
+        all_agents: list["Agent"] | None = None,
+        stream_coalesce_ms: float = 0,
+        uds: str | None = None,
+    ) -> threading.Thread:
+        """Start the FastAPI sidecar in a background thread and wait until it serves."""
+        server = self._launch_sidecar(host, port, all_agents, stream_coalesce_ms, uds)
+        server.wait_started()
+        return server.thread
+
+    def _launch_sidecar(
+        self,
+        host: str,
+        port: int,
+        all_agents: list["Agent"] | None = None,
+        stream_coalesce_ms: float = 0,
+        uds: str | None = None,
+    ) -> _SidecarServer:
+        """Start the sidecar thread without waiting for it (see wait_started)."""
+        app = _build_sidecar_app(
+            all_agents or [self], stream_coalesce_ms=stream_coalesce_ms,
         )
-        config = uvicorn.Config(app, host=host, port=port, log_level="warning")
-        server = uvicorn.Server(config)
-
-        thread = threading.Thread(target=server.run, daemon=True)
-        thread.start()
-
-        # Wait for sidecar to be ready
-        import time
-        import httpx
-        deadline = time.monotonic() + 10.0
-        while time.monotonic() < deadline:
-            try:
-                resp = httpx.get(f"http://{host}:{port}/health", timeout=1.0)
-                if resp.status_code == 200:
-                    logger.info("Sidecar ready at %s:%d", host, port)
-                    return thread
-            except (httpx.ConnectError, httpx.ReadTimeout):
-                time.sleep(0.2)
-
-        raise TimeoutError(f"Sidecar not ready after 10s at {host}:{port}")
+        if uds:
+            config = uvicorn.Config(app, uds=uds, log_level="warning")
+        else:
+            config = uvicorn.Config(app, host=host, port=port, log_level="warning")
+        server = _SidecarServer(config, where=uds or f"{host}:{port}")
+        server.thread.start()
+        return server
 
     # Tools the Go server registers itself when a backend is configured
     # (see hooks.FilesystemHook in wick_deep_agent). Python has no local
@@ -376,11 +507,15 @@ class Agent:
                 if name not in self._SERVER_SIDE_BUILTINS:
                     logger.warning("builtin_tools: '%s' not found in global tool registry — skipped", name)
                 continue
-            resolved[name] = _ToolDef(td.name, td.description, td.parameters, td.fn)
+            resolved[name] = _ToolDef(td.name, td.description, td.parameters, td.fn, td.options)
         return resolved
 
     def _register(self, client: WickClient, sidecar_url: str | None) -> None:
         """Register the agent and tools with the Go server."""
+        _register_all(client, [(self, sidecar_url)])
+
+    def _registration(self, sidecar_url: str | None) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Registration bodies: (agent payload, tool payloads)."""
         # Build model config
         model_config = self._model
         if self._llm_providers and sidecar_url:
@@ -392,44 +527,45 @@ class Agent:
                 "callback_url": sidecar_url,
             }
 
-        # Register agent
-        agent_config: dict[str, Any] = {
+        agent_payload: dict[str, Any] = {
+            "agent_id": self.agent_id,
             "name": self.name,
             "system_prompt": self.system_prompt,
             "debug": self.debug,
         }
         if model_config:
-            agent_config["model"] = model_config
+            agent_payload["model"] = model_config
         if self._backend:
-            agent_config["backend"] = self._backend
+            agent_payload["backend"] = self._backend
         if self._skills:
-            agent_config["skills"] = self._skills
+            agent_payload["skills"] = self._skills
         if self._memory:
-            agent_config["memory"] = self._memory
+            agent_payload["memory"] = self._memory
         if self._subagents:
-            agent_config["subagents"] = self._subagents
+            agent_payload["subagents"] = self._subagents
         if self.context_window:
-            agent_config["context_window"] = self.context_window
-
-        result = client.register_agent(self.agent_id, agent_config)
-        logger.info("Agent registered: %s", result)
+            agent_payload["context_window"] = self.context_window
 
         # Merge all tools: @agent.tool + builtin_tools from global registry
         all_tools: dict[str, _ToolDef] = {}
         all_tools.update(self._resolve_builtin_tools())
         all_tools.update(self._tools)  # @agent.tool overrides globals if name clashes
 
-        # Register tools as HTTPTools (scoped to this agent)
-        if all_tools and sidecar_url:
-            for td in all_tools.values():
-                result = client.register_tool(
+        # Tools become HTTPTools scoped to this agent
+        tool_payloads: list[dict[str, Any]] = []
+        if sidecar_url:
+            tool_payloads = [
+                tool_payload(
                     name=td.name,
                     description=td.description,
                     parameters=td.parameters,
                     callback_url=sidecar_url,
                     agent_id=self.agent_id,
+                    batch=self._batch_tools,
                 )
-                logger.info("Tool registered: %s", result)
+                for td in all_tools.values()
+            ]
+        return agent_payload, tool_payloads
 
     def _build_agent_config(self) -> dict[str, Any]:
         """Build the full agent config dict for registration."""
@@ -442,9 +578,147 @@ class Agent:
         }
 
 
+def _register_all(client: WickClient, entries: list[tuple[Agent, str | None]]) -> None:
+    """Register agents and their tools with one bulk request.
+
+    `entries` pairs each agent with its sidecar callback URL (None when it
+    has no Python tools or providers).
+    """
+    agent_payloads: list[dict[str, Any]] = []
+    tool_payloads: list[dict[str, Any]] = []
+    for a, sidecar_url in entries:
+        agent_payload, tools = a._registration(sidecar_url)
+        agent_payloads.append(agent_payload)
+        tool_payloads.extend(tools)
+    result = client.register_bulk(agent_payloads, tool_payloads)
+    for item in result.get("agents", []):
+        logger.info("Agent %s: %s", item.get("agent_id"), item.get("status"))
+    for item in result.get("tools", []):
+        logger.info("Tool %s/%s: %s", item.get("agent_id"), item.get("name"), item.get("status"))
+
+
+# ── Sidecar server ──────────────────────────────────────────────────────
+
+# Upper bound on sidecar startup (app build, lifespan, process-pool warm-up).
+SIDECAR_START_TIMEOUT = 40.0
+
+
+class _SidecarServer(uvicorn.Server):
+    """uvicorn server on a daemon thread that says when startup is over.
+
+    Startup "settles" once uvicorn has bound its socket and run the app's
+    lifespan, or once the thread exits because either failed.
+    wait_started() blocks on that instead of polling /health.
+    """
+
+    def __init__(self, config: uvicorn.Config, where: str) -> None:
+        super().__init__(config)
+        self.where = where
+        self.thread = threading.Thread(target=self._run_thread, name="wick-sidecar", daemon=True)
+        self._settled = threading.Event()
+
+    def _run_thread(self) -> None:
+        try:
+            self.run()
+        except SystemExit:
+            pass  # uvicorn's exit on a startup failure, already logged
+        finally:
+            self._settled.set()
+
+    async def startup(self, sockets: Any = None) -> None:
+        await super().startup(sockets)
+        self._settled.set()
+
+    def wait_started(self, timeout: float = SIDECAR_START_TIMEOUT) -> None:
+        if not self._settled.wait(timeout):
+            raise TimeoutError(f"Sidecar not ready after {timeout:g}s at {self.where}")
+        if not self.started:
+            raise RuntimeError(f"Sidecar failed to start at {self.where} (see log above)")
+        logger.info("Sidecar ready at %s", self.where)
+
+
+# ── App factory (multi-worker sidecar) ───────────────────────────────────
+
+# Read by sidecar_app() in each worker process; set by serve_sidecar.
+SIDECAR_APP_ENV = "WICK_SIDECAR_APP"
+SIDECAR_OPTIONS_ENV = "WICK_SIDECAR_OPTIONS"
+
+
+def _split_import_path(path: str) -> tuple[str, str]:
+    module, sep, attr = path.partition(":")
+    if not sep or not module or not attr:
+        raise ValueError(f'app_module must look like "package.module:attribute", got {path!r}')
+    return module, attr
+
+
+def load_agents(path: str) -> list[Agent]:
+    """Import "module:attribute" and return the Agent(s) it names.
+
+    The attribute may be an Agent or a list/tuple of Agents; dotted
+    attributes ("module:registry.agents") are followed.
+    """
+    import importlib
+
+    module_name, attr = _split_import_path(path)
+    target: Any = importlib.import_module(module_name)
+    for part in attr.split("."):
+        try:
+            target = getattr(target, part)
+        except AttributeError:
+            raise ValueError(f"{path!r}: {module_name} has no attribute {attr!r}") from None
+    agents = list(target) if isinstance(target, (list, tuple)) else [target]
+    if not agents or not all(isinstance(a, Agent) for a in agents):
+        raise ValueError(f"{path!r} must name an Agent or a list of Agents")
+    return agents
+
+
+def sidecar_app():
+    """uvicorn app factory: rebuild the sidecar app inside a worker process.
+
+    Reads the agents' import path from WICK_SIDECAR_APP and build_app
+    options (JSON) from WICK_SIDECAR_OPTIONS. Usable directly as well:
+
+        WICK_SIDECAR_APP=examples.server:claude \
+            uvicorn wick._agent:sidecar_app --factory --workers 4 --port 9100
+    """
+    path = os.environ.get(SIDECAR_APP_ENV)
+    if not path:
+        raise RuntimeError(f"{SIDECAR_APP_ENV} is not set (expected \"module:attribute\")")
+    options = json.loads(os.environ.get(SIDECAR_OPTIONS_ENV) or "{}")
+    return _build_sidecar_app(load_agents(path), **options)
+
+
+def _build_sidecar_app(agents: list[Agent], **kwargs: Any):
+    """build_app over the merged tools and LLM providers of `agents`."""
+    merged_tools: dict[str, Callable] = {}
+    merged_options: dict[str, ToolOptions] = {}
+    merged_llm: dict[str, Callable] = {}
+    merged_llm_options: dict[str, ProviderOptions] = {}
+    for a in agents:
+        merged_tools.update(a._all_tool_fns())
+        merged_options.update(a._all_tool_options())
+        merged_llm.update(a._llm_providers)
+        merged_llm_options.update(a._llm_options)
+    return build_app(
+        tools=merged_tools,
+        llm_providers=merged_llm,
+        tool_options=merged_options,
+        llm_options=merged_llm_options,
+        **kwargs,
+    )
+
+
+def _sidecar_url(host: str, port: int, uds: str | None) -> str:
+    """Callback URL Go uses to reach the sidecar (see llm/callback.go)."""
+    if uds:
+        return f"unix://{os.path.abspath(uds)}"
+    return f"http://{host}:{port}"
+
+
 def _infer_parameters(fn: Callable) -> dict[str, Any]:
     """Infer JSON Schema parameters from function type hints."""
     sig = inspect.signature(fn)
+    token_param = cancellation_param(fn)  # injected by the sidecar, not the LLM
     properties: dict[str, Any] = {}
     required: list[str] = []
 
@@ -456,6 +730,8 @@ def _infer_parameters(fn: Callable) -> dict[str, Any]:
     }
 
     for name, param in sig.parameters.items():
+        if name == token_param:
+            continue
         annotation = param.annotation
         json_type = type_map.get(annotation, "string")
         properties[name] = {"type": json_type}
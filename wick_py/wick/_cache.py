@@ -0,0 +1,78 @@
+"""Result cache for deterministic sidecar tools.
+
+Enabled per tool with @tool(cache_ttl=..., cache_max_entries=...). Entries
+are keyed by the canonical JSON of the call's args (sorted keys, no
+whitespace), so {"a": 1, "b": 2} and {"b": 2, "a": 1} share an entry.
+Only successful results are cached; a tool that raises is re-run on the
+next call.
+
+The cache is touched only from the sidecar's event loop, so it needs no
+lock.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Entry cap when a tool sets cache_ttl but no cache_max_entries.
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+
+# Returned by ToolCache.get on a miss (None is a valid cached result).
+MISSING = object()
+
+
+def cache_key(args: dict[str, Any]) -> str:
+    """Canonical JSON for a call's args."""
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolCache:
+    """TTL + LRU cache of one tool's results.
+
+    An entry expires ttl seconds after it was stored; when the cache is
+    full, the least recently used entry is evicted.
+    """
+
+    __slots__ = ("ttl", "max_entries", "hits", "misses", "_entries")
+
+    def __init__(self, ttl: float, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key → (expires_at, value), oldest use first
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or MISSING. Counts the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        self.misses += 1
+        return MISSING
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+        }
+
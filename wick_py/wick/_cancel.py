@@ -0,0 +1,80 @@
+"""Cooperative cancellation for sidecar tools.
+
+When Go gives up on a tool call (turn cancelled, HITL reject, user abort)
+the sidecar cancels the call's task. An async tool sees CancelledError at
+its next await. A sync tool running on a thread can't be interrupted, so it
+may ask for a token instead — any parameter annotated CancellationToken is
+filled in by the sidecar and left out of the tool's JSON schema:
+
+    @agent.tool(description="Crawl a site")
+    def crawl(url: str, cancel: CancellationToken) -> str:
+        for page in pages(url):
+            cancel.raise_if_cancelled()
+            ...
+
+The token is set once no caller is waiting for the result any more. With
+coalesce/cache_ttl that is when the last caller sharing the run has gone.
+executor="process" tools can't take a token.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+from collections.abc import Callable
+
+
+class ToolCancelled(Exception):
+    """Raised by CancellationToken.raise_if_cancelled()."""
+
+
+class CancellationToken:
+    """Set when the caller of a running tool call has gone away."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until cancelled or `timeout` passes; True if cancelled.
+
+        A cancellable replacement for time.sleep() in polling loops.
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ToolCancelled("tool call cancelled by the caller")
+
+
+def _is_token_annotation(annotation: object) -> bool:
+    if annotation is CancellationToken:
+        return True
+    if isinstance(annotation, str):
+        # Postponed annotations ("CancellationToken", "wick.CancellationToken",
+        # "CancellationToken | None").
+        return any(
+            part.strip().rsplit(".", 1)[-1] == "CancellationToken"
+            for part in annotation.split("|")
+        )
+    return CancellationToken in getattr(annotation, "__args__", ())  # Optional[...]
+
+
+def cancellation_param(fn: Callable) -> str | None:
+    """Name of fn's CancellationToken parameter, or None."""
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return None
+    for name, param in params.items():
+        if _is_token_annotation(param.annotation):
+            return name
+    return None
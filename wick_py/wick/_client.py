@@ -1,18 +1,120 @@
-"""HTTP client for the Go wick_server API.
+"""HTTP clients for the Go wick_server API.
 
-Handles agent and tool registration with the Go server.
+Handle agent and tool registration with the Go server, and running agents
+(invoke, stream). WickClient is synchronous; AsyncWickClient mirrors it for
+asyncio applications, on one pooled httpx.AsyncClient with retries.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
 
+from ._sse import SSEParser
+from ._wire import loads
+
 logger = logging.getLogger("wick.client")
 
+# Backoff bounds (seconds) for wait_ready's health probes.
+READY_POLL_MIN = 0.05
+READY_POLL_MAX = 1.0
+
+# Concurrent single-item requests when the server has no bulk endpoint.
+REGISTER_FALLBACK_WORKERS = 8
+
+# AsyncWickClient defaults. Retries cover connect errors and 5xx responses;
+# the n-th retry sleeps a random time in [0, min(RETRY_BACKOFF_MAX,
+# RETRY_BACKOFF_BASE * 2**n)] ("full jitter"), so many clients retrying
+# against a restarting server don't arrive in lockstep.
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.1
+RETRY_BACKOFF_MAX = 2.0
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0,
+)
+
+# Agent runs (invoke, stream) can go quiet for minutes while tools run or a
+# human approves a call, so only connecting and writing are bounded.
+RUN_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT, read=None)
+
+
+def tool_payload(
+    name: str,
+    description: str,
+    parameters: dict[str, Any],
+    callback_url: str,
+    agent_id: str | None = None,
+    batch: bool = False,
+) -> dict[str, Any]:
+    """Body of POST /agents/tools/register (and of a bulk "tools" entry)."""
+    payload: dict[str, Any] = {
+        "name": name,
+        "description": description,
+        "parameters": parameters,
+        "callback_url": callback_url,
+    }
+    if agent_id:
+        payload["agent_id"] = agent_id
+    if batch:
+        payload["batch"] = True
+    return payload
+
+
+class AgentEvent:
+    """One event of an agent stream (POST /agents/{id}/stream).
+
+    Contract: handlers.go stream. `event` is the SSE event name
+    ("on_chat_model_stream", "on_tool_start", ..., "done", "error");
+    `name`, `run_id`, `task_id` and `data` are the payload's fields where
+    it has them. `payload` is the whole decoded JSON — for "done" that is
+    {trace_id, thread_id, total_duration_ms}, for "error" whatever the
+    agent reported.
+    """
+
+    __slots__ = ("event", "name", "run_id", "task_id", "data", "payload")
+
+    def __init__(self, event: str, payload: Any) -> None:
+        self.event = event
+        self.payload = payload
+        if isinstance(payload, dict):
+            self.name = payload.get("name", "")
+            self.run_id = payload.get("run_id")
+            self.task_id = payload.get("task_id")
+            self.data = payload.get("data")
+        else:
+            self.name = ""
+            self.run_id = self.task_id = None
+            self.data = payload
+
+    @property
+    def text(self) -> str:
+        """The text delta of an on_chat_model_stream event ("" otherwise)."""
+        if self.event != "on_chat_model_stream" or not isinstance(self.data, dict):
+            return ""
+        chunk = self.data.get("chunk")
+        return chunk.get("content") or "" if isinstance(chunk, dict) else ""
+
+    def __repr__(self) -> str:
+        return f"AgentEvent({self.event!r}, {self.payload!r})"
+
+
+def _run_body(messages: str | list[dict[str, Any]], thread_id: str | None) -> dict[str, Any]:
+    """Body of POST /agents/{id}/invoke and /stream. A str is one user message."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    body: dict[str, Any] = {"messages": messages}
+    if thread_id is not None:
+        body["thread_id"] = thread_id
+    return body
+
 
 class WickClient:
     """Client for the Go wick_server HTTP API."""
@@ -28,15 +130,26 @@ class WickClient:
         return resp.json()
 
     def wait_ready(self, timeout: float = 15.0) -> None:
-        """Poll health endpoint until the server is ready."""
+        """Poll the health endpoint until the server is ready.
+
+        For a Go server this process didn't start (serve_sidecar); GoRuntime
+        waits for the binary's ready line instead. Probes reuse this
+        client's connection pool and back off from 50 ms to 1 s, so a server
+        that is already up answers on the first try.
+        """
         deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
+        delay = READY_POLL_MIN
+        while True:
             try:
                 self.health()
                 return
             except (httpx.ConnectError, httpx.ReadTimeout):
-                time.sleep(0.3)
-        raise TimeoutError(f"Go server not ready after {timeout}s")
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Go server not ready after {timeout}s")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_POLL_MAX)
 
     def register_agent(self, agent_id: str, config: dict[str, Any]) -> dict[str, Any]:
         """POST /agents/ — create or update an agent.
@@ -45,10 +158,7 @@ class WickClient:
         Body: {agent_id, name, model, system_prompt, tools, middleware,
                subagents, backend, skills, memory, debug, context_window}
         """
-        payload = {"agent_id": agent_id, **config}
-        resp = self._http.post(f"{self._base}/agents/", json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return self._post_agent({"agent_id": agent_id, **config})
 
     def register_tool(
         self,
@@ -57,30 +167,335 @@ class WickClient:
         parameters: dict[str, Any],
         callback_url: str,
         agent_id: str | None = None,
+        batch: bool = False,
     ) -> dict[str, Any]:
         """POST /agents/tools/register — register an external HTTP tool.
 
+        With batch=True the Go server coalesces concurrent calls to the same
+        callback_url into one POST {callback_url}/tools/_batch round-trip.
+
         Contract: handlers.go registerTool
-        Body: {name, description, parameters, callback_url, agent_id?}
+        Body: {name, description, parameters, callback_url, agent_id?, batch?}
         Response: {status: "registered", name: str, agent_id: str}
         """
-        payload: dict[str, Any] = {
-            "name": name,
-            "description": description,
-            "parameters": parameters,
-            "callback_url": callback_url,
-        }
-        if agent_id:
-            payload["agent_id"] = agent_id
+        payload = tool_payload(name, description, parameters, callback_url, agent_id, batch)
+        return self._post_tool(payload)
+
+    def register_bulk(
+        self,
+        agents: list[dict[str, Any]] | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """POST /agents/register — register agents and tools in one request.
+
+        `agents` are register_agent bodies (including agent_id), `tools` are
+        tool_payload() bodies. The server skips entries whose content hash
+        matches what it already holds, so re-registering after a restart
+        costs one round-trip and rebuilds nothing that didn't change.
+
+        Against a server without the bulk endpoint (404/405) this falls back
+        to the single-item endpoints, issued concurrently: all agents, then
+        all tools.
+
+        Contract: registration.go registerBulk
+        Body: {agents: [...], tools: [...]}
+        Response: {agents: [{agent_id, status}], tools: [{name, agent_id, status}]}
+            status: "created" | "registered" | "unchanged"
+        """
+        agents = agents or []
+        tools = tools or []
+        resp = self._http.post(
+            f"{self._base}/agents/register", json={"agents": agents, "tools": tools},
+        )
+        if resp.status_code not in (404, 405):
+            resp.raise_for_status()
+            return resp.json()
+
+        logger.info("Bulk registration not supported by %s; registering one by one", self._base)
+        with ThreadPoolExecutor(
+            max_workers=REGISTER_FALLBACK_WORKERS, thread_name_prefix="wick-register",
+        ) as pool:
+            # Agents go first: an agent-scoped tool needs its agent to exist.
+            list(pool.map(self._post_agent, agents))
+            list(pool.map(self._post_tool, tools))
+        return _fallback_result(agents, tools)
+
+    def _post_agent(self, payload: dict[str, Any]) -> dict[str, Any]:
+        resp = self._http.post(f"{self._base}/agents/", json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _post_tool(self, payload: dict[str, Any]) -> dict[str, Any]:
         resp = self._http.post(f"{self._base}/agents/tools/register", json=payload)
         resp.raise_for_status()
         return resp.json()
 
-    def deregister_tool(self, name: str) -> dict[str, Any]:
-        """DELETE /agents/tools/deregister/{name}"""
-        resp = self._http.delete(f"{self._base}/agents/tools/deregister/{name}")
+    def deregister_tool(self, name: str, agent_id: str | None = None) -> dict[str, Any]:
+        """DELETE /agents/tools/deregister/{name}?agent_id= — agent_id selects
+        an agent-scoped tool; omitted, the global one."""
+        params = {"agent_id": agent_id} if agent_id else None
+        resp = self._http.delete(f"{self._base}/agents/tools/deregister/{name}", params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    def invoke(
+        self,
+        agent_id: str,
+        messages: str | list[dict[str, Any]],
+        thread_id: str | None = None,
+    ) -> dict[str, Any]:
+        """POST /agents/{agent_id}/invoke — run the agent to completion.
+
+        Contract: handlers.go invoke
+        Body: {messages: [{role, content}], thread_id?}
+        Response: {trace_id, thread_id, response, todos, files, ...}
+        """
+        resp = self._http.post(
+            f"{self._base}/agents/{agent_id}/invoke",
+            json=_run_body(messages, thread_id), timeout=RUN_TIMEOUT,
+        )
         resp.raise_for_status()
         return resp.json()
 
+    def stream(
+        self,
+        agent_id: str,
+        messages: str | list[dict[str, Any]],
+        thread_id: str | None = None,
+    ) -> Iterator[AgentEvent]:
+        """POST /agents/{agent_id}/stream — yield the run's events as they come.
+
+        `messages` is a list of {role, content} ("user" or "system") or a
+        single user message. The last event is "done" or "error". Closing
+        the generator early closes the connection, which cancels the run.
+        """
+        with self._http.stream(
+            "POST", f"{self._base}/agents/{agent_id}/stream",
+            json=_run_body(messages, thread_id), timeout=RUN_TIMEOUT,
+        ) as resp:
+            if resp.is_error:
+                resp.read()
+                resp.raise_for_status()
+            parser = SSEParser()
+            for chunk in resp.iter_raw():
+                for event, data in parser.feed(chunk):
+                    yield AgentEvent(event, loads(data))
+
     def close(self) -> None:
         self._http.close()
+
+
+def _fallback_result(agents: list[dict[str, Any]], tools: list[dict[str, Any]]) -> dict[str, Any]:
+    """register_bulk's response, for entries registered one by one."""
+    return {
+        "agents": [{"agent_id": a["agent_id"], "status": "created"} for a in agents],
+        "tools": [
+            {"name": t["name"], "agent_id": t.get("agent_id", ""), "status": "registered"}
+            for t in tools
+        ],
+    }
+
+
+def _retry_delay(retry: int, base: float, cap: float) -> float:
+    return random.uniform(0, min(cap, base * 2 ** retry))
+
+
+class AsyncWickClient:
+    """Async client for the Go wick_server HTTP API.
+
+    Same methods as WickClient, as coroutines. All calls share one
+    httpx.AsyncClient, so connections are kept alive and reused up to
+    `limits`. Use it as an async context manager, or call aclose().
+
+    Args:
+        base_url: Go server URL.
+        timeout: per-request timeout in seconds.
+        limits: connection pool size and keep-alive expiry.
+        retries: extra attempts after a connect error or a 5xx response
+            (0 = none). invoke and stream are retried on connect errors
+            only. Other errors and 4xx responses are raised at once.
+        backoff_base: first retry's maximum delay in seconds; doubles per
+            retry up to backoff_max, and each delay is drawn uniformly
+            below that bound.
+        backoff_max: upper bound on a single retry delay.
+        transport: custom httpx transport (e.g. a Unix socket, or a mock in
+            tests).
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_POOL_LIMITS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_max: float = RETRY_BACKOFF_MAX,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if retries < 0:
+            raise ValueError(f"retries must be >= 0, got {retries}")
+        if backoff_base <= 0 or backoff_max < backoff_base:
+            raise ValueError(
+                f"need 0 < backoff_base <= backoff_max, got {backoff_base} and {backoff_max}"
+            )
+        self._base = base_url.rstrip("/")
+        self._retries = retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._http = httpx.AsyncClient(timeout=timeout, limits=limits, transport=transport)
+
+    async def __aenter__(self) -> AsyncWickClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: bool = True,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send with retries on connect errors, and on 5xx for idempotent
+        calls; returns the last response (unread if `stream`)."""
+        request = self._http.build_request(method, f"{self._base}{path}", **kwargs)
+        retry = 0
+        while True:
+            try:
+                resp = await self._http.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing reached the server, so any call is safe to resend.
+                if retry == self._retries:
+                    raise
+                logger.debug("%s %s: %s; retrying", method, request.url, e)
+            else:
+                # Registration and health calls can be resent after a 5xx;
+                # an agent run may already have done work.
+                if resp.status_code < 500 or not idempotent or retry == self._retries:
+                    return resp
+                await resp.aclose()
+                logger.debug("%s %s: HTTP %d; retrying", method, request.url, resp.status_code)
+            await asyncio.sleep(_retry_delay(retry, self._backoff_base, self._backoff_max))
+            retry += 1
+
+    async def _call(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        resp = await self._request(method, path, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def health(self) -> dict[str, Any]:
+        """GET /health"""
+        return await self._call("GET", "/health")
+
+    async def wait_ready(self, timeout: float = 15.0) -> None:
+        """Poll the health endpoint until the server is ready (see WickClient)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = READY_POLL_MIN
+        while True:
+            try:
+                resp = await self._http.get(f"{self._base}/health")
+                resp.raise_for_status()
+                return
+            except (httpx.ConnectError, httpx.ReadTimeout):
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"Go server not ready after {timeout}s")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_POLL_MAX)
+
+    async def register_agent(self, agent_id: str, config: dict[str, Any]) -> dict[str, Any]:
+        """POST /agents/ — see WickClient.register_agent."""
+        return await self._call("POST", "/agents/", json={"agent_id": agent_id, **config})
+
+    async def register_tool(
+        self,
+        name: str,
+        description: str,
+        parameters: dict[str, Any],
+        callback_url: str,
+        agent_id: str | None = None,
+        batch: bool = False,
+    ) -> dict[str, Any]:
+        """POST /agents/tools/register — see WickClient.register_tool."""
+        payload = tool_payload(name, description, parameters, callback_url, agent_id, batch)
+        return await self._call("POST", "/agents/tools/register", json=payload)
+
+    async def register_bulk(
+        self,
+        agents: list[dict[str, Any]] | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """POST /agents/register — see WickClient.register_bulk.
+
+        The fallback for servers without the bulk endpoint sends the
+        single-item requests concurrently, bounded by the pool limits.
+        """
+        agents = agents or []
+        tools = tools or []
+        resp = await self._request(
+            "POST", "/agents/register", json={"agents": agents, "tools": tools},
+        )
+        if resp.status_code not in (404, 405):
+            resp.raise_for_status()
+            return resp.json()
+
+        logger.info("Bulk registration not supported by %s; registering one by one", self._base)
+        # Agents go first: an agent-scoped tool needs its agent to exist.
+        await asyncio.gather(*(self._call("POST", "/agents/", json=a) for a in agents))
+        await asyncio.gather(*(
+            self._call("POST", "/agents/tools/register", json=t) for t in tools
+        ))
+        return _fallback_result(agents, tools)
+
+    async def deregister_tool(self, name: str, agent_id: str | None = None) -> dict[str, Any]:
+        """DELETE /agents/tools/deregister/{name} — see WickClient.deregister_tool."""
+        params = {"agent_id": agent_id} if agent_id else None
+        return await self._call("DELETE", f"/agents/tools/deregister/{name}", params=params)
+
+    async def invoke(
+        self,
+        agent_id: str,
+        messages: str | list[dict[str, Any]],
+        thread_id: str | None = None,
+    ) -> dict[str, Any]:
+        """POST /agents/{agent_id}/invoke — see WickClient.invoke."""
+        return await self._call(
+            "POST", f"/agents/{agent_id}/invoke",
+            idempotent=False, json=_run_body(messages, thread_id), timeout=RUN_TIMEOUT,
+        )
+
+    async def stream(
+        self,
+        agent_id: str,
+        messages: str | list[dict[str, Any]],
+        thread_id: str | None = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """POST /agents/{agent_id}/stream — see WickClient.stream.
+
+        Each open stream holds one pooled connection: size
+        limits.max_connections for the number of concurrent streams.
+        """
+        resp = await self._request(
+            "POST", f"/agents/{agent_id}/stream",
+            idempotent=False, stream=True,
+            json=_run_body(messages, thread_id), timeout=RUN_TIMEOUT,
+        )
+        try:
+            if resp.is_error:
+                await resp.aread()
+                resp.raise_for_status()
+            parser = SSEParser()
+            async for chunk in resp.aiter_raw():
+                for event, data in parser.feed(chunk):
+                    yield AgentEvent(event, loads(data))
+        finally:
+            await resp.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
@@ -0,0 +1,528 @@
+"""Per-tool execution lanes for the sidecar.
+
+Every tool gets a lane that enforces its ToolOptions:
+  - an optional result cache (cache_ttl) consulted before anything else,
+  - optional single-flight (coalesce) so identical concurrent calls share
+    one execution,
+  - a semaphore capping concurrent calls (max_concurrency),
+  - the pool its sync function runs on (shared, dedicated, inline, or the
+    worker-process pool),
+  - a CancellationToken, for tools that declare one, set when the call's
+    task is cancelled.
+
+Sync tools never touch the event loop's default executor, so a burst of
+slow tool calls can't starve the threads asyncio itself relies on (DNS
+lookups, other to_thread users). Lanes count in-flight and queued calls
+for the sidecar's stats endpoint.
+
+Process pool settings are sidecar-wide and default from the environment:
+  WICK_PROCESS_WORKERS    worker count (default: cpu_count)
+  WICK_PROCESS_MAX_CALLS  calls per worker before the pool is replaced
+                          (default: 500; 0 disables recycling)
+  WICK_PROCESS_MEMORY_MB  address-space cap per worker (default: none;
+                          Unix only)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import multiprocessing
+import os
+import pickle
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from ._cache import DEFAULT_CACHE_MAX_ENTRIES, MISSING, ToolCache, cache_key
+from ._cancel import CancellationToken, cancellation_param
+from ._tools import ToolOptions
+
+logger = logging.getLogger("wick.sidecar")
+
+# Thread count for a dedicated pool when the tool sets no max_concurrency.
+DEFAULT_DEDICATED_WORKERS = 4
+
+# Calls a worker process serves before it is replaced.
+DEFAULT_PROCESS_MAX_CALLS = 500
+
+# Upper bound on how long sidecar startup waits for worker processes to spawn.
+DEFAULT_WARM_TIMEOUT = 30.0
+
+
+def default_shared_workers() -> int:
+    """Shared tool pool size — same formula as ThreadPoolExecutor's default."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+# ── Worker-process side ─────────────────────────────────────────────────
+# Module-level so they pickle by reference into spawned workers.
+
+
+def _init_worker(memory_mb: int | None) -> None:
+    """Process pool initializer: apply the per-worker memory cap."""
+    if not memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _call_in_worker(fn: Callable, args: dict[str, Any]) -> Any:
+    return fn(**args)
+
+
+def _noop() -> None:
+    return None
+
+
+def _notify_when_done(fut: Future, callback: Callable[[], None]) -> None:
+    """Run callback on the current event loop once a pool future completes."""
+    loop = asyncio.get_running_loop()
+
+    def done(_: Future) -> None:
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:  # loop already closed during shutdown
+            pass
+
+    fut.add_done_callback(done)
+
+
+class ProcessPool:
+    """Warm, self-healing ProcessPoolExecutor for executor="process" tools.
+
+    Workers are spawned (never forked — the sidecar runs threads). After
+    max_calls calls per worker on average, the pool is swapped for a fresh
+    one so leaks in CPU-heavy libraries can't accumulate; calls already
+    submitted finish on the old workers. (ProcessPoolExecutor's own
+    max_tasks_per_child can deadlock on CPython < 3.12.4, so it isn't used.)
+    A pool broken by a crashed or OOM-killed worker is rebuilt on the next
+    call.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_calls: int | None = None,
+        memory_mb: int | None = None,
+    ) -> None:
+        self.workers = workers or _env_int("WICK_PROCESS_WORKERS") or os.cpu_count() or 1
+        env_max_calls = _env_int("WICK_PROCESS_MAX_CALLS")
+        self.max_calls = (
+            max_calls if max_calls is not None else
+            env_max_calls if env_max_calls is not None else
+            DEFAULT_PROCESS_MAX_CALLS
+        )
+        self.memory_mb = memory_mb or _env_int("WICK_PROCESS_MEMORY_MB")
+        self._calls = 0
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.memory_mb,),
+        )
+
+    def _checkout(self) -> ProcessPoolExecutor:
+        """Pool for the next call, recycling it once its call budget is spent."""
+        if self.max_calls:
+            self._calls += 1
+            if self._calls > self.max_calls * self.workers:
+                self.recycle()
+                self._calls = 1
+                logger.info("process pool: recycled workers after %d calls each", self.max_calls)
+        return self._pool
+
+    def recycle(self) -> None:
+        """Swap in fresh workers; calls already submitted finish on the old ones.
+
+        Fresh workers re-import tool modules, so this is also how reloaded
+        tool code reaches the pool.
+        """
+        old = self._pool
+        self._pool = self._new_pool()
+        self._calls = 0
+        old.shutdown(wait=False)
+
+    async def warm(self, timeout: float = DEFAULT_WARM_TIMEOUT) -> None:
+        """Start every worker now so the first real call doesn't pay spawn cost.
+
+        Bounded by `timeout`: if workers are slow to spawn (heavy imports in
+        the tool modules), startup continues and the rest warm up lazily.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        logger.info("process pool: warming %d workers", self.workers)
+        warming = asyncio.gather(*(
+            loop.run_in_executor(self._pool, _noop) for _ in range(self.workers)
+        ))
+        try:
+            await asyncio.wait_for(asyncio.shield(warming), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "process pool: workers not warm after %.1fs — continuing startup", timeout,
+            )
+            return
+        logger.info(
+            "process pool: %d workers warm in %.2fs", self.workers, loop.time() - started,
+        )
+
+    async def call(
+        self,
+        name: str,
+        fn: Callable,
+        args: dict[str, Any],
+        on_done: Callable[[], None],
+    ) -> Any:
+        """Run fn in a worker. on_done fires once the worker is really done
+        with the call, even if the awaiting task is cancelled earlier."""
+        pool = self._checkout()
+        try:
+            fut = pool.submit(_call_in_worker, fn, args)
+        except BrokenProcessPool:
+            on_done()
+            raise self._broken(name, pool) from None
+        _notify_when_done(fut, on_done)
+        try:
+            return await asyncio.wrap_future(fut)
+        except BrokenProcessPool:
+            raise self._broken(name, pool) from None
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            # Args are pickled by the pool's feeder thread and results by the
+            # worker; both surface here. Anything else is the tool's own error.
+            if isinstance(e, pickle.PicklingError) or "pickle" in str(e).lower():
+                raise TypeError(f"tool {name}: arguments or result not picklable: {e}") from None
+            raise
+
+    def _broken(self, name: str, pool: ProcessPoolExecutor) -> RuntimeError:
+        """Replace a broken pool (once) and build the error for the caller."""
+        if self._pool is pool:
+            logger.error("process pool broken (worker crashed or hit its memory cap) — rebuilding")
+            self._pool = self._new_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        cause = f" (crash or {self.memory_mb} MB memory cap)" if self.memory_mb else ""
+        return RuntimeError(f"tool {name}: worker process died{cause}")
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Shares one execution among identical concurrent calls.
+
+    The first caller for a key starts the work as its own task; callers
+    arriving while it runs await the same task. A caller that is cancelled
+    only stops waiting — the work is cancelled once no caller is left.
+    Errors are shared too: every waiter of a failed flight sees the error.
+    """
+
+    __slots__ = ("_flights", "coalesced")
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(run()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class _ToolLane:
+    """Concurrency gate and executor for a single tool."""
+
+    __slots__ = (
+        "name", "fn", "options", "is_async", "executor", "process_pool",
+        "semaphore", "in_flight", "queued", "cache", "flights", "cancel_param",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        options: ToolOptions,
+        executor: Executor | None,
+        process_pool: ProcessPool | None = None,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.options = options
+        self.is_async = inspect.iscoroutinefunction(fn)
+        self.executor = executor
+        self.process_pool = process_pool
+        self.semaphore = (
+            asyncio.Semaphore(options.max_concurrency)
+            if options.max_concurrency else None
+        )
+        self.in_flight = 0
+        self.queued = 0
+        self.cache = (
+            ToolCache(options.cache_ttl, options.cache_max_entries or DEFAULT_CACHE_MAX_ENTRIES)
+            if options.cache_ttl else None
+        )
+        self.flights = SingleFlight() if options.coalesce else None
+        self.cancel_param = cancellation_param(fn)
+
+    async def call(self, args: dict[str, Any]) -> Any:
+        if self.cache is None and self.flights is None:
+            return await self._run(args)
+
+        # Cache hits skip the queue and the pool entirely; misses for the
+        # same args arriving together share one run.
+        key = cache_key(args)
+        if self.cache is not None:
+            value = self.cache.get(key)
+            if value is not MISSING:
+                return value
+        if self.flights is not None:
+            value = await self.flights.do(key, lambda: self._run(args))
+        else:
+            value = await self._run(args)
+        if self.cache is not None:
+            self.cache.put(key, value)
+        return value
+
+    async def _run(self, args: dict[str, Any]) -> Any:
+        if self.cancel_param is None:
+            return await self._run_gated(args)
+        token = CancellationToken()
+        try:
+            return await self._run_gated({**args, self.cancel_param: token})
+        except asyncio.CancelledError:
+            # Nobody is waiting any more; a thread-pool tool keeps running
+            # until it checks the token.
+            token.cancel()
+            raise
+
+    async def _run_gated(self, args: dict[str, Any]) -> Any:
+        if self.semaphore is not None:
+            self.queued += 1
+            try:
+                await self.semaphore.acquire()
+            finally:
+                self.queued -= 1
+        self.in_flight += 1
+
+        if self.is_async or (self.executor is None and self.process_pool is None):
+            try:
+                if self.is_async:
+                    return await self.fn(**args)
+                return self.fn(**args)
+            finally:
+                self._release()
+
+        # Pooled calls keep their permit until the pool finishes the work, not
+        # until the awaiting task returns: a cancelled caller (e.g. a dropped
+        # batch stream) must not let a new call start on top of a thread or
+        # worker that is still busy.
+        if self.process_pool is not None:
+            return await self.process_pool.call(self.name, self.fn, args, on_done=self._release)
+        ctx = contextvars.copy_context()
+        try:
+            fut = self.executor.submit(ctx.run, self.fn, **args)
+        except BaseException:
+            self._release()
+            raise
+        _notify_when_done(fut, self._release)
+        return await asyncio.wrap_future(fut)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "executor": "async" if self.is_async else self.options.executor,
+            "max_concurrency": self.options.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+        }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.flights is not None:
+            stats["coalesced"] = self.flights.coalesced
+        return stats
+
+
+class ToolExecutor:
+    """Routes sidecar tool calls to per-tool lanes.
+
+    Args:
+        tools: mapping of tool name to Python callable.
+        options: per-tool ToolOptions; tools missing here use the defaults.
+        shared_workers: size of the shared tool thread pool.
+        process_pool: pool for executor="process" tools; created on demand
+            from the WICK_PROCESS_* environment when omitted.
+    """
+
+    def __init__(
+        self,
+        tools: dict[str, Callable],
+        options: dict[str, ToolOptions] | None = None,
+        shared_workers: int | None = None,
+        process_pool: ProcessPool | None = None,
+    ) -> None:
+        options = options or {}
+        self._shared = ThreadPoolExecutor(
+            max_workers=shared_workers or default_shared_workers(),
+            thread_name_prefix="wick-tool",
+        )
+        self._dedicated: dict[str, ThreadPoolExecutor] = {}
+        self._given_process_pool = process_pool
+        self._process_pool: ProcessPool | None = None
+        self._lanes: dict[str, _ToolLane] = {}
+        # The sidecar's event loop, once started. Lanes hold asyncio
+        # primitives, so replace/remove must run on it.
+        self.loop: asyncio.AbstractEventLoop | None = None
+        for name, fn in tools.items():
+            self._lanes[name] = self._new_lane(name, fn, options.get(name) or ToolOptions())
+
+    def _new_lane(self, name: str, fn: Callable, opts: ToolOptions) -> _ToolLane:
+        if opts.executor == "inline" and opts.max_concurrency and not inspect.iscoroutinefunction(fn):
+            # An inline sync tool blocks the event loop while it runs, so a
+            # concurrency limit can never take effect.
+            raise ValueError(
+                f'tool {name}: executor="inline" with max_concurrency has no effect '
+                f"on a sync function — use \"dedicated\" to bound it"
+            )
+        pool = None
+        if opts.executor == "process":
+            _check_process_tool(name, fn)
+            if self._process_pool is None:
+                self._process_pool = self._given_process_pool or ProcessPool()
+            pool = self._process_pool
+        return _ToolLane(name, fn, opts, self._executor_for(name, opts), pool)
+
+    def _executor_for(self, name: str, opts: ToolOptions) -> Executor | None:
+        if opts.executor in ("inline", "process"):
+            return None
+        if opts.executor == "dedicated":
+            pool = ThreadPoolExecutor(
+                max_workers=opts.max_concurrency or DEFAULT_DEDICATED_WORKERS,
+                thread_name_prefix=f"wick-tool-{name}",
+            )
+            self._dedicated[name] = pool
+            return pool
+        return self._shared
+
+    async def start(self) -> None:
+        """Warm the worker-process pool, if any tool uses it."""
+        self.loop = asyncio.get_running_loop()
+        if self._process_pool is not None:
+            await self._process_pool.warm()
+
+    def has(self, name: str) -> bool:
+        return name in self._lanes
+
+    # Hot reload (see _reload.py). Call on the sidecar's event loop. Calls
+    # already running keep the old lane — and its pool — until they finish;
+    # new calls go to the new one. Replacing a tool drops its cache.
+
+    def replace(self, name: str, fn: Callable, options: ToolOptions | None = None) -> None:
+        """Add a tool, or swap in new code/options for an existing one.
+
+        Raises ValueError (leaving the old lane in place) for options the
+        constructor would reject.
+        """
+        old_pool = self._dedicated.pop(name, None)
+        try:
+            lane = self._new_lane(name, fn, options or ToolOptions())
+        except BaseException:
+            if old_pool is not None:
+                self._dedicated[name] = old_pool
+            raise
+        old = self._lanes.get(name)
+        self._lanes[name] = lane
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+        if old is not None and lane.process_pool is not None:
+            # Workers imported the old module; only fresh ones see the new code.
+            lane.process_pool.recycle()
+
+    def remove(self, name: str) -> None:
+        """Drop a tool; later calls get "unknown tool"."""
+        self._lanes.pop(name, None)
+        pool = self._dedicated.pop(name, None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    async def run(self, name: str, args: dict[str, Any]) -> Any:
+        """Run a tool under its lane. Raises KeyError for unknown tools."""
+        return await self._lanes[name].call(args)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-tool executor kind, limit, in-flight and queued counts, plus
+        cache and single-flight counters where enabled."""
+        return {name: lane.stats() for name, lane in self._lanes.items()}
+
+    def shutdown(self) -> None:
+        """Stop all pools without waiting for running calls."""
+        self._shared.shutdown(wait=False, cancel_futures=True)
+        for pool in self._dedicated.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+
+
+def _check_process_tool(name: str, fn: Callable) -> None:
+    """Fail at startup, not per call, for tools that can't cross a process boundary."""
+    if inspect.iscoroutinefunction(fn):
+        raise ValueError(f'tool {name}: executor="process" requires a sync function')
+    if getattr(fn, "__module__", None) == "__main__":
+        # Spawned workers re-import __main__; an unguarded agent script would
+        # re-run Agent.run() in every worker.
+        raise ValueError(
+            f'tool {name}: executor="process" tools must live in an importable '
+            f"module, not the __main__ script"
+        )
+    if cancellation_param(fn) is not None:
+        raise ValueError(
+            f'tool {name}: executor="process" tools can\'t take a CancellationToken '
+            f"(it can't cross the process boundary)"
+        )
+    try:
+        pickle.dumps(fn)
+    except Exception as e:
+        raise ValueError(
+            f'tool {name}: executor="process" requires a module-level function '
+            f"(closures, lambdas and bound methods can't be pickled): {e}"
+        ) from e
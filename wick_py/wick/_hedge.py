@@ -0,0 +1,285 @@
+"""Hedged, retried upstream streams for LLM providers.
+
+One slow upstream turn (many seconds before the first byte) dominates p99
+agent latency. hedged_stream() wraps a provider's stream:
+
+    _policy = HedgePolicy()
+
+    @agent.llm_provider("my-model")
+    async def my_llm(request: LLMRequest):
+        async with aclosing(hedged_stream(lambda: _stream(request), _policy)) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+If the first item has not arrived by the hedge deadline (a percentile of
+recent time-to-first-item, learned per policy), an identical second
+attempt is started. The first attempt to yield an item wins and the other
+is cancelled, which closes its upstream stream. Attempts that fail before
+their first item with a connect error or a 429/5xx response are retried
+with jittered backoff. Hedges and retries both draw on a budget refilled
+by a fraction of requests, so a struggling upstream is never sent a
+multiple of its normal load.
+
+Once an item has been yielded the stream is committed: later errors are
+raised to the caller, never retried (the tokens are already out).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from typing import Any, TypeVar
+
+import httpx
+
+from ._client import _retry_delay
+
+logger = logging.getLogger("wick.sidecar")
+
+T = TypeVar("T")
+
+# HedgePolicy defaults.
+HEDGE_PERCENTILE = 95.0
+HEDGE_MIN_DELAY = 0.5
+HEDGE_MAX_DELAY = 10.0
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+UPSTREAM_RETRIES = 2
+UPSTREAM_BACKOFF_BASE = 0.25
+UPSTREAM_BACKOFF_MAX = 4.0
+BUDGET_RATIO = 0.1
+BUDGET_RESERVE = 10.0
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Connect failures, and 429/5xx responses (raise_for_status)."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class HedgePolicy:
+    """Hedging and retry settings for one upstream, plus their live state.
+
+    Args:
+        percentile: hedge once an attempt has waited longer than this
+            percentile of recent time-to-first-item; None disables hedging.
+        min_delay / max_delay: clamp on the hedge deadline in seconds.
+            max_delay is also used until min_samples are recorded.
+        window: number of recent time-to-first-item samples kept.
+        min_samples: samples needed before the percentile is trusted.
+        retries: extra attempts after a retryable failure (0 = none).
+        backoff_base / backoff_max: full-jitter backoff bounds, as in
+            AsyncWickClient.
+        budget_ratio: hedges + retries allowed per request, long-run.
+        budget_reserve: burst of hedges + retries available when idle.
+
+    Share one policy per upstream across requests; it is not bound to an
+    event loop.
+    """
+
+    __slots__ = (
+        "percentile", "min_delay", "max_delay", "min_samples", "retries",
+        "backoff_base", "backoff_max", "budget_ratio", "budget_reserve",
+        "_samples", "_budget", "hedges", "hedge_wins", "retried", "denied",
+    )
+
+    def __init__(
+        self,
+        *,
+        percentile: float | None = HEDGE_PERCENTILE,
+        min_delay: float = HEDGE_MIN_DELAY,
+        max_delay: float = HEDGE_MAX_DELAY,
+        window: int = HEDGE_WINDOW,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        retries: int = UPSTREAM_RETRIES,
+        backoff_base: float = UPSTREAM_BACKOFF_BASE,
+        backoff_max: float = UPSTREAM_BACKOFF_MAX,
+        budget_ratio: float = BUDGET_RATIO,
+        budget_reserve: float = BUDGET_RESERVE,
+    ) -> None:
+        if percentile is not None and not 0 < percentile <= 100:
+            raise ValueError(f"percentile must be in (0, 100], got {percentile}")
+        if min_delay < 0 or max_delay < min_delay:
+            raise ValueError(f"need 0 <= min_delay <= max_delay, got {min_delay} and {max_delay}")
+        if window < 1 or min_samples < 1:
+            raise ValueError("window and min_samples must be >= 1")
+        if retries < 0:
+            raise ValueError(f"retries must be >= 0, got {retries}")
+        if backoff_base <= 0 or backoff_max < backoff_base:
+            raise ValueError(
+                f"need 0 < backoff_base <= backoff_max, got {backoff_base} and {backoff_max}"
+            )
+        if budget_ratio < 0 or budget_reserve < 0:
+            raise ValueError("budget_ratio and budget_reserve must be >= 0")
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self._samples: deque[float] = deque(maxlen=window)
+        self._budget = budget_reserve
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retried = 0
+        self.denied = 0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait for a first item before hedging (None = never)."""
+        if self.percentile is None:
+            return None
+        if len(self._samples) < self.min_samples:
+            return self.max_delay
+        ordered = sorted(self._samples)
+        rank = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return min(self.max_delay, max(self.min_delay, ordered[rank]))
+
+    def observe(self, first_item: float) -> None:
+        self._samples.append(first_item)
+
+    def deposit(self) -> None:
+        self._budget = min(self.budget_reserve, self._budget + self.budget_ratio)
+
+    def withdraw(self) -> bool:
+        """Take one hedge/retry from the budget; False if it is spent."""
+        if self._budget >= 1:
+            self._budget -= 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hedge_delay": self.hedge_delay(),
+            "samples": len(self._samples),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retried,
+            "budget_denied": self.denied,
+            "budget": self._budget,
+        }
+
+
+async def _first(stream: AsyncIterator[T]) -> T:
+    return await stream.__anext__()
+
+
+class _Attempt:
+    __slots__ = ("stream", "task", "started", "hedge")
+
+    def __init__(self, stream: AsyncIterator[Any], started: float, hedge: bool) -> None:
+        self.stream = stream
+        self.task = asyncio.ensure_future(_first(stream))
+        self.started = started
+        self.hedge = hedge
+
+    async def cancel(self) -> None:
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        aclose = getattr(self.stream, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:  # the loser's cleanup must not fail the winner
+                logger.debug("closing losing upstream attempt failed: %s", e)
+
+
+async def hedged_stream(
+    attempt: Callable[[], AsyncIterator[T]],
+    policy: HedgePolicy,
+    *,
+    retryable: Callable[[BaseException], bool] = is_retryable,
+) -> AsyncIterator[T]:
+    """Items of attempt(), hedged and retried until the first item arrives.
+
+    attempt is called once per try and must return a fresh async iterator
+    (typically a provider's async generator) that sends the same request.
+    """
+    loop = asyncio.get_running_loop()
+    policy.deposit()
+    start = loop.time()
+    running: list[_Attempt] = [_Attempt(attempt(), start, hedge=False)]
+    delay = policy.hedge_delay()
+    hedge_at = start + delay if delay is not None else None
+    retry_at: float | None = None
+    retry = 0
+    winner: _Attempt | None = None
+    first: Any = None
+    exhausted = False
+
+    try:
+        while winner is None:
+            deadlines = [t for t in (hedge_at, retry_at) if t is not None]
+            timeout = max(0.0, min(deadlines) - loop.time()) if deadlines else None
+            done: set[asyncio.Future] = set()
+            if running:
+                done, _ = await asyncio.wait(
+                    [a.task for a in running], timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            elif timeout:
+                await asyncio.sleep(timeout)
+
+            for a in [a for a in running if a.task in done]:
+                running.remove(a)
+                exc = a.task.exception()
+                if exc is None or isinstance(exc, StopAsyncIteration):
+                    winner, exhausted = a, exc is not None
+                    if exc is None:
+                        first = a.task.result()
+                    break
+                if not retryable(exc):
+                    raise exc
+                if running:
+                    continue  # the other attempt may still succeed
+                if retry < policy.retries and policy.withdraw():
+                    retry += 1
+                    policy.retried += 1
+                    backoff = _retry_delay(retry - 1, policy.backoff_base, policy.backoff_max)
+                    logger.info("upstream attempt failed (%s); retrying in %.2fs", exc, backoff)
+                    retry_at = loop.time() + backoff
+                    hedge_at = None  # the retry gets a fresh hedge deadline
+                else:
+                    raise exc
+            if winner is not None:
+                break
+
+            now = loop.time()
+            if retry_at is not None and now >= retry_at:
+                retry_at = None
+                running.append(_Attempt(attempt(), now, hedge=False))
+                delay = policy.hedge_delay()
+                hedge_at = now + delay if delay is not None else None
+            elif hedge_at is not None and now >= hedge_at and running:
+                hedge_at = None
+                if policy.withdraw():
+                    policy.hedges += 1
+                    logger.info("no first byte after %.2fs; hedging upstream request", now - start)
+                    running.append(_Attempt(attempt(), now, hedge=True))
+    finally:
+        for a in running:
+            await a.cancel()
+
+    policy.observe(loop.time() - winner.started)
+    if winner.hedge:
+        policy.hedge_wins += 1
+    if exhausted:
+        return
+    try:
+        yield first
+        async for item in winner.stream:
+            yield item
+    finally:
+        aclose = getattr(winner.stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,319 @@
+"""Prometheus text-format metrics for the sidecar (GET /metrics).
+
+A deliberately small implementation — counters and histograms with fixed
+label sets, rendered in the Prometheus text exposition format 0.0.4 —
+so the sidecar needs no client library. Values are only updated from the
+sidecar's event loop, so no locking is done.
+
+Exposed series:
+  wick_tool_calls_total{tool}                 calls handled (including cache hits)
+  wick_tool_errors_total{tool}                calls that raised
+  wick_tool_cancelled_total{tool}             calls cancelled because the caller left
+  wick_tool_duration_seconds{tool}            histogram, queue wait included
+  wick_tool_in_flight{tool}                   gauge, from the executor lanes
+  wick_tool_queued{tool}                      gauge, calls waiting on max_concurrency
+  wick_tool_cache_hits_total{tool}            cached tools only
+  wick_tool_cache_misses_total{tool}          cached tools only
+  wick_llm_requests_total{provider,mode}      mode = "call" | "stream"
+  wick_llm_errors_total{provider,mode}
+  wick_llm_cancelled_total{provider,mode}     requests abandoned by Go mid-flight
+  wick_llm_call_duration_seconds{provider}    histogram, /llm/{model}/call
+  wick_llm_ttft_seconds{provider}             histogram, request → first delta/tool_call
+  wick_llm_inter_chunk_seconds{provider}      histogram, gap between provider chunks
+  wick_llm_stream_duration_seconds{provider}  histogram, whole stream
+  wick_llm_stream_bytes_total{provider}       SSE bytes written
+  wick_llm_in_flight{provider}                gauge, admitted requests (gated providers)
+  wick_llm_queued{provider}                   gauge, requests waiting for admission
+  wick_llm_rejected_total{provider}           requests turned away with 429
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterable, Iterator
+from contextlib import aclosing
+from typing import Any
+
+from ._types import StreamChunk
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds. Tool calls and whole LLM turns span milliseconds to minutes.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Seconds. Gaps between streamed chunks are usually well under a second.
+CHUNK_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Labels, values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _value(v: float) -> str:
+    if isinstance(v, int):
+        return str(v)
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(v)
+
+
+class _Metric:
+    kind = ""
+
+    __slots__ = ("name", "help", "labelnames")
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    __slots__ = ("_values",)
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> Iterator[str]:
+        for labels, v in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_value(v)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    __slots__ = ("buckets", "_values")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # labels → [per-bucket counts..., +Inf count], sum
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        total[0] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> Iterator[str]:
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = f'le="{_value(float(bound))}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_value(total[0])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Collected(_Metric):
+    """Gauge or counter whose samples are read from a callback at scrape time."""
+
+    __slots__ = ("kind", "_collect")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels,
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+        kind: str = "gauge",
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def _samples(self) -> Iterator[str]:
+        for labels, v in self._collect():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_value(v)}"
+
+
+class SidecarMetrics:
+    """All metrics one sidecar app exposes.
+
+    Args:
+        tool_stats: returns ToolExecutor.stats() — read at scrape time for
+            the in-flight, queue and cache series.
+        llm_stats: returns AdmissionController.stats(), read the same way.
+    """
+
+    def __init__(
+        self,
+        tool_stats: Callable[[], dict[str, dict[str, Any]]],
+        llm_stats: Callable[[], dict[str, dict[str, Any]]] = dict,
+    ) -> None:
+        self.tool_calls = Counter("wick_tool_calls_total", "Tool calls handled.", ("tool",))
+        self.tool_errors = Counter("wick_tool_errors_total", "Tool calls that raised.", ("tool",))
+        self.tool_cancelled = Counter(
+            "wick_tool_cancelled_total", "Tool calls cancelled because the caller left.", ("tool",),
+        )
+        self.tool_duration = Histogram(
+            "wick_tool_duration_seconds", "Tool call latency, queue wait included.", ("tool",),
+        )
+        self.llm_requests = Counter(
+            "wick_llm_requests_total", "LLM provider requests.", ("provider", "mode"),
+        )
+        self.llm_errors = Counter(
+            "wick_llm_errors_total", "LLM provider requests that failed.", ("provider", "mode"),
+        )
+        self.llm_cancelled = Counter(
+            "wick_llm_cancelled_total", "LLM provider requests abandoned by the caller.",
+            ("provider", "mode"),
+        )
+        self.llm_call_duration = Histogram(
+            "wick_llm_call_duration_seconds", "Non-streaming LLM call latency.", ("provider",),
+        )
+        self.llm_ttft = Histogram(
+            "wick_llm_ttft_seconds", "Time from request to first delta or tool call.", ("provider",),
+        )
+        self.llm_inter_chunk = Histogram(
+            "wick_llm_inter_chunk_seconds", "Gap between consecutive provider chunks.",
+            ("provider",), buckets=CHUNK_BUCKETS,
+        )
+        self.llm_stream_duration = Histogram(
+            "wick_llm_stream_duration_seconds", "Total LLM stream duration.", ("provider",),
+        )
+        self.llm_stream_bytes = Counter(
+            "wick_llm_stream_bytes_total", "SSE bytes streamed to Go.", ("provider",),
+        )
+
+        def lane(field: str) -> Callable[[], Iterable[tuple[Labels, float]]]:
+            return lambda: (((name,), s[field]) for name, s in tool_stats().items())
+
+        def gate(field: str) -> Callable[[], Iterable[tuple[Labels, float]]]:
+            return lambda: (((name,), s[field]) for name, s in llm_stats().items())
+
+        def cache(field: str) -> Callable[[], Iterable[tuple[Labels, float]]]:
+            return lambda: (
+                ((name,), s["cache"][field]) for name, s in tool_stats().items() if "cache" in s
+            )
+
+        self._metrics: list[_Metric] = [
+            self.tool_calls,
+            self.tool_errors,
+            self.tool_cancelled,
+            self.tool_duration,
+            Collected("wick_tool_in_flight", "Tool calls running.", ("tool",), lane("in_flight")),
+            Collected(
+                "wick_tool_queued", "Tool calls waiting for a max_concurrency permit.",
+                ("tool",), lane("queued"),
+            ),
+            Collected(
+                "wick_tool_cache_hits_total", "Tool result cache hits.",
+                ("tool",), cache("hits"), kind="counter",
+            ),
+            Collected(
+                "wick_tool_cache_misses_total", "Tool result cache misses.",
+                ("tool",), cache("misses"), kind="counter",
+            ),
+            self.llm_requests,
+            self.llm_errors,
+            self.llm_cancelled,
+            self.llm_call_duration,
+            self.llm_ttft,
+            self.llm_inter_chunk,
+            self.llm_stream_duration,
+            self.llm_stream_bytes,
+            Collected(
+                "wick_llm_in_flight", "LLM requests admitted upstream.",
+                ("provider",), gate("in_flight"),
+            ),
+            Collected(
+                "wick_llm_queued", "LLM requests waiting for admission.",
+                ("provider",), gate("queued"),
+            ),
+            Collected(
+                "wick_llm_rejected_total", "LLM requests rejected with 429.",
+                ("provider",), gate("rejected"), kind="counter",
+            ),
+        ]
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    async def time_chunks(
+        self, provider: str, chunks: AsyncGenerator[StreamChunk, None], start: float,
+    ) -> AsyncIterator[StreamChunk]:
+        """Pass provider chunks through, recording TTFT and inter-chunk gaps.
+
+        Closing this generator closes `chunks`.
+        """
+        last = 0.0
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                now = time.perf_counter()
+                if last:
+                    self.llm_inter_chunk.observe(now - last, provider)
+                elif chunk.delta or chunk.tool_call is not None:
+                    self.llm_ttft.observe(now - start, provider)
+                else:
+                    # Leading empty/done chunks don't count as the first token.
+                    yield chunk
+                    continue
+                last = now
+                yield chunk
+
+    async def count_stream(
+        self, provider: str, frames: AsyncGenerator[bytes, None], start: float,
+    ) -> AsyncIterator[bytes]:
+        """Pass SSE frames through, recording bytes and total stream duration.
+
+        Closing this generator closes `frames`.
+        """
+        sent = 0
+        try:
+            async with aclosing(frames):
+                async for frame in frames:
+                    sent += len(frame)
+                    yield frame
+        finally:
+            self.llm_stream_bytes.inc(provider, amount=sent)
+            self.llm_stream_duration.observe(time.perf_counter() - start, provider)
@@ -0,0 +1,122 @@
+"""On-demand CPU and allocation profiling for a running sidecar.
+
+Backs the sidecar's /debug endpoints (enabled only when a debug token is
+configured — see build_app):
+
+  GET /debug/profile?seconds=N   statistical CPU profile of every thread in
+                                 the sidecar process (event loop, tool pools),
+                                 returned as collapsed stacks — one
+                                 "thread;outer;...;inner count" line per
+                                 distinct stack, ready for flamegraph.pl or
+                                 speedscope.
+  GET /debug/heap                tracemalloc allocation diff since the previous
+                                 call, grouped by file:line. The first call
+                                 starts tracing; ?stop=true stops it again.
+
+Worker processes of executor="process" tools are not sampled.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import FrameType
+
+# Default sampling rate: 100 Hz is enough to find hot paths and costs well
+# under 1% of a core.
+DEFAULT_SAMPLE_INTERVAL = 0.01
+
+MAX_PROFILE_SECONDS = 60.0
+
+# Frames kept per traceback in heap snapshots.
+HEAP_FRAMES = 1
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def _stack(frame: FrameType | None) -> list[str]:
+    labels: list[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL) -> str:
+    """Sample every thread's stack for `seconds`; return collapsed stacks.
+
+    Blocking — run it off the event loop, or the loop itself won't be
+    sampled doing anything but waiting for the profile.
+    """
+    me = threading.get_ident()
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            thread = names.get(ident, f"thread-{ident}").replace(";", ":")
+            stacks[";".join([thread, *(s.replace(";", ":") for s in _stack(frame))])] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+
+
+class Profiler:
+    """Serialises CPU profiles: one sampler runs at a time per sidecar."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def run(self, seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL) -> str | None:
+        """Sample for `seconds`, or return None if a profile is already running."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            return sample_stacks(min(seconds, MAX_PROFILE_SECONDS), interval)
+        finally:
+            self._lock.release()
+
+
+class HeapTracker:
+    """tracemalloc snapshots diffed against the previous request."""
+
+    def __init__(self) -> None:
+        self._baseline: tracemalloc.Snapshot | None = None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def diff(self, limit: int = 25) -> str:
+        """Top `limit` allocation changes by file:line since the last call."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(HEAP_FRAMES)
+            self._baseline = self._snapshot()
+            return (
+                "tracemalloc started — request /debug/heap again to see "
+                "allocations since now (?stop=true to stop tracing)\n"
+            )
+
+        snapshot = self._snapshot()
+        baseline, self._baseline = self._baseline or snapshot, snapshot
+        stats = snapshot.compare_to(baseline, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"traced: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB peak"]
+        lines.extend(str(stat) for stat in stats[:limit])
+        return "\n".join(lines) + "\n"
+
+    def stop(self) -> str:
+        tracemalloc.stop()
+        self._baseline = None
+        return "tracemalloc stopped\n"
@@ -0,0 +1,260 @@
+"""Hot reload of Python tools into a running sidecar.
+
+    agent.run(reload=True)            # dev mode
+    agent.serve_sidecar(reload=True)  # single-worker sidecar
+
+A background thread polls the source files of the modules that define the
+agents' tools. When one changes it is re-imported, and only what changed
+is pushed on:
+  - tools whose function or ToolOptions changed get a fresh sidecar lane
+    (ToolExecutor.replace); calls already running finish on the old code,
+  - tools whose description or parameters changed, and new tools, are
+    re-registered with Go (WickClient.register_tool),
+  - tools that disappeared are deregistered and dropped from the sidecar.
+
+Go keeps running, so its threads and checkpoints survive a reload.
+
+Limits:
+  - Only modules that define tools are watched. A helper module they
+    import isn't, and re-importing a tool module doesn't re-import it.
+  - Tools defined in the __main__ script can't be reloaded.
+  - Agents, prompts and LLM providers aren't reloaded; restart for those.
+  - Not available with app_module or workers > 1 (each worker has its
+    own registry).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from . import _tools
+from ._client import WickClient
+from ._executors import ToolExecutor
+
+if TYPE_CHECKING:
+    from ._agent import Agent, _ToolDef
+
+logger = logging.getLogger("wick.reload")
+
+# Seconds between checks of the watched files.
+DEFAULT_RELOAD_INTERVAL = 0.5
+
+# Upper bound on waiting for the sidecar loop to apply a swap.
+_SWAP_TIMEOUT = 10.0
+
+
+class ToolReloader:
+    """Watches tool modules and hot-swaps changed tools into a live sidecar.
+
+    Args:
+        agents: the agents whose tools the sidecar serves.
+        executor: the running sidecar's ToolExecutor.
+        client: client for the Go server the agents are registered with.
+        sidecar_url: callback URL Go uses to reach the sidecar.
+        interval: seconds between file checks.
+    """
+
+    def __init__(
+        self,
+        agents: list[Agent],
+        executor: ToolExecutor,
+        client: WickClient,
+        sidecar_url: str,
+        interval: float = DEFAULT_RELOAD_INTERVAL,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be > 0, got {interval}")
+        self._agents = agents
+        self._executor = executor
+        self._client = client
+        self._sidecar_url = sidecar_url
+        self._interval = interval
+        self._stamps: dict[str, tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        for module in self._watched():
+            self._stamps[module.__name__] = _stamp(module)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="wick-reload", daemon=True)
+        self._thread.start()
+        logger.info("Watching %d tool module(s) for changes", len(self._stamps))
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("tool reload failed")
+
+    def check(self) -> list[str]:
+        """Reload every watched module whose file changed; returns their names."""
+        if self._executor.loop is None:
+            return []  # sidecar not started yet
+        reloaded = []
+        for module in self._watched():
+            stamp = _stamp(module)
+            previous = self._stamps.get(module.__name__)
+            self._stamps[module.__name__] = stamp
+            if previous is not None and stamp != previous and self._reload(module):
+                reloaded.append(module.__name__)
+        return reloaded
+
+    def _watched(self) -> list[ModuleType]:
+        """Importable modules defining the agents' tools, in name order."""
+        names = {
+            td.fn.__module__
+            for a in self._agents
+            for td in a._all_tool_defs().values()
+        }
+        names.update(self._stamps)  # keep watching a module whose tools all went away
+        modules = []
+        for name in sorted(names):
+            module = sys.modules.get(name)
+            if name == "__main__" or module is None or not getattr(module, "__file__", None):
+                continue
+            modules.append(module)
+        return modules
+
+    # ── Reload ──────────────────────────────────────────────────────────
+
+    def _reload(self, module: ModuleType) -> bool:
+        started = time.perf_counter()
+        before = self._snapshot()
+        saved_registry = dict(_tools._REGISTRY)
+        saved_agent_tools = [dict(a._tools) for a in self._agents]
+
+        # Forget the module's tools so ones deleted from the source go away;
+        # re-importing re-runs the decorators for the rest.
+        for registry in [_tools._REGISTRY, *(a._tools for a in self._agents)]:
+            for name in [n for n, td in registry.items() if td.fn.__module__ == module.__name__]:
+                del registry[name]
+        try:
+            importlib.reload(module)
+        except Exception:
+            _tools._REGISTRY.clear()
+            _tools._REGISTRY.update(saved_registry)
+            for a, tools in zip(self._agents, saved_agent_tools):
+                a._tools = tools
+            logger.exception("reload of %s failed; keeping the previous tools", module.__name__)
+            return False
+        after = self._snapshot()
+
+        swapped, removed = self._swap(_merged(before), _merged(after))
+        registered = deregistered = 0
+        for key, td in after.items():
+            old = before.get(key)
+            if td.name in swapped and (
+                old is None or (old.description, old.parameters) != (td.description, td.parameters)
+            ):
+                try:
+                    self._register(key[0], td)
+                except httpx.HTTPError as e:
+                    logger.error("reload: registering %s/%s failed: %s", key[0], td.name, e)
+                    continue
+                registered += 1
+        for agent_id, name in before.keys() - after.keys():
+            try:
+                self._client.deregister_tool(name, agent_id=agent_id)
+            except httpx.HTTPError as e:
+                logger.error("reload: deregistering %s/%s failed: %s", agent_id, name, e)
+                continue
+            deregistered += 1
+        if removed:
+            self._on_loop(self._remove, removed)
+
+        logger.info(
+            "Reloaded %s in %.1f ms: %d tool(s) swapped, %d registered, %d deregistered",
+            module.__name__, (time.perf_counter() - started) * 1000,
+            len(swapped), registered, deregistered,
+        )
+        return True
+
+    def _snapshot(self) -> dict[tuple[str, str], _ToolDef]:
+        """(agent_id, tool name) → definition, across all agents."""
+        return {
+            (a.agent_id, name): td
+            for a in self._agents
+            for name, td in a._all_tool_defs().items()
+        }
+
+    def _swap(
+        self, before: dict[str, _ToolDef], after: dict[str, _ToolDef],
+    ) -> tuple[set[str], list[str]]:
+        """Give changed and new tools a fresh lane; returns (swapped, gone).
+
+        Gone tools keep their lane until Go has been told to stop calling
+        them (see _reload).
+        """
+        changed = {
+            name: td for name, td in after.items()
+            if name not in before
+            or before[name].fn is not td.fn
+            or before[name].options is not td.options
+        }
+        swapped = self._on_loop(self._replace, changed)
+        return swapped, [name for name in before if name not in after]
+
+    def _replace(self, changed: dict[str, _ToolDef]) -> set[str]:
+        swapped = set()
+        for name, td in changed.items():
+            try:
+                self._executor.replace(name, td.fn, td.options)
+            except ValueError as e:
+                logger.error("reload: %s", e)
+                continue
+            swapped.add(name)
+        return swapped
+
+    def _remove(self, names: list[str]) -> None:
+        for name in names:
+            self._executor.remove(name)
+
+    def _on_loop(self, fn: Any, arg: Any) -> Any:
+        """Run fn(arg) on the sidecar's event loop and return its result."""
+
+        async def call() -> Any:
+            return fn(arg)
+
+        future = asyncio.run_coroutine_threadsafe(call(), self._executor.loop)
+        return future.result(_SWAP_TIMEOUT)
+
+    def _register(self, agent_id: str, td: _ToolDef) -> None:
+        agent = next(a for a in self._agents if a.agent_id == agent_id)
+        self._client.register_tool(
+            name=td.name,
+            description=td.description,
+            parameters=td.parameters,
+            callback_url=self._sidecar_url,
+            agent_id=agent_id,
+            batch=agent._batch_tools,
+        )
+
+
+def _merged(defs: dict[tuple[str, str], _ToolDef]) -> dict[str, _ToolDef]:
+    """The sidecar's view: one lane per tool name, later agents winning
+    (same merge as _build_sidecar_app)."""
+    return {name: td for (_, name), td in defs.items()}
+
+
+def _stamp(module: ModuleType) -> tuple[int, int]:
+    try:
+        st = os.stat(module.__file__)
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
@@ -6,6 +6,16 @@ The binary is discovered via:
   2. WICK_SERVER_BINARY env var
   3. "wick_server" on PATH
   4. Known relative paths in the repo
+
+Readiness is signalled by the binary itself: once its listen socket is
+bound it prints "WICK_READY <addr>" on stdout (ReadyLinePrefix in app.go),
+which wait_ready waits for — no /health polling, no fixed sleeps.
+
+The binary's stdout and stderr are drained by background threads: every
+line goes to the "wick.go" logger (at or above the configured level) and
+into a ring buffer of recent output that is attached to crash reports.
+An undrained pipe fills up under load (debug agents log a lot) and then
+blocks every Go goroutine that writes a log line.
 """
 
 from __future__ import annotations
@@ -13,15 +23,64 @@ from __future__ import annotations
 import atexit
 import logging
 import os
+import re
 import shutil
 import signal
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from typing import IO
 
 import httpx
 
 logger = logging.getLogger("wick.runtime")
+go_logger = logging.getLogger("wick.go")
+
+# Lines of Go output kept for crash reports.
+DEFAULT_LOG_LINES = 500
+
+# Lines of that output quoted in the error when the binary dies.
+_CRASH_TAIL_LINES = 40
+
+# Must match ReadyLinePrefix in wick_deep_agent/server/app.go.
+READY_LINE_PREFIX = "WICK_READY "
+
+# Binaries built before the ready line existed never print it; after this
+# long without one, wait_ready also probes /health.
+_READY_LINE_GRACE = 3.0
+
+# Bounds (seconds) on how long wait_ready sleeps between checks that the
+# process is still alive (and, for old binaries, /health probes).
+_CHECK_MIN = 0.05
+_CHECK_MAX = 1.0
+
+# Go's log package prefixes "2006/01/02 15:04:05 "; the logging handler
+# adds its own timestamp.
+_GO_LOG_PREFIX = re.compile(r"^\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)? ")
+_ERROR_WORDS = re.compile(r"\b(panic|fatal|error)\b", re.IGNORECASE)
+_WARNING_WORDS = re.compile(r"\b(warn|warning|failed)\b", re.IGNORECASE)
+
+
+def _line_level(message: str) -> int:
+    """Guess a logging level for a Go log line (the log package has none)."""
+    if _ERROR_WORDS.search(message):
+        return logging.ERROR
+    if _WARNING_WORDS.search(message):
+        return logging.WARNING
+    return logging.INFO
+
+
+def _resolve_level(level: int | str | None) -> int:
+    if level is None:
+        level = os.environ.get("WICK_GO_LOG_LEVEL", "INFO")
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(level.upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"unknown log level {level!r}")
+    return resolved
 
 # Relative paths to check when running from the repo
 _KNOWN_BINARIES = [
@@ -40,18 +99,37 @@ class GoRuntime:
         host: str = "127.0.0.1",
         env: dict[str, str] | None = None,
         cwd: str | None = None,
+        log_level: int | str | None = None,
+        log_lines: int = DEFAULT_LOG_LINES,
     ) -> None:
+        """
+        Args:
+            log_level: lowest level of Go output forwarded to the "wick.go"
+                logger (default: WICK_GO_LOG_LEVEL, else INFO). Filtered
+                lines are still kept in the ring buffer.
+            log_lines: size of the ring buffer of recent Go output.
+        """
         self._binary = binary or self._find_binary()
         self._port = port
         self._host = host
         self._env = env
         self._cwd = cwd
+        self._log_level = _resolve_level(log_level)
+        self._output: deque[str] = deque(maxlen=log_lines)
+        self._output_lock = threading.Lock()
+        self._drains: list[threading.Thread] = []
+        self._ready = threading.Event()
         self._process: subprocess.Popen | None = None
 
     @property
     def port(self) -> int:
         return self._port
 
+    @property
+    def pid(self) -> int | None:
+        """Process id of the running binary (None when stopped)."""
+        return self._process.pid if self._process is not None else None
+
     @property
     def base_url(self) -> str:
         return f"http://{self._host}:{self._port}"
@@ -77,35 +155,90 @@ class GoRuntime:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
+        self._drains = [
+            threading.Thread(
+                target=self._drain, args=(stream, name == "stdout"),
+                name=f"wick-go-{name}", daemon=True,
+            )
+            for name, stream in (("stdout", self._process.stdout), ("stderr", self._process.stderr))
+        ]
+        for t in self._drains:
+            t.start()
         atexit.register(self.stop)
 
+    def _drain(self, stream: IO[bytes], watch_ready: bool = False) -> None:
+        """Read one pipe until EOF (the process exited or closed it)."""
+        with stream:
+            for raw in iter(stream.readline, b""):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                with self._output_lock:
+                    self._output.append(line)
+                if watch_ready and line.startswith(READY_LINE_PREFIX):
+                    logger.info("Go server listening on %s", line[len(READY_LINE_PREFIX):])
+                    self._ready.set()
+                    continue
+                message = _GO_LOG_PREFIX.sub("", line, count=1)
+                level = _line_level(message)
+                if level >= self._log_level:
+                    go_logger.log(level, "%s", message)
+
+    def recent_output(self, lines: int | None = None) -> list[str]:
+        """The last `lines` lines the binary wrote (all buffered if None)."""
+        with self._output_lock:
+            output = list(self._output)
+        return output if lines is None else output[-lines:]
+
+    def _join_drains(self, timeout: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout
+        for t in self._drains:
+            t.join(max(0.0, deadline - time.monotonic()))
+
     def wait_ready(self, timeout: float = 15.0) -> None:
-        """Poll /health until the Go server is ready."""
+        """Block until the binary reports that it is listening.
+
+        Wakes as soon as the ready line arrives. Meanwhile the process is
+        checked for an early exit, and binaries that predate the ready line
+        are probed on /health after a short grace period.
+        """
+        if self._process is None:
+            raise RuntimeError("Go runtime not started")
         url = f"{self.base_url}/health"
-        deadline = time.monotonic() + timeout
-        last_err = None
-
-        while time.monotonic() < deadline:
-            # Check if process died
-            if self._process and self._process.poll() is not None:
-                stderr = self._process.stderr.read().decode() if self._process.stderr else ""
-                raise RuntimeError(
-                    f"Go binary exited with code {self._process.returncode}: {stderr}"
-                )
-
-            try:
-                resp = httpx.get(url, timeout=2.0)
-                if resp.status_code == 200:
-                    logger.info("Go server ready at %s", self.base_url)
-                    return
-            except (httpx.ConnectError, httpx.ReadTimeout) as e:
-                last_err = e
-
-            time.sleep(0.3)
-
-        raise TimeoutError(
-            f"Go server not ready after {timeout}s at {url}: {last_err}"
-        )
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = _CHECK_MIN
+        last_err: Exception | None = None
+        probe: httpx.Client | None = None
+
+        try:
+            while not self._ready.wait(min(delay, max(0.0, deadline - time.monotonic()))):
+                self._raise_if_exited()
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(
+                        f"Go server not ready after {timeout}s at {url}: "
+                        f"{last_err or 'no ready line on stdout'}"
+                    )
+                if now - start >= _READY_LINE_GRACE:
+                    probe = probe or httpx.Client(timeout=2.0)
+                    try:
+                        if probe.get(url).status_code == 200:
+                            logger.info("Go binary printed no ready line — detected via /health")
+                            break
+                    except (httpx.ConnectError, httpx.ReadTimeout) as e:
+                        last_err = e
+                delay = min(delay * 2, _CHECK_MAX)
+        finally:
+            if probe is not None:
+                probe.close()
+        logger.info("Go server ready at %s", self.base_url)
+
+    def _raise_if_exited(self) -> None:
+        if self._process is None or self._process.poll() is None:
+            return
+        # Let the drain threads reach EOF so the tail is complete.
+        self._join_drains()
+        tail = "\n".join(self.recent_output(_CRASH_TAIL_LINES))
+        raise RuntimeError(f"Go binary exited with code {self._process.returncode}:\n{tail}")
 
     def stop(self) -> None:
         """Stop the Go binary subprocess."""
@@ -122,6 +255,8 @@ class GoRuntime:
             self._process.wait(timeout=2)
         finally:
             self._process = None
+            self._ready.clear()
+            self._join_drains()
 
     def __enter__(self) -> GoRuntime:
         self.start()
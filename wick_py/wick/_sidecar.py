@@ -1,41 +1,204 @@
 """FastAPI sidecar serving tool callbacks and LLM proxy endpoints.
 
 Go's HTTPTool calls:       POST /tools/{tool_name}
+Go's ToolBatcher calls:    POST /tools/_batch
 Go's HTTPProxyClient calls: POST /llm/{model_name}/call
                             POST /llm/{model_name}/stream
+Ops:                        GET  /tools/_stats
+                            GET  /metrics
+                            GET  /debug/profile, /debug/heap (token-guarded)
 
 This module builds a FastAPI app that routes these to Python functions
 registered by the user via @agent.tool and @agent.llm_provider decorators.
+
+When Go abandons a request (turn cancelled, HITL reject, user abort) it
+closes the connection. The sidecar then cancels the work behind it: tool
+calls are cancelled (sync tools see their CancellationToken set, see
+_cancel.py) and provider generators are closed, which closes their
+upstream HTTP streams.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hmac
 import inspect
-import json
 import logging
+import os
+import time
 import traceback
-from collections.abc import AsyncIterator, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, StreamingResponse
-
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
+
+from ._admission import AdmissionController, Overloaded, ProviderOptions
+from ._executors import ToolExecutor
+from ._metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from ._metrics import SidecarMetrics
+from ._profiling import HeapTracker, Profiler
+from ._tools import ToolOptions
 from ._types import (
-    LLMRequest,
     LLMResponse,
     StreamChunk,
-    ToolCallbackRequest,
+    ToolBatchRequest,
+    ToolBatchResponse,
+    ToolBatchResult,
     ToolCallbackResponse,
     ToolCallResult,
 )
+from ._upstream import aclose_upstream_clients
+from ._wire import (
+    DONE_FRAME,
+    decode_llm_request,
+    decode_tool_request,
+    encode_stream_chunk,
+    encode_tool_response,
+    error_frame,
+    sse,
+)
 
 logger = logging.getLogger("wick.sidecar")
 
+# Cap (in characters) on text held back by stream coalescing before it is
+# flushed regardless of the time window.
+DEFAULT_STREAM_COALESCE_CHARS = 4096
+
+# Status logged for requests whose caller left before the response was
+# ready (nginx's "client closed request"). Nobody receives it.
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _disconnected(request: Request) -> None:
+    """Return once the client disconnects (or the response is complete).
+
+    Only valid after the body has been read: every message left on the
+    ASGI receive channel is then an http.disconnect.
+    """
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _cancel_on_disconnect(request: Request, work: Awaitable[Any]) -> Any:
+    """Await `work`, cancelling it if the client goes away first.
+
+    Raises ClientDisconnect when that happens.
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_disconnected(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+    if not task.done():
+        raise ClientDisconnect()
+    return task.result()
+
+
+async def _aclose(it: object) -> None:
+    aclose = getattr(it, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _coalesce_deltas(
+    chunks: AsyncIterator[StreamChunk],
+    window: float,
+    max_chars: int = DEFAULT_STREAM_COALESCE_CHARS,
+) -> AsyncIterator[StreamChunk]:
+    """Merge consecutive text deltas that arrive within `window` seconds.
+
+    The first delta of a stream is passed through at once so time to first
+    token is unchanged. After that, text is buffered until the window
+    since the oldest buffered delta expires, max_chars is reached, or a
+    non-text chunk (tool_call, done) arrives — which flushes the buffer
+    and is then forwarded immediately. A provider that stalls mid-window
+    doesn't delay buffered text past the window.
+    """
+    loop = asyncio.get_running_loop()
+    it = chunks.__aiter__()
+    parts: list[str] = []
+    size = 0
+    deadline = 0.0
+    first = True
+    pending: asyncio.Future | None = None
+
+    try:
+        while True:
+            try:
+                if pending is None and not parts:
+                    chunk = await it.__anext__()
+                else:
+                    # Something is buffered: wait for the next chunk only
+                    # until the window closes, without cancelling the read.
+                    if pending is None:
+                        pending = asyncio.ensure_future(it.__anext__())
+                    if parts:
+                        done, _ = await asyncio.wait(
+                            {pending}, timeout=max(0.0, deadline - loop.time()),
+                        )
+                        if not done:
+                            yield StreamChunk(delta="".join(parts))
+                            parts.clear()
+                            size = 0
+                            continue
+                    chunk = await pending
+                    pending = None
+            except StopAsyncIteration:
+                break
+            except Exception:
+                if parts:
+                    yield StreamChunk(delta="".join(parts))
+                    parts.clear()
+                raise
+
+            if chunk.delta and chunk.tool_call is None and not chunk.done:
+                if first:
+                    first = False
+                    yield chunk
+                    continue
+                if not parts:
+                    deadline = loop.time() + window
+                parts.append(chunk.delta)
+                size += len(chunk.delta)
+                if size >= max_chars:
+                    yield StreamChunk(delta="".join(parts))
+                    parts.clear()
+                    size = 0
+                continue
+
+            if parts:
+                yield StreamChunk(delta="".join(parts))
+                parts.clear()
+                size = 0
+            yield chunk
+
+        if parts:
+            yield StreamChunk(delta="".join(parts))
+    finally:
+        if pending is not None:
+            # Let the read unwind (a cancelled provider closes itself)
+            # before closing the source below.
+            pending.cancel()
+            await asyncio.wait({pending})
+        await _aclose(it)
+
 
 def build_app(
     tools: dict[str, Callable],
     llm_providers: dict[str, Callable],
+    tool_options: dict[str, ToolOptions] | None = None,
+    shared_workers: int | None = None,
+    stream_coalesce_ms: float = 0,
+    stream_coalesce_chars: int = DEFAULT_STREAM_COALESCE_CHARS,
+    debug_token: str | None = None,
+    llm_options: dict[str, ProviderOptions] | None = None,
 ) -> FastAPI:
     """Build the FastAPI sidecar application.
 
@@ -44,8 +207,172 @@ def build_app(
         llm_providers: mapping of model name to LLM handler.
             - Sync handler: (LLMRequest) -> LLMResponse
             - Async generator: (LLMRequest) -> AsyncIterator[StreamChunk]
+        tool_options: per-tool executor settings (see ToolOptions).
+        shared_workers: thread count of the shared tool pool
+            (default: min(32, cpu_count + 4)).
+        stream_coalesce_ms: merge text deltas from streaming providers that
+            arrive within this window into one SSE frame (0 = one frame per
+            chunk). Tool-call and done frames are never delayed.
+        stream_coalesce_chars: flush merged text once it reaches this many
+            characters, even inside the window.
+        debug_token: enables /debug/profile and /debug/heap for requests
+            sending "Authorization: Bearer <token>". Defaults to the
+            WICK_DEBUG_TOKEN environment variable; unset = no /debug routes.
+        llm_options: per-provider admission limits (see ProviderOptions).
     """
-    app = FastAPI(title="wick-sidecar", docs_url=None, redoc_url=None)
+    coalesce_window = stream_coalesce_ms / 1000
+    executor = ToolExecutor(tools, tool_options, shared_workers=shared_workers)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        await executor.start()
+        try:
+            yield
+        finally:
+            executor.shutdown()
+            await aclose_upstream_clients()
+
+    app = FastAPI(title="wick-sidecar", docs_url=None, redoc_url=None, lifespan=lifespan)
+    app.state.tool_executor = executor
+    admission = AdmissionController(llm_options)
+    metrics = SidecarMetrics(executor.stats, admission.stats)
+    app.state.metrics = metrics
+
+    # ── Tool dispatch ─────────────────────────────────────────────────────
+    # Shared by the single and batched tool endpoints.
+
+    async def run_tool(tool_name: str, args: dict[str, Any]) -> ToolCallbackResponse:
+        if not executor.has(tool_name):
+            return ToolCallbackResponse(error=f"unknown tool: {tool_name}")
+
+        metrics.tool_calls.inc(tool_name)
+        start = time.perf_counter()
+        try:
+            result = await executor.run(tool_name, args)
+            return ToolCallbackResponse(result=str(result))
+        except asyncio.CancelledError:
+            metrics.tool_cancelled.inc(tool_name)
+            raise
+        except Exception as e:
+            metrics.tool_errors.inc(tool_name)
+            logger.error("tool %s failed: %s\n%s", tool_name, e, traceback.format_exc())
+            return ToolCallbackResponse(error=str(e))
+        finally:
+            metrics.tool_duration.observe(time.perf_counter() - start, tool_name)
+
+    # ── LLM admission ─────────────────────────────────────────────────────
+    # Contract: llm/http_proxy.go HTTPProxyClient retries a 429 after its
+    # Retry-After (seconds).
+
+    def client_gone() -> Response:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+    def overloaded(e: Overloaded) -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"error": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    # ── Tool executor stats ─────────────────────────────────────────────
+    # {tool_name: {"executor": str, "max_concurrency": int|null,
+    #              "in_flight": int, "queued": int,
+    #              "cache": {"hits", "misses", "entries", "ttl", "max_entries"},
+    #              "coalesced": int}}
+    # "cache" is present only for tools with cache_ttl set, "coalesced"
+    # (calls that joined an identical in-flight call) only for coalescing
+    # tools.
+
+    @app.get("/tools/_stats")
+    async def tool_stats() -> dict[str, Any]:
+        return executor.stats()
+
+    # ── Metrics ─────────────────────────────────────────────────────────
+    # Prometheus text format; series are listed in _metrics.py.
+
+    @app.get("/metrics")
+    async def prometheus_metrics() -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+    # ── Debug endpoints ─────────────────────────────────────────────────
+    # Only registered when a debug token is configured; see _profiling.py.
+
+    debug_token = debug_token or os.environ.get("WICK_DEBUG_TOKEN")
+    if debug_token:
+        profiler = Profiler()
+        heap = HeapTracker()
+
+        def check_token(request: Request) -> None:
+            given = request.headers.get("authorization", "").removeprefix("Bearer ")
+            if not hmac.compare_digest(given.encode(), debug_token.encode()):
+                raise HTTPException(status_code=403, detail="invalid debug token")
+
+        @app.get("/debug/profile")
+        async def debug_profile(request: Request, seconds: float = 10.0) -> PlainTextResponse:
+            check_token(request)
+            if seconds <= 0:
+                raise HTTPException(status_code=400, detail="seconds must be > 0")
+            # Sample from a thread so the event loop keeps serving (and is
+            # itself profiled) meanwhile.
+            stacks = await asyncio.to_thread(profiler.run, seconds)
+            if stacks is None:
+                raise HTTPException(status_code=409, detail="a profile is already running")
+            return PlainTextResponse(stacks)
+
+        @app.get("/debug/heap")
+        async def debug_heap(request: Request, limit: int = 25, stop: bool = False) -> PlainTextResponse:
+            check_token(request)
+            return PlainTextResponse(heap.stop() if stop else heap.diff(limit))
+
+    # ── Batched tool endpoint ───────────────────────────────────────────
+    # Contract: agent/tool_batcher.go ToolBatcher.streamBatch
+    #   POST {callbackURL}/tools/_batch
+    #   Body: {"calls": [{"id": str, "name": str, "args": dict}, ...], "stream": bool}
+    #   Response (stream=true, what Go sends): SSE, one frame per call in
+    #   completion order
+    #     data: {"id": "...", "result": "..."}\n\n
+    #     data: {"done": true}\n\n
+    #   Response (stream=false, for non-Go callers):
+    #     {"results": [{"id": str, "result": str} | {"id": str, "error": str}, ...]}
+    #
+    # Calls run concurrently; a failing call only sets its own "error".
+    # If the caller disconnects, calls still running are cancelled — in
+    # both modes.
+    # Registered before /tools/{tool_name} so "_batch" is never treated
+    # as a tool name.
+
+    @app.post("/tools/_batch")
+    async def handle_tool_batch(request: ToolBatchRequest, raw: Request) -> Any:
+        async def run_one(call_id: str, name: str, args: dict[str, Any]) -> ToolBatchResult:
+            resp = await run_tool(name, args)
+            return ToolBatchResult(id=call_id, result=resp.result, error=resp.error)
+
+        tasks = [
+            asyncio.ensure_future(run_one(c.id, c.name, c.args))
+            for c in request.calls
+        ]
+
+        if not request.stream:
+            try:
+                results = await _cancel_on_disconnect(raw, asyncio.gather(*tasks))
+            except ClientDisconnect:
+                return client_gone()
+            finally:
+                for t in tasks:
+                    t.cancel()
+            return ToolBatchResponse(results=list(results))
+
+        async def generate() -> AsyncIterator[bytes]:
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    res = await fut
+                    yield sse(res.model_dump_json(exclude_none=True).encode())
+                yield DONE_FRAME
+            finally:
+                for t in tasks:
+                    t.cancel()
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
 
     # ── Tool endpoint ───────────────────────────────────────────────────
     # Contract: agent/http_tool.go HTTPTool.Execute
@@ -53,70 +380,97 @@ def build_app(
     #   Body: {"name": str, "args": dict}
     #   Response: {"result": str} or {"error": str}
 
-    @app.post("/tools/{tool_name}")
-    async def handle_tool(tool_name: str, request: ToolCallbackRequest) -> ToolCallbackResponse:
-        fn = tools.get(tool_name)
-        if fn is None:
-            return ToolCallbackResponse(error=f"unknown tool: {tool_name}")
+    #
+    # Hot path: the body is decoded and the response encoded by _wire, not
+    # by FastAPI's pydantic request/response handling. A caller that
+    # disconnects cancels the call.
 
+    @app.post("/tools/{tool_name}")
+    async def handle_tool(tool_name: str, request: Request) -> Response:
         try:
-            if inspect.iscoroutinefunction(fn):
-                result = await fn(**request.args)
-            else:
-                result = await asyncio.to_thread(fn, **request.args)
-            return ToolCallbackResponse(result=str(result))
-        except Exception as e:
-            logger.error("tool %s failed: %s\n%s", tool_name, e, traceback.format_exc())
-            return ToolCallbackResponse(error=str(e))
+            args = decode_tool_request(await request.body())
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        try:
+            resp = await _cancel_on_disconnect(request, run_tool(tool_name, args))
+        except ClientDisconnect:
+            return client_gone()
+        return Response(
+            encode_tool_response(resp.result, resp.error),
+            media_type="application/json",
+        )
+
+    # ── LLM dispatch ─────────────────────────────────────────────────────
+
+    async def call_provider(provider: Callable, llm_request: Any) -> JSONResponse:
+        result = provider(llm_request)
+
+        # If the provider is an async generator, collect all chunks
+        if inspect.isasyncgen(result):
+            content = ""
+            tool_calls: list[ToolCallResult] = []
+            async for chunk in result:
+                if chunk.delta:
+                    content += chunk.delta
+                if chunk.tool_call:
+                    tool_calls.append(chunk.tool_call)
+            resp = LLMResponse(
+                content=content,
+                tool_calls=tool_calls if tool_calls else None,
+            )
+            return JSONResponse(content=resp.model_dump(by_alias=True))
+
+        # If it's a coroutine, await it
+        if inspect.isawaitable(result):
+            result = await result
+
+        # If it returns LLMResponse directly
+        if isinstance(result, LLMResponse):
+            return JSONResponse(content=result.model_dump(by_alias=True))
+
+        return JSONResponse(content=result)
 
     # ── LLM sync endpoint ──────────────────────────────────────────────
     # Contract: llm/http_proxy.go HTTPProxyClient.Call
     #   POST {callbackURL}/llm/{modelName}/call
     #   Body: llm.Request JSON
     #   Response: llm.Response JSON {"content": str, "tool_calls": [...]}
+    #   429 + Retry-After when the provider's admission queue is full.
+    #
+    # If Go disconnects first, the provider call is cancelled.
 
     @app.post("/llm/{model_name}/call")
     async def handle_llm_call(model_name: str, request: Request) -> JSONResponse:
-        body = await request.json()
-        llm_request = LLMRequest(**body)
-
         provider = llm_providers.get(model_name)
         if provider is None:
             return JSONResponse(
                 status_code=400,
                 content={"error": f"unknown LLM provider: {model_name}"},
             )
+        try:
+            llm_request = decode_llm_request(await request.body())
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": f"invalid request: {e}"})
 
         try:
-            result = provider(llm_request)
-
-            # If the provider is an async generator, collect all chunks
-            if inspect.isasyncgen(result):
-                content = ""
-                tool_calls: list[ToolCallResult] = []
-                async for chunk in result:
-                    if chunk.delta:
-                        content += chunk.delta
-                    if chunk.tool_call:
-                        tool_calls.append(chunk.tool_call)
-                resp = LLMResponse(
-                    content=content,
-                    tool_calls=tool_calls if tool_calls else None,
-                )
-                return JSONResponse(content=resp.model_dump(by_alias=True))
-
-            # If it's a coroutine, await it
-            if inspect.isawaitable(result):
-                result = await result
-
-            # If it returns LLMResponse directly
-            if isinstance(result, LLMResponse):
-                return JSONResponse(content=result.model_dump(by_alias=True))
-
-            return JSONResponse(content=result)
+            permit = await admission.acquire(model_name)
+        except Overloaded as e:
+            return overloaded(e)
+
+        metrics.llm_requests.inc(model_name, "call")
+        start = time.perf_counter()
+        try:
+            return await _cancel_on_disconnect(request, call_provider(provider, llm_request))
+        except ClientDisconnect:
+            metrics.llm_cancelled.inc(model_name, "call")
+            return client_gone()
         except Exception as e:
+            metrics.llm_errors.inc(model_name, "call")
             logger.error("LLM call %s failed: %s\n%s", model_name, e, traceback.format_exc())
             return JSONResponse(status_code=500, content={"error": str(e)})
+        finally:
+            permit.release()
+            metrics.llm_call_duration.observe(time.perf_counter() - start, model_name)
 
     # ── LLM stream endpoint ────────────────────────────────────────────
     # Contract: llm/http_proxy.go HTTPProxyClient.Stream
@@ -126,31 +480,48 @@ def build_app(
     #     data: {"delta": "..."}\n\n
     #     data: {"tool_call": {"id": ..., "name": ..., "arguments": ...}}\n\n
     #     data: {"done": true}\n\n
+    #   429 + Retry-After when the provider's admission queue is full.
     #
     # Go parses with bufio.Scanner looking for "data: " prefix lines.
+    # With stream_coalesce_ms set, a "delta" frame may carry several of the
+    # provider's chunks. If Go disconnects, the provider generator is
+    # closed mid-stream.
 
     @app.post("/llm/{model_name}/stream")
     async def handle_llm_stream(model_name: str, request: Request) -> StreamingResponse:
-        body = await request.json()
-        llm_request = LLMRequest(**body)
-
         provider = llm_providers.get(model_name)
         if provider is None:
             return JSONResponse(
                 status_code=400,
                 content={"error": f"unknown LLM provider: {model_name}"},
             )
+        try:
+            llm_request = decode_llm_request(await request.body())
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": f"invalid request: {e}"})
+
+        try:
+            permit = await admission.acquire(model_name)
+        except Overloaded as e:
+            return overloaded(e)
 
-        async def generate() -> AsyncIterator[str]:
+        metrics.llm_requests.inc(model_name, "stream")
+        start = time.perf_counter()
+
+        async def generate() -> AsyncIterator[bytes]:
+            result = None
             try:
                 result = provider(llm_request)
 
                 # Async generator — stream chunks
                 if inspect.isasyncgen(result):
+                    result = metrics.time_chunks(model_name, result, start)
+                    if coalesce_window > 0:
+                        result = _coalesce_deltas(result, coalesce_window, stream_coalesce_chars)
                     async for chunk in result:
-                        yield f"data: {chunk.model_dump_json(by_alias=True)}\n\n"
+                        yield sse(encode_stream_chunk(chunk))
                     # Ensure done is sent
-                    yield f"data: {json.dumps({'done': True})}\n\n"
+                    yield DONE_FRAME
                     return
 
                 # Coroutine returning LLMResponse — wrap as single stream
@@ -159,17 +530,35 @@ def build_app(
 
                 if isinstance(result, LLMResponse):
                     if result.content:
-                        yield f"data: {StreamChunk(delta=result.content).model_dump_json(by_alias=True)}\n\n"
+                        yield sse(encode_stream_chunk(StreamChunk(delta=result.content)))
                     if result.tool_calls:
                         for tc in result.tool_calls:
-                            yield f"data: {StreamChunk(tool_call=tc).model_dump_json(by_alias=True)}\n\n"
-                    yield f"data: {json.dumps({'done': True})}\n\n"
+                            yield sse(encode_stream_chunk(StreamChunk(tool_call=tc)))
+                    yield DONE_FRAME
 
+            except (asyncio.CancelledError, GeneratorExit):
+                metrics.llm_cancelled.inc(model_name, "stream")
+                raise
             except Exception as e:
+                metrics.llm_errors.inc(model_name, "stream")
                 logger.error("LLM stream %s failed: %s\n%s", model_name, e, traceback.format_exc())
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-        return StreamingResponse(generate(), media_type="text/event-stream")
+                yield error_frame(str(e))
+            finally:
+                permit.release()
+                # Close the provider (and its upstream stream) now rather
+                # than whenever the generator is garbage-collected.
+                await _aclose(result)
+
+        frames = metrics.count_stream(model_name, generate(), start)
+
+        async def finish() -> None:
+            # Runs once the response ends, including when Starlette stopped
+            # it because Go disconnected: generate() may still be suspended
+            # mid-stream, holding the slot and the upstream connection.
+            permit.release()
+            await frames.aclose()
+
+        return StreamingResponse(frames, media_type="text/event-stream", background=BackgroundTask(finish))
 
     # ── Health ──────────────────────────────────────────────────────────
 
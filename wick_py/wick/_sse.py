@@ -0,0 +1,118 @@
+"""Incremental Server-Sent Events parser.
+
+Works on the raw bytes of a response body (iter_raw / aiter_raw) instead of
+decoded text lines: received chunks are appended to one buffer, frame
+boundaries are found with bytes.find, and only the event name is decoded
+to str. A frame's data stays bytes, ready for a single JSON decode.
+
+Handles "\n", "\r\n" and "\r" line endings, multi-line data fields (joined
+with "\n" as the spec says), comment lines and frames split across
+arbitrary chunk boundaries. "id" and "retry" fields are ignored.
+
+sse_events() runs the parser over an upstream httpx response and decodes
+each frame's data with the sidecar's JSON codec (orjson when installed),
+for LLM providers that stream SSE (OpenAI- and Anthropic-style APIs).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from ._wire import loads
+
+logger = logging.getLogger("wick.sidecar")
+
+DEFAULT_EVENT = "message"
+# OpenAI-style end-of-stream sentinel.
+DONE = b"[DONE]"
+
+
+class SSEParser:
+    """Feed response bytes in; get complete (event, data) frames out.
+
+        parser = SSEParser()
+        for chunk in resp.iter_raw():
+            for event, data in parser.feed(chunk):
+                ...
+    """
+
+    __slots__ = ("_buf", "_scanned", "_cr")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._scanned = 0     # bytes of _buf already searched for a boundary
+        self._cr = False      # previous chunk ended in "\r"; a leading "\n" pairs with it
+
+    def feed(self, chunk: bytes) -> list[tuple[str, bytes]]:
+        if not chunk:
+            return []
+        if self._cr and chunk[:1] == b"\n":
+            chunk = chunk[1:]
+        self._cr = chunk[-1:] == b"\r"
+        if b"\r" in chunk:
+            # Rare in practice (Go and most providers emit "\n"); normalise
+            # this chunk only.
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        buf = self._buf
+        buf += chunk
+
+        frames: list[tuple[str, bytes]] = []
+        start = 0
+        # A boundary may straddle the previous chunk: back up one byte.
+        pos = buf.find(b"\n\n", max(self._scanned - 1, 0))
+        while pos != -1:
+            frame = _parse_frame(bytes(buf[start:pos]))
+            if frame is not None:
+                frames.append(frame)
+            start = pos + 2
+            pos = buf.find(b"\n\n", start)
+        if start:
+            del buf[:start]
+        self._scanned = len(buf)
+        return frames
+
+
+def _parse_frame(block: bytes) -> tuple[str, bytes] | None:
+    """One frame's (event, data), or None for a frame without data."""
+    event = DEFAULT_EVENT
+    data: list[bytes] = []
+    for line in block.split(b"\n"):
+        if line.startswith(b"data:"):
+            value = line[5:]
+            data.append(value[1:] if value[:1] == b" " else value)
+        elif line.startswith(b"event:"):
+            value = line[6:]
+            event = (value[1:] if value[:1] == b" " else value).decode()
+        # comments (":"), id, retry and unknown fields are ignored
+    if not data:
+        return None
+    return event, data[0] if len(data) == 1 else b"\n".join(data)
+
+
+async def sse_events(response: httpx.Response) -> AsyncIterator[tuple[str, Any]]:
+    """(event, decoded JSON data) for each frame of a streamed response.
+
+        async with client.stream("POST", url, json=payload) as resp:
+            resp.raise_for_status()
+            async for event, data in sse_events(resp):
+                ...
+
+    Stops at a "[DONE]" frame. A frame whose data is not valid JSON is
+    logged and skipped. Reads aiter_bytes(), so a compressed response is
+    decoded first.
+    """
+    parser = SSEParser()
+    async for chunk in response.aiter_bytes():
+        for event, data in parser.feed(chunk):
+            if data == DONE:
+                return
+            try:
+                obj = loads(data)
+            except ValueError:
+                logger.warning("Skipping malformed SSE data: %r", data[:120])
+                continue
+            yield event, obj
@@ -14,6 +14,16 @@ Usage:
 
     # Then select per agent:
     agent = Agent("my-agent", builtin_tools=["current_datetime", "calculate"])
+
+    # Sidecar execution knobs (see ToolOptions):
+    @tool(description="Search the index", executor="dedicated", max_concurrency=4)
+    def os_search(query: str) -> str:
+        ...
+
+    # Cache results of a deterministic tool for 5 minutes:
+    @tool(description="Count documents", cache_ttl=300)
+    def os_count(index: str) -> str:
+        ...
 """
 
 from __future__ import annotations
@@ -22,11 +32,78 @@ import inspect
 from collections.abc import Callable
 from typing import Any
 
+from ._cancel import cancellation_param
+
+
+VALID_EXECUTORS = ("shared", "dedicated", "inline", "process")
+
+
+class ToolOptions:
+    """How the sidecar runs a tool.
+
+    executor:
+        "shared"    — sync tools run on the sidecar's shared tool thread pool.
+                      Default.
+        "dedicated" — sync tools run on their own thread pool sized to
+                      max_concurrency, so a slow tool can't occupy shared
+                      threads.
+        "inline"    — sync tools run directly on the event loop. Only for
+                      fast, non-blocking functions; skips the thread hop.
+        "process"   — sync tools run in the sidecar's warm worker-process
+                      pool, outside the GIL. For CPU-bound tools. The
+                      function must be defined at module level in an
+                      importable module (not the __main__ script — workers
+                      are spawned and re-import it) and its args/result
+                      must be picklable.
+    max_concurrency:
+        Upper bound on simultaneous calls of this tool. Extra calls wait in
+        a queue whose depth is reported by the sidecar. None = unbounded.
+    cache_ttl:
+        Seconds to cache a successful result, keyed by the call's args.
+        Only for deterministic, read-only tools. None = no cache.
+    cache_max_entries:
+        LRU bound on cached results (default 1024). Requires cache_ttl.
+    coalesce:
+        Run identical concurrent calls (same args) once and hand the result
+        to every caller. Only for read-only tools. Implied by cache_ttl.
+
+    Async tools always run on the event loop; only max_concurrency applies.
+    """
+
+    __slots__ = ("executor", "max_concurrency", "cache_ttl", "cache_max_entries", "coalesce")
+
+    def __init__(
+        self,
+        executor: str = "shared",
+        max_concurrency: int | None = None,
+        cache_ttl: float | None = None,
+        cache_max_entries: int | None = None,
+        coalesce: bool = False,
+    ) -> None:
+        if executor not in VALID_EXECUTORS:
+            raise ValueError(
+                f"executor must be one of {VALID_EXECUTORS}, got {executor!r}"
+            )
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        if cache_ttl is not None and cache_ttl <= 0:
+            raise ValueError(f"cache_ttl must be > 0, got {cache_ttl}")
+        if cache_max_entries is not None:
+            if cache_ttl is None:
+                raise ValueError("cache_max_entries requires cache_ttl")
+            if cache_max_entries < 1:
+                raise ValueError(f"cache_max_entries must be >= 1, got {cache_max_entries}")
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.coalesce = coalesce or cache_ttl is not None
+
 
 class ToolDef:
     """A tool definition in the global registry."""
 
-    __slots__ = ("name", "description", "parameters", "fn")
+    __slots__ = ("name", "description", "parameters", "fn", "options")
 
     def __init__(
         self,
@@ -34,11 +111,13 @@ class ToolDef:
         description: str,
         parameters: dict[str, Any],
         fn: Callable,
+        options: ToolOptions | None = None,
     ) -> None:
         self.name = name
         self.description = description
         self.parameters = parameters
         self.fn = fn
+        self.options = options or ToolOptions()
 
 
 # Module-level registry: name → ToolDef
@@ -49,6 +128,12 @@ def tool(
     name: str | None = None,
     description: str = "",
     parameters: dict[str, Any] | None = None,
+    *,
+    executor: str = "shared",
+    max_concurrency: int | None = None,
+    cache_ttl: float | None = None,
+    cache_max_entries: int | None = None,
+    coalesce: bool = False,
 ) -> Callable:
     """Decorator to register a tool in the global pool.
 
@@ -56,12 +141,23 @@ def tool(
         @tool(description="Add two numbers")
         def add(a: float, b: float) -> str:
             return str(a + b)
+
+    executor / max_concurrency / cache_ttl / cache_max_entries / coalesce
+    control how the sidecar runs the tool — see ToolOptions.
     """
+    options = ToolOptions(
+        executor=executor,
+        max_concurrency=max_concurrency,
+        cache_ttl=cache_ttl,
+        cache_max_entries=cache_max_entries,
+        coalesce=coalesce,
+    )
+
     def decorator(fn: Callable) -> Callable:
         tool_name = name or fn.__name__
         tool_desc = description or fn.__doc__ or ""
         tool_params = parameters or _infer_parameters(fn)
-        _REGISTRY[tool_name] = ToolDef(tool_name, tool_desc, tool_params, fn)
+        _REGISTRY[tool_name] = ToolDef(tool_name, tool_desc, tool_params, fn, options)
         return fn
     return decorator
 
@@ -79,6 +175,7 @@ def all_tools() -> dict[str, ToolDef]:
 def _infer_parameters(fn: Callable) -> dict[str, Any]:
     """Infer JSON Schema parameters from function type hints."""
     sig = inspect.signature(fn)
+    token_param = cancellation_param(fn)  # injected by the sidecar, not the LLM
     properties: dict[str, Any] = {}
     required: list[str] = []
 
@@ -90,6 +187,8 @@ def _infer_parameters(fn: Callable) -> dict[str, Any]:
     }
 
     for param_name, param in sig.parameters.items():
+        if param_name == token_param:
+            continue
         annotation = param.annotation
         json_type = type_map.get(annotation, "string")
         properties[param_name] = {"type": json_type}
@@ -89,6 +89,35 @@ class ToolCallbackResponse(BaseModel):
     error: str | None = None
 
 
+class ToolBatchCall(BaseModel):
+    """One call inside a batched request from Go's ToolBatcher."""
+    id: str
+    name: str
+    args: dict[str, Any] = Field(default_factory=dict)
+
+
+class ToolBatchRequest(BaseModel):
+    """Incoming request from Go's ToolBatcher (POST /tools/_batch).
+
+    With stream=True the sidecar answers with one SSE frame per call as
+    each finishes instead of a single ToolBatchResponse.
+    """
+    calls: list[ToolBatchCall] = Field(default_factory=list)
+    stream: bool = False
+
+
+class ToolBatchResult(BaseModel):
+    """Outcome of one batched call, matched back to its request by id."""
+    id: str
+    result: str | None = None
+    error: str | None = None
+
+
+class ToolBatchResponse(BaseModel):
+    """Response back to Go's ToolBatcher — results in request order."""
+    results: list[ToolBatchResult] = Field(default_factory=list)
+
+
 # ── Agent config types (mirrors agent/config.go) ───────────────────────────
 
 
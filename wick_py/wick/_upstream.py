@@ -0,0 +1,263 @@
+"""Shared HTTP clients for LLM providers' upstream calls.
+
+A provider that opens `httpx.AsyncClient()` per call pays DNS, TCP connect
+and TLS handshake on every turn. upstream_client() hands out one
+long-lived client per upstream origin instead:
+
+    from wick import upstream_client
+
+    @agent.llm_provider("my-model")
+    async def my_llm(request: LLMRequest):
+        client = upstream_client("https://api.example.com")
+        async with client.stream("POST", "https://api.example.com/v1/chat", json=...) as resp:
+            ...
+
+Connections are kept alive between turns and, with the h2 package
+installed (pip install "wick[http2]"), concurrent streams to the same
+upstream are multiplexed over one HTTP/2 connection. Without h2 the
+client falls back to HTTP/1.1 pooling.
+
+Clients belong to the event loop that created them (the sidecar's loop;
+one per worker process) and are closed when the sidecar shuts down.
+Options (limits, timeout, http2) take effect when an origin's client is
+first created; later calls return that client as is.
+
+TokenManager keeps the bearer token for such an upstream: it refreshes
+ahead of the token's expires_in, shares one refresh among concurrent
+callers and retries a request once when the upstream answers 401.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger("wick.sidecar")
+
+try:
+    import h2  # noqa: F401 — httpx needs it for http2=True
+except ImportError:  # optional: pip install "wick[http2]"
+    h2 = None
+
+DEFAULT_UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0,
+)
+DEFAULT_UPSTREAM_TIMEOUT = httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=5.0)
+
+# event loop → {origin: client}
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_warned_no_h2 = False
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"upstream URL must be absolute, got {url!r}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def upstream_client(
+    base_url: str,
+    *,
+    http2: bool = True,
+    limits: httpx.Limits | None = None,
+    timeout: httpx.Timeout | float | None = None,
+) -> httpx.AsyncClient:
+    """The shared AsyncClient for base_url's origin on the running loop.
+
+    Args:
+        base_url: any URL on the upstream; only scheme://host:port is used.
+        http2: negotiate HTTP/2 when h2 is installed (ignored otherwise).
+        limits: pool size and keep-alive (default DEFAULT_UPSTREAM_LIMITS).
+        timeout: default per-request timeout (DEFAULT_UPSTREAM_TIMEOUT);
+            individual requests can still pass their own.
+
+    Must be called from a coroutine (the provider).
+    """
+    global _warned_no_h2
+    loop = asyncio.get_running_loop()
+    origin = _origin(base_url)
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(origin)
+    if client is not None and not client.is_closed:
+        return client
+
+    if http2 and h2 is None:
+        if not _warned_no_h2:
+            logger.info('h2 not installed; upstream clients use HTTP/1.1 (pip install "wick[http2]")')
+            _warned_no_h2 = True
+        http2 = False
+    client = httpx.AsyncClient(
+        http2=http2,
+        limits=limits or DEFAULT_UPSTREAM_LIMITS,
+        timeout=timeout if timeout is not None else DEFAULT_UPSTREAM_TIMEOUT,
+    )
+    clients[origin] = client
+    return client
+
+
+async def aclose_upstream_clients() -> None:
+    """Close the running loop's upstream clients (sidecar shutdown)."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception as e:  # never block shutdown on a broken connection
+            logger.warning("closing upstream client failed: %s", e)
+
+
+# ── Bearer tokens ───────────────────────────────────────────────────────
+
+# Refresh this long before a token expires (capped at half its lifetime).
+TOKEN_REFRESH_MARGIN = 60.0
+# Lifetime assumed when the token response has no expires_in.
+DEFAULT_TOKEN_TTL = 20 * 60.0
+
+TokenResponse = Mapping[str, Any] | str
+
+
+class TokenManager:
+    """Expiry-aware bearer token for an upstream, shared by all requests.
+
+        tokens = TokenManager(fetch_token)   # async () -> {"access_token", "expires_in"}
+
+        async with tokens.stream(client, "POST", url, json=payload) as resp:
+            ...
+
+    Contract:
+      - get() returns the cached token while it has more than the refresh
+        margin left. Inside the margin it starts a refresh in the
+        background and still returns the current token, so requests never
+        wait on a proactive refresh. Only a missing or expired token makes
+        callers wait.
+      - At most one fetch runs at a time; everyone needing a token while it
+        runs awaits the same fetch (single-flight).
+      - A 401 from stream()/request() fetches a fresh token and retries the
+        request once with it. Concurrent 401s for the same
+        token trigger one fetch, not one per request.
+      - A failed background refresh is logged and retried on a later get();
+        a failed fetch that callers are waiting on raises to all of them.
+
+    fetch may return the OAuth token response (a mapping with
+    "access_token" and optionally "expires_in" seconds) or a bare token
+    string, which is assumed to live default_ttl seconds.
+    """
+
+    __slots__ = (
+        "_fetch", "_margin", "_default_ttl", "_token", "_expires_at", "_refresh_at",
+        "_refreshing",
+    )
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[TokenResponse]],
+        *,
+        refresh_margin: float = TOKEN_REFRESH_MARGIN,
+        default_ttl: float = DEFAULT_TOKEN_TTL,
+    ) -> None:
+        if refresh_margin < 0 or default_ttl <= 0:
+            raise ValueError("refresh_margin must be >= 0 and default_ttl > 0")
+        self._fetch = fetch
+        self._margin = refresh_margin
+        self._default_ttl = default_ttl
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing: asyncio.Task | None = None
+
+    async def get(self) -> str:
+        """A valid token, fetching one first only if there is none."""
+        token = self._token
+        if token is not None:
+            now = time.monotonic()
+            if now < self._expires_at:
+                if now >= self._refresh_at:
+                    self._start_refresh()
+                return token
+        return await self.refresh()
+
+    async def refresh(self, stale: str | None = None) -> str:
+        """Fetch a new token (or join the fetch already running).
+
+        With stale, a token other than stale that is already cached is
+        returned as is: another request has refreshed since stale was sent.
+        """
+        if stale is not None and self._token is not None and self._token != stale:
+            if self._expires_at > time.monotonic():
+                return self._token
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> None:
+        """Forget the cached token; the next get() fetches a new one."""
+        self._token = None
+        self._expires_at = self._refresh_at = 0.0
+
+    @asynccontextmanager
+    async def stream(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response]:
+        """client.stream(...) with the bearer token; retried once on 401."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = await self.get()
+        for attempt in (0, 1):
+            headers["Authorization"] = f"Bearer {token}"
+            async with client.stream(method, url, headers=headers, **kwargs) as resp:
+                if resp.status_code == 401 and attempt == 0:
+                    await resp.aclose()
+                    logger.info("upstream %s returned 401; refreshing token", _origin(url))
+                    token = await self.refresh(stale=token)
+                    continue
+                yield resp
+                return
+
+    async def request(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any,
+    ) -> httpx.Response:
+        """client.request(...) with the bearer token; retried once on 401."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = await self.get()
+        headers["Authorization"] = f"Bearer {token}"
+        resp = await client.request(method, url, headers=headers, **kwargs)
+        if resp.status_code != 401:
+            return resp
+        logger.info("upstream %s returned 401; refreshing token", _origin(url))
+        token = await self.refresh(stale=token)
+        headers["Authorization"] = f"Bearer {token}"
+        return await client.request(method, url, headers=headers, **kwargs)
+
+    def _start_refresh(self) -> asyncio.Task:
+        task = self._refreshing
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch_token())
+            task.add_done_callback(_log_refresh_failure)
+            self._refreshing = task
+        return task
+
+    async def _fetch_token(self) -> str:
+        response = await self._fetch()
+        if isinstance(response, str):
+            token, ttl = response, self._default_ttl
+        else:
+            token = response["access_token"]
+            ttl = float(response.get("expires_in") or self._default_ttl)
+        now = time.monotonic()
+        self._token = token
+        self._expires_at = now + ttl
+        self._refresh_at = now + ttl - min(self._margin, ttl / 2)
+        logger.info("upstream token refreshed (expires in %.0fs)", ttl)
+        return token
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("upstream token refresh failed: %s", task.exception())
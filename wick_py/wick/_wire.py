@@ -0,0 +1,113 @@
+"""Fast-path JSON codecs for the sidecar's hot endpoints.
+
+The pydantic models in _types.py stay the public API — providers still
+receive an LLMRequest and yield StreamChunks. This module only replaces the
+framework plumbing around them:
+
+  - request bodies are parsed once, from bytes, with orjson when installed
+    (pip install "wick[fast]"); stdlib json otherwise,
+  - tool callbacks skip pydantic and FastAPI's body/response handling
+    entirely — the wire shapes are two fields each,
+  - stream chunks are encoded by hand, leaving out unset fields the way
+    Go's `omitempty` tags do.
+
+Wire shapes must stay in sync with llm/client.go and agent/http_tool.go.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from ._types import LLMRequest, StreamChunk
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "wick[fast]"
+    orjson = None
+
+
+class WireError(ValueError):
+    """Request body that doesn't match the expected wire shape."""
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON as bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects non-str dict keys and ints beyond 64 bits that
+            # a tool or provider may hand back; json copes with both.
+            pass
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+def _load_object(body: bytes) -> dict[str, Any]:
+    try:
+        data = loads(body)
+    except ValueError as e:
+        raise WireError(f"invalid JSON body: {e}") from None
+    if not isinstance(data, dict):
+        raise WireError("request body must be a JSON object")
+    return data
+
+
+# ── LLM (llm/http_proxy.go) ────────────────────────────────────────────────
+
+
+def decode_llm_request(body: bytes) -> LLMRequest:
+    """Parse an llm.Request body in one pass (bytes → dict → LLMRequest)."""
+    return LLMRequest.model_validate(_load_object(body))
+
+
+def encode_stream_chunk(chunk: StreamChunk) -> bytes:
+    """llm.StreamChunk JSON without unset fields."""
+    out: dict[str, Any] = {}
+    if chunk.delta:
+        out["delta"] = chunk.delta
+    tc = chunk.tool_call
+    if tc is not None:
+        out["tool_call"] = {"id": tc.id, "name": tc.name, "arguments": tc.args}
+    if chunk.done:
+        out["done"] = True
+    return dumps(out)
+
+
+def sse(payload: bytes) -> bytes:
+    """Wrap an encoded JSON payload as one SSE frame."""
+    return b"data: " + payload + b"\n\n"
+
+
+DONE_FRAME = sse(b'{"done":true}')
+
+
+def error_frame(message: str) -> bytes:
+    return sse(dumps({"error": message}))
+
+
+# ── Tool callbacks (agent/http_tool.go) ────────────────────────────────────
+
+
+def decode_tool_request(body: bytes) -> dict[str, Any]:
+    """Return the args of a {"name": str, "args": dict} callback body."""
+    data = _load_object(body)
+    args = data.get("args")
+    if args is None:
+        return {}
+    if not isinstance(args, dict):
+        raise WireError("args must be a JSON object")
+    return args
+
+
+def encode_tool_response(result: str | None = None, error: str | None = None) -> bytes:
+    """{"result": str} or {"error": str}."""
+    if error is not None:
+        return dumps({"error": error})
+    return dumps({"result": result})
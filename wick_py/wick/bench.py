@@ -0,0 +1,443 @@
+"""Load generator and soak test for a wick_server + sidecar pair.
+
+Usage:
+    python -m wick.bench [--concurrency 50] [--turns 5 | --duration 300]
+                         [--tokens 64] [--token-delay-ms 0] [--tool-ms 5]
+                         [--sidecar-workers 1] [--output results.json]
+
+Starts the Go binary (found like Agent.run finds it; or pass --go-url for a
+running server) and a sidecar subprocess. It registers a "bench" agent
+whose model is a fake streaming LLM provider and whose one tool sleeps for
+--tool-ms. Each turn is one tool call followed by a streamed answer of
+--tokens tokens. Then --concurrency conversations, each on its own thread,
+run turns back to back through POST /agents/{id}/stream: --turns each, or
+until --duration seconds pass.
+
+Reported as JSON (stdout, or --output):
+  - throughput: turns/s and streamed tokens/s,
+  - ttft_ms and turn_ms: p50/p95/p99/max time to first token and to the
+    "done" event,
+  - errors: count, rate and count by kind,
+  - sidecar / go: mean and max CPU % and max RSS of each process tree
+    (Linux /proc; null elsewhere or for a --go-url server).
+
+Run with the same options release over release and compare the files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from . import __version__
+from ._agent import SIDECAR_APP_ENV, Agent, _register_all
+from ._client import AsyncWickClient, WickClient
+from ._runtime import GoRuntime
+from ._types import LLMRequest, StreamChunk, ToolCallResult
+
+BENCH_AGENT_ID = "bench"
+BENCH_MODEL = "bench-model"
+BENCH_TOOL = "bench_lookup"
+
+# The sidecar subprocess rebuilds bench_agent from these (see _build_bench_agent).
+TOKENS_ENV = "WICK_BENCH_TOKENS"
+TOKEN_DELAY_ENV = "WICK_BENCH_TOKEN_DELAY_MS"
+TOOL_MS_ENV = "WICK_BENCH_TOOL_MS"
+
+SAMPLE_INTERVAL = 0.5
+SIDECAR_START_TIMEOUT = 30.0
+
+
+# ── Fake agent ──────────────────────────────────────────────────────────
+
+
+def _build_bench_agent() -> Agent:
+    tokens = int(os.environ.get(TOKENS_ENV, "64"))
+    token_delay = float(os.environ.get(TOKEN_DELAY_ENV, "0")) / 1000
+    tool_delay = float(os.environ.get(TOOL_MS_ENV, "5")) / 1000
+
+    agent = Agent(BENCH_AGENT_ID, name="Bench", system_prompt="You are a benchmark.")
+
+    @agent.tool(name=BENCH_TOOL, description="Look something up (sleeps)")
+    def bench_lookup(query: str) -> str:
+        time.sleep(tool_delay)
+        return f"{{\"query\": {json.dumps(query)}, \"hits\": 3}}"
+
+    @agent.llm_provider(BENCH_MODEL)
+    async def bench_llm(request: LLMRequest):
+        # First call of a turn asks for the tool; the call after the tool
+        # result streams the answer.
+        last = request.messages[-1] if request.messages else None
+        if last is None or last.role != "tool":
+            yield StreamChunk(tool_call=ToolCallResult(
+                id=f"call_{uuid.uuid4().hex[:12]}", name=BENCH_TOOL, args={"query": "bench"},
+            ))
+            yield StreamChunk(done=True)
+            return
+        for i in range(tokens):
+            if token_delay:
+                await asyncio.sleep(token_delay)
+            yield StreamChunk(delta=f"tok{i} ")
+        yield StreamChunk(done=True)
+
+    return agent
+
+
+# Imported by the sidecar subprocess (WICK_SIDECAR_APP=wick.bench:bench_agent).
+bench_agent = _build_bench_agent()
+
+
+# ── Load ────────────────────────────────────────────────────────────────
+
+
+class LoadResult:
+    """Raw per-turn measurements of one load run."""
+
+    __slots__ = ("ttft", "turn", "tokens", "errors", "elapsed")
+
+    def __init__(self) -> None:
+        self.ttft: list[float] = []
+        self.turn: list[float] = []
+        self.tokens = 0
+        self.errors: Counter[str] = Counter()
+        self.elapsed = 0.0
+
+
+async def _turn(
+    client: AsyncWickClient, agent_id: str, thread_id: str, message: str, result: LoadResult,
+) -> None:
+    start = time.perf_counter()
+    first: float | None = None
+    try:
+        async for event in client.stream(agent_id, message, thread_id=thread_id):
+            if event.event == "on_chat_model_stream" and event.text:
+                result.tokens += 1
+                if first is None:
+                    first = time.perf_counter() - start
+            elif event.event == "error":
+                result.errors["error_event"] += 1
+                return
+            elif event.event == "done":
+                result.turn.append(time.perf_counter() - start)
+                if first is not None:
+                    result.ttft.append(first)
+                return
+    except httpx.HTTPStatusError as e:
+        result.errors[f"http_{e.response.status_code}"] += 1
+        return
+    except (httpx.HTTPError, OSError) as e:
+        result.errors[type(e).__name__] += 1
+        return
+    result.errors["no_done_event"] += 1
+
+
+async def run_load(
+    client: AsyncWickClient,
+    agent_id: str = BENCH_AGENT_ID,
+    *,
+    concurrency: int,
+    turns: int = 5,
+    duration: float | None = None,
+    message: str = "Look it up and answer.",
+) -> LoadResult:
+    """Run `concurrency` conversations, `turns` turns each or until
+    `duration` seconds have passed, and collect per-turn timings."""
+    result = LoadResult()
+    run_id = uuid.uuid4().hex[:8]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration if duration else None
+
+    async def conversation(i: int) -> None:
+        thread_id = f"bench-{run_id}-{i}"
+        n = 0
+        while (loop.time() < deadline) if deadline else (n < turns):
+            await _turn(client, agent_id, thread_id, message, result)
+            n += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(conversation(i) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def percentiles(values: list[float]) -> dict[str, float] | None:
+    """p50/p95/p99/max (nearest rank) and mean of `values` seconds, in ms."""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+    return {
+        "p50": rank(50) * 1000,
+        "p95": rank(95) * 1000,
+        "p99": rank(99) * 1000,
+        "max": ordered[-1] * 1000,
+        "mean": sum(ordered) / len(ordered) * 1000,
+    }
+
+
+def summarize(result: LoadResult) -> dict[str, Any]:
+    completed = len(result.turn)
+    failed = sum(result.errors.values())
+
+    def per_second(n: int) -> float:
+        return n / result.elapsed if result.elapsed else 0.0
+
+    return {
+        "turns": completed,
+        "elapsed_s": result.elapsed,
+        "throughput": {
+            "turns_per_s": per_second(completed),
+            "tokens_per_s": per_second(result.tokens),
+        },
+        "ttft_ms": percentiles(result.ttft),
+        "turn_ms": percentiles(result.turn),
+        "errors": {
+            "count": failed,
+            "rate": failed / (completed + failed) if completed + failed else 0.0,
+            "by_kind": dict(result.errors),
+        },
+    }
+
+
+# ── Process sampling ────────────────────────────────────────────────────
+
+
+def _tree(pid: int) -> list[int]:
+    """pid and its descendants (uvicorn workers, spawned tool processes)."""
+    pids, i = [pid], 0
+    while i < len(pids):
+        task_dir = f"/proc/{pids[i]}/task"
+        try:
+            for tid in os.listdir(task_dir):
+                with open(f"{task_dir}/{tid}/children") as f:
+                    pids.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+        i += 1
+    return pids
+
+
+def _cpu_and_rss(pid: int) -> tuple[float, int] | None:
+    """(CPU seconds, RSS bytes) of one process, from /proc."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    # fields[0] is field 3 (state); utime and stime are fields 14 and 15.
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    return cpu, rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class ProcessSampler:
+    """Samples CPU % and RSS of a process tree on a background thread."""
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self._pid = pid
+        self._interval = interval
+        self._cpu: list[float] = []
+        self._rss: list[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="wick-bench-sampler", daemon=True)
+
+    def start(self) -> ProcessSampler:
+        self._thread.start()
+        return self
+
+    def _sample(self) -> tuple[float, int] | None:
+        samples = [s for s in map(_cpu_and_rss, _tree(self._pid)) if s is not None]
+        if not samples:
+            return None
+        return sum(c for c, _ in samples), sum(r for _, r in samples)
+
+    def _run(self) -> None:
+        last = self._sample()
+        last_at = time.monotonic()
+        while not self._stop.wait(self._interval):
+            now = self._sample()
+            now_at = time.monotonic()
+            if now is None or last is None:
+                last, last_at = now, now_at
+                continue
+            # Clamped: a child exiting between samples takes its CPU time along.
+            self._cpu.append(max(0.0, now[0] - last[0]) / (now_at - last_at) * 100)
+            self._rss.append(now[1])
+            last, last_at = now, now_at
+
+    def stop(self) -> dict[str, float] | None:
+        self._stop.set()
+        self._thread.join()
+        if not self._rss:
+            return None
+        return {
+            "cpu_percent_mean": sum(self._cpu) / len(self._cpu),
+            "cpu_percent_max": max(self._cpu),
+            "rss_mb_max": max(self._rss) / 2**20,
+        }
+
+
+# ── Stack ───────────────────────────────────────────────────────────────
+
+
+def _start_sidecar(opts: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        SIDECAR_APP_ENV: "wick.bench:bench_agent",
+        TOKENS_ENV: str(opts.tokens),
+        TOKEN_DELAY_ENV: str(opts.token_delay_ms),
+        TOOL_MS_ENV: str(opts.tool_ms),
+    }
+    cmd = [
+        sys.executable, "-m", "uvicorn", "wick._agent:sidecar_app", "--factory",
+        "--host", opts.sidecar_host, "--port", str(opts.sidecar_port),
+        "--workers", str(opts.sidecar_workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, env=env)
+    deadline = time.monotonic() + SIDECAR_START_TIMEOUT
+    url = f"http://{opts.sidecar_host}:{opts.sidecar_port}/tools/_stats"
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"sidecar exited with code {proc.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return proc
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            proc.terminate()
+            raise TimeoutError(f"sidecar not ready after {SIDECAR_START_TIMEOUT:g}s")
+        time.sleep(0.1)
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def run(opts: argparse.Namespace) -> dict[str, Any]:
+    """Start the stack, run the load, and return the JSON report."""
+    runtime = None
+    if not opts.go_url:
+        runtime = GoRuntime(binary=opts.go_binary, port=opts.go_port, log_level="WARNING")
+        runtime.start()
+    sidecar = None
+    try:
+        if runtime is not None:
+            runtime.wait_ready()
+        go_url = opts.go_url or runtime.base_url
+        sidecar = _start_sidecar(opts)
+
+        client = WickClient(go_url)
+        try:
+            client.wait_ready()
+            sidecar_url = f"http://{opts.sidecar_host}:{opts.sidecar_port}"
+            _register_all(client, [(bench_agent, sidecar_url)])
+        finally:
+            client.close()
+
+        samplers = {"sidecar": ProcessSampler(sidecar.pid).start()}
+        if runtime is not None and runtime.pid is not None:
+            samplers["go"] = ProcessSampler(runtime.pid).start()
+
+        async def load() -> LoadResult:
+            limits = httpx.Limits(
+                max_connections=opts.concurrency, max_keepalive_connections=opts.concurrency,
+            )
+            async with AsyncWickClient(go_url, limits=limits, retries=0) as load_client:
+                return await run_load(
+                    load_client,
+                    concurrency=opts.concurrency,
+                    turns=opts.turns,
+                    duration=opts.duration,
+                )
+
+        result = asyncio.run(load())
+        processes = {name: s.stop() for name, s in samplers.items()}
+    finally:
+        if sidecar is not None:
+            _stop(sidecar)
+        if runtime is not None:
+            runtime.stop()
+
+    report = {
+        "wick_version": __version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "config": {
+            "concurrency": opts.concurrency,
+            "turns": None if opts.duration else opts.turns,
+            "duration_s": opts.duration,
+            "tokens": opts.tokens,
+            "token_delay_ms": opts.token_delay_ms,
+            "tool_ms": opts.tool_ms,
+            "sidecar_workers": opts.sidecar_workers,
+        },
+        **summarize(result),
+        "sidecar": processes.get("sidecar"),
+        "go": processes.get("go"),
+    }
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m wick.bench", description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=5, help="turns per conversation")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="run for this many seconds instead of --turns (soak test)")
+    parser.add_argument("--tokens", type=int, default=64, help="streamed tokens per answer")
+    parser.add_argument("--token-delay-ms", type=float, default=0, help="delay between tokens")
+    parser.add_argument("--tool-ms", type=float, default=5, help="tool call latency")
+    parser.add_argument("--sidecar-workers", type=int, default=1)
+    parser.add_argument("--sidecar-host", default="127.0.0.1")
+    parser.add_argument("--sidecar-port", type=int, default=9190)
+    parser.add_argument("--go-port", type=int, default=8190)
+    parser.add_argument("--go-binary", default=None)
+    parser.add_argument("--go-url", default=None,
+                        help="use this running Go server instead of starting one; it must "
+                             "reach the sidecar at --sidecar-host:--sidecar-port")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    opts = parser.parse_args(argv)
+    if opts.concurrency < 1 or opts.turns < 1:
+        parser.error("--concurrency and --turns must be >= 1")
+
+    report = run(opts)
+    text = json.dumps(report, indent=2)
+    if opts.output:
+        with open(opts.output, "w") as f:
+            f.write(text + "\n")
+        print(
+            f"{report['turns']} turns, {report['throughput']['turns_per_s']:.1f} turns/s, "
+            f"{report['errors']['count']} errors -> {opts.output}",
+            file=sys.stderr,
+        )
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()